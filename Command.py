@@ -52,6 +52,13 @@
 #    13-Sep-2014 (CT) Add `RST_addons.User_Wireless_Interface_uses_Antenna`
 #    26-Sep-2014 (CT) Add Alias for `/Doc/FFW`
 #    29-Jul-2015 (CT) Adapt to name change of PAP.Phone attributes
+#    17-Oct-2026 (agent) Use `FFW.RST_Api_addons.Scope` for `/api` to cache
+#                        responses of E_Type resources
+#    17-Oct-2026 (agent) Use `FFW.RST_TOP_addons` for `Dashboard`, `User_...`,
+#                        and `Page_ReST` resources to support conditional GET
+#    17-Oct-2026 (agent) Add sub-command `prerender_pages`
+#    17-Oct-2026 (agent) Pass `FFW.Bytecode_Cache` to `_create_templateer`,
+#                        compile all templates in `init_app_cache`
 #    ««revision-date»»···
 #--
 
@@ -67,6 +74,9 @@ from   _Base_Command_           import _Base_Command_
 from   _CNDB._GTW               import RST_addons
 
 import _CNDB.Command
+import _FFW.Bytecode_Cache
+import _FFW.RST_Api_addons
+import _FFW.RST_TOP_addons
 
 from   _MOM.Product_Version     import Product_Version, IV_Number
 
@@ -144,8 +154,39 @@ class Command (_Base_Command_, CNDB.Command) :
     _default_db_name        = "ffw"
     _defaults               = dict \
         ( copyright_start   = 2012
+        , prerender_root    = "../prerendered"
         )
 
+    ### written to the root of the pre-rendered pages, only a directory
+    ### containing it is ever replaced by `prerender_pages`
+    prerender_marker        = ".prerendered"
+
+    class _Prerender_Pages_ (CNDB.Command._Setup_Cache_) :
+        """Pre-render read-only pages for all languages of `L10N`."""
+
+        _defaults               = dict \
+            ( Setup_Cache       = False
+            )
+
+        _args                   = \
+            ( "url:S"
+                "?Url(s) of pages to pre-render, including all their "
+                "entries (default: the urls in `prerendered_pages`)"
+            ,
+            )
+
+        class Prerender_Root (TFL.Command.Rel_Path_Option) :
+            """Root path of pre-rendered pages"""
+
+            auto_split              = None
+            max_number              = 1
+            single_match            = True
+            skip_missing            = False
+
+        # end class Prerender_Root
+
+    # end class _Prerender_Pages_
+
     @Once_Property
     def src_dir (self) :
         import rst_top
@@ -180,11 +221,11 @@ class Command (_Base_Command_, CNDB.Command) :
             = cmd.auth_required
         result = rst_top.create (cmd, ** kw)
         result.add_entries \
-            ( RST_addons.Dashboard
+            ( FFW.RST_TOP_addons.Dashboard
                 ( auth_required   = auth_r
                 , pid             = "DB"
                 )
-            , TOP.Page_ReST
+            , FFW.RST_TOP_addons.Page_ReST
                 ( name            = "about"
                 , short_title     = "Über Funkfeuer"
                 , title           = "Über Funkfeuer"
@@ -196,59 +237,59 @@ class Command (_Base_Command_, CNDB.Command) :
                 , auth_required   = auth_r
                 , permission      = RST_addons.Login_has_Person
                 , entries         =
-                    [ RST_addons.User_Node
+                    [ FFW.RST_TOP_addons.User_Node
                         ( name            = "node"
                         )
-                    , RST_addons.User_Net_Device
+                    , FFW.RST_TOP_addons.User_Net_Device
                         ( name            = "device"
                         , short_title     = _T ("Device")
                         )
-                    , RST_addons.User_Net_Interface
+                    , FFW.RST_TOP_addons.User_Net_Interface
                         ( name            = "interface"
                         , short_title     = _T ("Interface")
                         )
-                    , RST_addons.User_Net_Interface_in_IP_Network
+                    , FFW.RST_TOP_addons.User_Net_Interface_in_IP_Network
                         ( name            = "interface_in_ip_network"
                         , short_title     = _T ("Interface in Network")
                         , hidden          = True
                         )
-                    , RST_addons.User_Wired_Interface
+                    , FFW.RST_TOP_addons.User_Wired_Interface
                         ( name            = "wired-interface"
                         , short_title     = _T ("Wired_Interface")
                         )
-                    , RST_addons.User_Wireless_Interface
+                    , FFW.RST_TOP_addons.User_Wireless_Interface
                         ( name            = "wireless-interface"
                         , short_title     = _T ("Wireless_Interface")
                         )
-                    , RST_addons.User_Wireless_Interface_uses_Antenna
+                    , FFW.RST_TOP_addons.User_Wireless_Interface_uses_Antenna
                         ( name            = "wireless-interface-uses-antenna"
                         , hidden          = True
                         )
-                    , RST_addons.User_Antenna
+                    , FFW.RST_TOP_addons.User_Antenna
                         ( name            = "antenna"
                         , short_title     = _T ("Antenna")
                         )
-                    , RST_addons.User_Person
+                    , FFW.RST_TOP_addons.User_Person
                         ( name            = "person"
                         , hidden          = True
                         )
-                    , RST_addons.User_Person_has_Address
+                    , FFW.RST_TOP_addons.User_Person_has_Address
                         ( name            = "has_address"
                         , hidden          = True
                         )
-                    , RST_addons.User_Person_has_Account
+                    , FFW.RST_TOP_addons.User_Person_has_Account
                         ( name            = "has_account"
                         , hidden          = True
                         )
-                    , RST_addons.User_Person_has_Email
+                    , FFW.RST_TOP_addons.User_Person_has_Email
                         ( name            = "has_email"
                         , hidden          = True
                         )
-                    , RST_addons.User_Person_has_IM_Handle
+                    , FFW.RST_TOP_addons.User_Person_has_IM_Handle
                         ( name            = "has_im_handle"
                         , hidden          = True
                         )
-                    , RST_addons.User_Person_has_Phone
+                    , FFW.RST_TOP_addons.User_Person_has_Phone
                         ( name            = "has_phone"
                         , hidden          = True
                         )
@@ -294,14 +335,14 @@ class Command (_Base_Command_, CNDB.Command) :
                         )
                     ]
                 )
-            , GTW.RST.MOM.Scope
+            , FFW.RST_Api_addons.Scope
                 ( name            = "api"
                 , auth_required   = auth_r
                 , exclude_robots  = True
                 , json_indent     = 2
                 , pid             = "RESTful"
                 )
-            , TOP.Page_ReST
+            , FFW.RST_TOP_addons.Page_ReST
                 ( name               = "impressum"
                 , short_title        = "Impressum"
                 , title              = "Impressum"
@@ -345,22 +386,132 @@ class Command (_Base_Command_, CNDB.Command) :
         return result
     # end def create_nav
 
+    def bytecode_cache_path (self, UTP) :
+        return sos.path.join (self.src_dir, UTP.cache_prefix + "jnj_cache")
+    # end def bytecode_cache_path
+
     def fixtures (self, scope) :
         import fixtures
         return fixtures.create (scope)
     # end def fixtures
 
+    def init_app_cache (self) :
+        self.__super.init_app_cache ()
+        root = self.root
+        if self._create_cache_p and root.Templateer is not None :
+            ### compile all templates to fill the bytecode cache
+            seen = set ()
+            for t in root.template_iter () :
+                for te in t.templates :
+                    if te.path not in seen :
+                        seen.add (te.path)
+                        te.template
+    # end def init_app_cache
+
     def _create_templateer (self, cmd, ** kw) :
         if cmd.UTP.use_templateer :
             import rst_top
             return self.__super._create_templateer \
                 ( cmd
+                , bytecode_cache    = FFW.Bytecode_Cache
+                    ( self.bytecode_cache_path (cmd.UTP)
+                    , writable = self._create_cache_p
+                    )
                 , load_path         = rst_top.template_dirs
                 , Media_Parameters  = rst_top.Media_Parameters
                 , ** kw
                 )
     # end def _create_templateer
 
+    def _handle_prerender_pages (self, cao) :
+        """Write the responses for anonymous requests of the pages
+           `cao.argv` and their entries as
+           `<prerender_root>/<language><href>/index.html` (or `index.json`).
+
+           Without `cao.argv`, all `prerendered_pages` are rendered into a
+           fresh directory that then replaces `prerender_root`. An existing
+           `prerender_root` is only replaced or written to if it contains
+           the marker file written by `prerender_pages`.
+        """
+        from werkzeug.test import Client
+        import tempfile
+        root   = sos.path.abspath (cao.prerender_root)
+        if sos.path.exists (root) and not self._prerendered_p (root) :
+            print \
+                ( "ERR:  %s doesn't contain pages written by "
+                  "`prerender_pages`, not touching it" % (root, )
+                )
+            return
+        self._wsgi_app (cao)
+        top    = self.root
+        client = Client (top, use_cookies = False)
+        l10n   = top.resource_from_href ("L10N")
+        langs  = sorted (l10n.languages) if l10n else cao.languages
+        urls   = cao.argv
+        target = root
+        if not urls :
+            urls   = self.prerendered_pages
+            parent = sos.path.dirname (root)
+            if not sos.path.isdir (parent) :
+                sos.mkdir_p (parent)
+            target = tempfile.mkdtemp (prefix = ".prerender-", dir = parent)
+            sos.chmod (target, 0o755)
+        elif not sos.path.isdir (target) :
+            sos.mkdir_p (target)
+        with open (sos.path.join (target, self.prerender_marker), "w") :
+            pass
+        def _resources (urls) :
+            for url in urls :
+                r = top.resource_from_href (url)
+                if r is not None :
+                    yield r
+                    for e in r.entries_transitive :
+                        yield e
+        try :
+            for r in _resources (urls) :
+                if r.auth_required :
+                    continue
+                href = r.abs_href
+                for lang in langs :
+                    app_iter, status, headers = client.get \
+                        ( href
+                        , headers = [("Cookie", "language=%s" % (lang, ))]
+                        )
+                    body = b"".join (app_iter)
+                    if not status.startswith ("200") :
+                        continue
+                    ext  = "html"
+                    if "json" in headers.get ("Content-Type", "") :
+                        ext = "json"
+                    name = sos.path.join \
+                        (target, lang, href.strip ("/"), "index." + ext)
+                    dir  = sos.path.dirname (name)
+                    if not sos.path.exists (dir) :
+                        sos.mkdir_p (dir)
+                    with open (name, "wb") as f :
+                        f.write (body)
+                    if cao.verbose :
+                        print (name)
+        except Exception :
+            if target != root :
+                sos.rmdir (target, deletefiles = True)
+            raise
+        if target != root :
+            old = None
+            if sos.path.exists (root) :
+                old = tempfile.mkdtemp \
+                    (prefix = ".prerender-old-", dir = sos.path.dirname (root))
+                old = sos.path.join (old, "pages")
+                sos.rename (root, old)
+            sos.rename (target, root)
+            if old is not None :
+                sos.rmdir (sos.path.dirname (old), deletefiles = True)
+    # end def _handle_prerender_pages
+
+    def _prerendered_p (self, root) :
+        return sos.path.isfile (sos.path.join (root, self.prerender_marker))
+    # end def _prerendered_p
+
 # end class Scaffold
 
 command = Command ()
@@ -18,6 +18,7 @@
 # Revision Dates
 #     3-Jun-2012 (CT) Creation
 #    17-Dec-2013 (CT) Add `httpd_config` to `Config_Dirs._defaults`
+#    17-Oct-2026 (agent) Add `prerendered_pages`
 #    ««revision-date»»···
 #--
 
@@ -28,6 +29,10 @@ class _Base_Command_ (TFL.Command.Root_Command) :
 
     nick                  = u"FFW"
 
+    ### Read-only pages written by `Command.py prerender_pages` and served
+    ### by nginx (see `httpd_config/prerendered.nginx`)
+    prerendered_pages     = ("/about", "/impressum", "/Doc", "/api-doc")
+
     class Config (TFL.Command.Root_Command.Config) :
 
         _default = ".ffw.config"
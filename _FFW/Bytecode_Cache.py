@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the package FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    FFW.Bytecode_Cache
+#
+# Purpose
+#    Persistent cache of the compiled jinja templates of FFW
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+from   _FFW                     import FFW
+
+from   _TFL                     import sos
+
+from   jinja2                   import FileSystemBytecodeCache
+
+_Ancestor = FileSystemBytecodeCache
+
+class Bytecode_Cache (_Ancestor) :
+    """On-disk cache of compiled templates shared by all worker processes.
+
+       The cache is only written by the process setting up the application
+       cache (`writable = True`), which removes any stale bytecode first;
+       all other processes load it read-only. Bytecode for templates
+       changed since then is ignored by jinja (the checksum of the source
+       doesn't match), these templates are compiled in memory as usual.
+    """
+
+    pattern                    = "%s.jnjc"
+
+    def __init__ (self, directory, writable = False) :
+        self.writable = writable
+        if writable and not sos.path.isdir (directory) :
+            sos.mkdir_p (directory)
+        _Ancestor.__init__ (self, directory, self.pattern)
+        if writable :
+            self.clear ()
+    # end def __init__
+
+    def dump_bytecode (self, bucket) :
+        if self.writable :
+            _Ancestor.dump_bytecode (self, bucket)
+    # end def dump_bytecode
+
+    def load_bytecode (self, bucket) :
+        try :
+            _Ancestor.load_bytecode (self, bucket)
+        except EnvironmentError :
+            pass
+    # end def load_bytecode
+
+# end class Bytecode_Cache
+
+if __name__ != "__main__" :
+    FFW._Export ("Bytecode_Cache")
+### __END__ FFW.Bytecode_Cache
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the package FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    FFW.RST_Api_addons
+#
+# Purpose
+#    Resources of the RESTful API of FFW caching the responses of E_Types,
+#    supporting compact and streamed JSON, and keyset pagination
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Add `compact` and `stream` options, keyset pagination
+#    ««revision-date»»···
+#--
+
+from   _FFW                     import FFW
+from   _GTW                     import GTW
+from   _MOM.import_MOM          import Q
+from   _TFL                     import TFL
+from   _TFL.pyk                 import pyk
+
+import _GTW._RST.HTTP_Status
+import _GTW._RST.Mime_Type
+import _GTW._RST._MOM.E_Type
+import _GTW._RST._MOM.Query_Restriction
+import _GTW._RST._MOM.Scope
+import _TFL._Meta.Object
+import _TFL.json_dump
+
+from   collections              import OrderedDict
+
+class Response_Cache (TFL.Meta.Object) :
+    """Cache of the response bodies of the E_Type resources of a scope.
+
+       Entries are keyed by resource, query, user, language, and renderer;
+       each entry records the `cid` of the last change of the E_Types of
+       its resource when the body was computed. An entry is only used if
+       that `cid` is still current, thus changes committed by other
+       processes are never hidden by the cache. Changes committed by this
+       process drop the entries of the affected E_Types immediately
+       (`invalidate` is registered as after-commit callback of the scope).
+
+       The least recently stored entries are dropped when more than
+       `max_entries` are cached.
+    """
+
+    max_entries                = 1000
+
+    def __init__ (self, max_entries = None) :
+        if max_entries is not None :
+            self.max_entries = max_entries
+        self.entries = OrderedDict ()
+        self.by_type = {}
+    # end def __init__
+
+    def get (self, key, cid) :
+        """Return cached body for `key`, if it is still valid for `cid`"""
+        entry = self.entries.get (key)
+        if entry is not None :
+            e_cid, body, _ = entry
+            if e_cid == cid :
+                return body
+            self._drop (key)
+    # end def get
+
+    def invalidate (self, scope, change_summary) :
+        """Drop all entries for E_Types changed by `change_summary`"""
+        for tn in set (c.type_name for c in change_summary.changes) :
+            for key in self.by_type.pop (tn, ()) :
+                self._drop (key)
+    # end def invalidate
+
+    def put (self, key, cid, body, type_names) :
+        """Store `body` for `key` computed for `cid`; `type_names` are the
+           names of the E_Types the body depends on.
+        """
+        entries = self.entries
+        self._drop (key)
+        entries [key] = (cid, body, type_names)
+        for tn in type_names :
+            self.by_type.setdefault (tn, set ()).add (key)
+        while len (entries) > self.max_entries :
+            self._drop (next (iter (entries)))
+    # end def put
+
+    def _drop (self, key) :
+        entry = self.entries.pop (key, None)
+        if entry is not None :
+            for tn in entry [2] :
+                keys = self.by_type.get (tn)
+                if keys is not None :
+                    keys.discard (key)
+    # end def _drop
+
+    def __len__ (self) :
+        return len (self.entries)
+    # end def __len__
+
+# end class Response_Cache
+
+class Streamed_Body (TFL.Meta.Object) :
+    """Body of a response whose `entries` are rendered one at a time.
+
+       `head` contains the other items of the body, `entries` yields
+       pairs of (pid, rendered entry), `next_href` returns the url of the
+       next page for the pid of the last entry and the number of entries
+       (or None, if there is no next page).
+    """
+
+    def __init__ (self, head, entries, ndjson = False, next_href = None) :
+        self.head      = head
+        self.entries   = entries
+        self.ndjson    = ndjson
+        self.next_href = next_href
+    # end def __init__
+
+# end class Streamed_Body
+
+class _FFW_RST_Api_JSON_ (GTW.RST.Mime_Type.JSON) :
+    """Renderer for JSON supporting compact output (query option
+       `compact`) and streamed bodies.
+
+       A `Streamed_Body` is written as a JSON document with the same
+       structure as the unstreamed body, the entries in chunks of
+       `chunk_size` (or as NDJSON: one line per entry, no head).
+    """
+
+    _real_name                 = "JSON"
+
+    chunk_size                 = 100
+    compact_kw                 = dict (indent = None, separators = (",", ":"))
+    ndjson_mime_type           = "application/x-ndjson"
+
+    def __call__ (self, request, response, body) :
+        if isinstance (body, Streamed_Body) :
+            self.set_mime_type (request, response, body)
+            if body.ndjson :
+                response.mimetype = self.ndjson_mime_type
+            response.response = self._chunks (body)
+        else :
+            return self.__super.__call__ (request, response, body)
+    # end def __call__
+
+    def dumped (self, value, compact = True) :
+        kw = self.json_dump_kw
+        if compact :
+            kw = dict (kw, ** self.compact_kw)
+        return TFL.json_dump.to_string (value, ** kw)
+    # end def dumped
+
+    def rendered (self, request, response, body) :
+        if isinstance (body, (dict, list, tuple)) :
+            return self.dumped (body, request.has_option ("compact"))
+    # end def rendered
+
+    def _chunks (self, body) :
+        dumped = self.dumped
+        chunk  = []
+        if not body.ndjson :
+            chunk.append ("{")
+            for k, v in sorted (pyk.iteritems (body.head)) :
+                chunk.append ("%s:%s," % (dumped (k), dumped (v)))
+            chunk.append ('"entries":[')
+        sep    = "" if body.ndjson else "\n"
+        last   = None
+        n      = 0
+        for n, (last, entry) in enumerate (body.entries, 1) :
+            chunk.append (sep + dumped (entry))
+            if body.ndjson :
+                chunk.append ("\n")
+            else :
+                sep = ",\n"
+            if len (chunk) >= self.chunk_size :
+                yield "".join (chunk).encode ("utf-8")
+                chunk = []
+        if not body.ndjson :
+            chunk.append ("\n]")
+            next_href = body.next_href and body.next_href (last, n)
+            if next_href :
+                chunk.append (',"next":%s' % (dumped (next_href), ))
+            chunk.append ("}\n")
+        if chunk :
+            yield "".join (chunk).encode ("utf-8")
+    # end def _chunks
+
+JSON = _FFW_RST_Api_JSON_ # end class
+
+_Ancestor = GTW.RST.MOM.Query_Restriction
+
+class _FFW_RST_Api_Query_Restriction_ (_Ancestor) :
+    """Query restriction supporting keyset pagination over pids.
+
+       `after=<pid>` restricts the query to entities with a pid greater
+       than `<pid>` ordered by pid. Together with `limit`, this pages
+       through a collection without the cost of `offset` and without
+       skipped or duplicated entries when entities are created or deleted
+       between requests. Start with `after=0`. As the next page starts
+       after the largest pid of the current page, `after` cannot be
+       combined with another `order_by`.
+    """
+
+    _real_name                 = "Query_Restriction"
+
+    after                      = None
+
+    def _setup_filters (self, E_Type, request, data, scope) :
+        after = data.pop ("after", None)
+        self.__super._setup_filters (E_Type, request, data, scope)
+        if after is not None :
+            try :
+                self.after = int (after)
+            except ValueError :
+                raise GTW.RST.HTTP_Status.Bad_Request \
+                    ("`after` must be a pid, not '%s'" % (after, ))
+            self.filters_q = self.filters_q + (Q.pid > self.after, )
+    # end def _setup_filters
+
+    def _setup_order_by (self, E_Type, request, data) :
+        if self.after is not None :
+            order_by = data.pop ("order_by", "").strip ()
+            if order_by and order_by != "pid" :
+                raise GTW.RST.HTTP_Status.Bad_Request \
+                    ( "`after` cannot be combined with `order_by=%s`"
+                    % (order_by, )
+                    )
+            self.order_by_q = TFL.Sorted_By ("pid")
+        else :
+            self.__super._setup_order_by (E_Type, request, data)
+    # end def _setup_order_by
+
+    def __bool__ (self) :
+        return self.after is not None or self.__super.__bool__ ()
+    # end def __bool__
+
+Query_Restriction = _FFW_RST_Api_Query_Restriction_ # end class
+
+_Ancestor = GTW.RST.MOM.E_Type
+
+class _FFW_RST_Api_E_Type_ (_Ancestor) :
+    """RESTful node for a specific essential type with cached responses.
+
+       The query option `stream` streams the entries of the response
+       from the database, in constant memory: `stream=ndjson` as one
+       line per entry, otherwise as chunked JSON document. `compact`
+       renders JSON without indentation. For keyset pagination, see
+       `Query_Restriction`: the url of the next page is returned as
+       `next` item of the body and `next` link header.
+    """
+
+    _real_name                 = "E_Type"
+
+    QR                         = Query_Restriction
+
+    class _FFW_RST_Api_E_Type_GET_ (_Ancestor.GET) :
+
+        _real_name             = "GET"
+
+        _renderers             = tuple \
+            (   JSON if r is GTW.RST.Mime_Type.JSON else r
+            for r in _Ancestor.GET._renderers
+            )
+
+        def _response_body (self, resource, request, response) :
+            stream = request.req_data.get ("stream")
+            if stream is not None and not request.has_option ("count") :
+                return self._response_stream \
+                    (resource, request, response, stream == "ndjson")
+            cache = resource.response_cache
+            ci    = resource.change_info
+            cid   = getattr (ci, "cid", None)
+            if cache is None or cid is None :
+                result = self._response_body_paged \
+                    (resource, request, response)
+            else :
+                key    = \
+                    ( resource.abs_href
+                    , request.query_string
+                    , request.username
+                    , request.language
+                    , getattr (response.renderer, "name", None)
+                    )
+                result = cache.get (key, cid)
+                if result is None :
+                    result = self._response_body_paged \
+                        (resource, request, response)
+                    if result is not None :
+                        cache.put \
+                            (key, cid, result, resource.change_query_types)
+            if isinstance (result, dict) and result.get ("next") :
+                response.add_link ("next", result ["next"])
+            return result
+        # end def _response_body
+
+        def _response_body_paged (self, resource, request, response) :
+            result = self.__super._response_body (resource, request, response)
+            if isinstance (result, dict) and "entries" in result :
+                qr    = resource.query_restriction
+                limit = getattr (qr, "limit", 0)
+                if limit and len (result ["entries"]) == limit :
+                    pid = max (o.pid for o in resource.objects)
+                    next_href = self._next_href \
+                        (resource, request, response, pid)
+                    if next_href :
+                        result ["next"] = next_href
+            return result
+        # end def _response_body_paged
+
+        def _response_stream (self, resource, request, response, ndjson) :
+            head  = self._response_dict (resource, request, response)
+            head.pop ("entries", None)
+            qr    = resource.query_restriction
+            query = resource.query (sort_key = Q.pid)
+            ### the entries are rendered after the request handler returned,
+            ### i.e., after `_handle_method_context` restored the state of
+            ### `resource` --> re-establish the state for rendering
+            state = dict (query_restriction = qr)
+            for k in ("attributes", "add_attributes") :
+                if k in resource.__dict__ :
+                    state [k] = resource.__dict__ [k]
+            def _entries () :
+                with resource.top.LET (user = request.user) :
+                    with resource.LET (** state) :
+                        with request.LET (_rst_seen = set ()) :
+                            for e in query :
+                                yield e.pid, self._response_entry \
+                                    (resource, request, response, e)
+            def next_href (pid, n) :
+                if n == qr.limit :
+                    return self._next_href (resource, request, response, pid)
+            return Streamed_Body (head, _entries (), ndjson, next_href)
+        # end def _response_stream
+
+        def _next_href (self, resource, request, response, pid) :
+            qr = resource.query_restriction
+            if pid is not None and getattr (qr, "after", None) is not None :
+                args = dict (pyk.iteritems (request.req_data))
+                args ["after"] = pid
+                return resource.abs_href + response.encoded_url (** args)
+        # end def _next_href
+
+    GET = _FFW_RST_Api_E_Type_GET_ # end class
+
+E_Type = _FFW_RST_Api_E_Type_ # end class
+
+_Ancestor = GTW.RST.MOM.Scope
+
+class _FFW_RST_Api_Scope_ (_Ancestor) :
+    """RESTful node for a scope caching the responses of its E_Types.
+
+       Pass `response_cache_size = 0` to disable the cache.
+    """
+
+    _real_name                 = "Scope"
+
+    E_Type                     = E_Type
+
+    response_cache_size        = Response_Cache.max_entries
+
+    def __init__ (self, ** kw) :
+        self.pop_to_self (kw, "response_cache_size")
+        self.__super.__init__ (** kw)
+        self.response_cache = None
+        if self.response_cache_size :
+            self.response_cache = Response_Cache (self.response_cache_size)
+            self.top.scope.add_after_commit_callback \
+                (self.response_cache.invalidate)
+    # end def __init__
+
+Scope = _FFW_RST_Api_Scope_ # end class
+
+if __name__ != "__main__" :
+    FFW._Export_Module ()
+### __END__ FFW.RST_Api_addons
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the package FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    FFW.RST_TOP_addons
+#
+# Purpose
+#    Resources of the RST.TOP tree of FFW supporting conditional GET
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+from   _FFW                     import FFW
+from   _GTW                     import GTW
+from   _TFL                     import TFL
+
+from   _CNDB._GTW               import RST_addons
+
+import _GTW.Notification
+import _GTW._RST._TOP.ReST
+import _TFL._Meta.Object
+import _TFL.Record
+
+from   _TFL.Decorator           import getattr_safe
+from   _TFL._Meta.Once_Property import Once_Property
+
+import hashlib
+
+def scope_change_info (scope) :
+    """Change info for the last change committed to `scope`"""
+    lc = scope.query_changes ().order_by (TFL.Sorted_By ("-cid")).first ()
+    if lc is not None :
+        return TFL.Record \
+            ( cid           = lc.cid
+            , etag          = str (lc.cid)
+            , last_modified = lc.time.replace (microsecond = 0)
+            )
+# end def scope_change_info
+
+class Conditional_GET_Mixin (TFL.Meta.Object) :
+    """Mixin enabling ETag and Last-Modified for a TOP resource.
+
+       The validators are derived from `change_info` (and the language
+       and user of the request, see `GTW.RST.Resource.get_etag`). A GET
+       with matching `If-None-Match` or `If-Modified-Since` is answered
+       with 304 before anything is rendered. No validators are sent while
+       the session holds notifications, as these are embedded into the
+       next page rendered.
+    """
+
+    skip_etag                  = False
+
+    def get_etag (self, request) :
+        if not self._notifications_pending (request) :
+            return self.__super.get_etag (request)
+    # end def get_etag
+
+    def get_last_modified (self, request) :
+        if not self._notifications_pending (request) :
+            return self.__super.get_last_modified (request)
+    # end def get_last_modified
+
+    def _notifications_pending (self, request) :
+        session = getattr (request, "session", None)
+        key     = GTW.Notification_Collection.session_key
+        return bool (session is not None and key in session and session [key])
+    # end def _notifications_pending
+
+# end class Conditional_GET_Mixin
+
+class Scope_Change_Info_Mixin (Conditional_GET_Mixin) :
+    """Mixin for TOP resources showing objects of arbitrary E_Types: the
+       change info is the one of the last change committed to the scope
+       (computed once per request).
+    """
+
+    @property
+    @getattr_safe
+    def change_info (self) :
+        infos  = self.top._change_infos
+        result = infos.get ("FFW.scope")
+        if result is None :
+            result = infos ["FFW.scope"] = scope_change_info (self.top.scope)
+        return result
+    # end def change_info
+
+# end class Scope_Change_Info_Mixin
+
+_Ancestor = RST_addons.Dashboard
+
+class _FFW_RST_TOP_Dashboard_ (Scope_Change_Info_Mixin, _Ancestor) :
+    """Dashboard supporting conditional GET."""
+
+    _real_name                 = "Dashboard"
+
+Dashboard = _FFW_RST_TOP_Dashboard_ # end class
+
+_Ancestor = GTW.RST.TOP.Page_ReST
+
+class _FFW_RST_TOP_Page_ReST_ (Conditional_GET_Mixin, _Ancestor) :
+    """Page_ReST with an ETag depending on `src_contents`, the version of
+       the application, and the template and media (`Templateer.etag`)
+       used to render it.
+    """
+
+    _real_name                 = "Page_ReST"
+
+    @Once_Property
+    @getattr_safe
+    def change_info (self) :
+        src = self.src_contents
+        if src is not None :
+            T       = self.Templateer
+            version = getattr (FFW, "Version", None)
+            parts   = \
+                ( version.version if version is not None else ""
+                , (T.etag or "") if T is not None else ""
+                , self.template_name or ""
+                , src
+                )
+            etag    = hashlib.sha1 ("::".join (parts).encode ("utf-8"))
+            return TFL.Record (etag = etag.hexdigest ())
+    # end def change_info
+
+Page_ReST = _FFW_RST_TOP_Page_ReST_ # end class
+
+### The `User_*` resources of `My-Funkfeuer` compute their `change_info`
+### from the changes of their E_Type but set `skip_etag`
+_user_resources = \
+    ( "User_Antenna"
+    , "User_Net_Device"
+    , "User_Net_Interface"
+    , "User_Net_Interface_in_IP_Network"
+    , "User_Node"
+    , "User_Person"
+    , "User_Person_has_Account"
+    , "User_Person_has_Address"
+    , "User_Person_has_Email"
+    , "User_Person_has_IM_Handle"
+    , "User_Person_has_Phone"
+    , "User_Wired_Interface"
+    , "User_Wireless_Interface"
+    , "User_Wireless_Interface_uses_Antenna"
+    )
+
+for _name in _user_resources :
+    _base = getattr (RST_addons, _name)
+    globals () [_name] = _base.__class__ \
+        ( "_FFW_RST_TOP_%s_" % (_name, )
+        , (Conditional_GET_Mixin, _base)
+        , dict
+            ( __doc__    = "%s supporting conditional GET." % (_name, )
+            , __module__ = __name__
+            , _real_name = _name
+            )
+        )
+del _name, _base
+
+if __name__ != "__main__" :
+    FFW._Export_Module ()
+### __END__ FFW.RST_TOP_addons
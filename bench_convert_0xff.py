@@ -0,0 +1,448 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    bench_convert_0xff
+#
+# Purpose
+#    Benchmark `convert_0xff` with a generated mesh
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import time
+
+from   rsclib.IP_Address      import IP4_Address
+from   _TFL                   import TFL
+from   _TFL.pyk               import pyk
+
+import _TFL.CAO
+
+from   olsr_snapshot          import OLSR_Snapshot
+from   spider_store           import Spider_Store, Spider_Device
+from   spider_store           import Spider_Interface, Spider_Inet4
+from   spider_store           import Spider_WLAN_Info
+
+class Mesh_Generator (object) :
+    """ Generate synthetic but realistic input for convert_0xff: a
+        PostgreSQL dump of the redeemer tables, an OLSR txtinfo dump with
+        topology, MID and HNA tables, and a spider dump, for a mesh of
+        `n_nodes` nodes.
+        The proportions (members per node, devices per node, addresses
+        per device, devices seen by the spider, duplicate contact data)
+        roughly follow the production data. The output only depends on
+        `n_nodes` and `seed`.
+    """
+
+    network   = IP4_Address ("44.0.0.0/8")
+    hna_net   = IP4_Address ("44.255.0.0/16")
+    created   = "2008-03-01 12:00:00+01"
+    changed   = "2012-06-01 12:00:00+02"
+
+    tables    = \
+        ( ( "members"
+          , ( ("id",                     "integer")
+            , ("firstname",              "character varying(255)")
+            , ("lastname",               "character varying(255)")
+            , ("nickname",               "character varying(255)")
+            , ("email",                  "character varying(255)")
+            , ("fax",                    "character varying(255)")
+            , ("telephone",              "character varying(255)")
+            , ("mobilephone",            "character varying(255)")
+            , ("homepage",               "character varying(255)")
+            , ("instant_messenger_nick", "character varying(255)")
+            , ("street",                 "character varying(255)")
+            , ("housenumber",            "character varying(255)")
+            , ("zip",                    "character varying(255)")
+            , ("town",                   "character varying(255)")
+            , ("mentor_id",              "integer")
+            , ("changed",                "timestamp with time zone")
+            , ("created",                "timestamp with time zone")
+            )
+          )
+        , ( "nodes"
+          , ( ("id",                     "integer")
+            , ("name",                   "character varying(255)")
+            , ("id_members",             "integer")
+            , ("id_tech_c",              "integer")
+            , ("gps_lat_deg",            "double precision")
+            , ("gps_lat_min",            "double precision")
+            , ("gps_lat_sec",            "double precision")
+            , ("gps_lon_deg",            "double precision")
+            , ("gps_lon_min",            "double precision")
+            , ("gps_lon_sec",            "double precision")
+            , ("map",                    "boolean")
+            , ("changed",                "timestamp with time zone")
+            , ("created",                "timestamp with time zone")
+            )
+          )
+        , ( "devices"
+          , ( ("id",                     "integer")
+            , ("id_nodes",               "integer")
+            , ("id_members",             "integer")
+            , ("name",                   "character varying(255)")
+            , ("hardware",               "character varying(255)")
+            , ("antenna",                "character varying(255)")
+            , ("comment",                "character varying(255)")
+            , ("changed",                "timestamp with time zone")
+            , ("created",                "timestamp with time zone")
+            )
+          )
+        , ( "ips"
+          , ( ("id",                     "integer")
+            , ("ip",                     "character varying(255)")
+            , ("cidr",                   "integer")
+            , ("id_devices",             "integer")
+            , ("id_nodes",               "integer")
+            , ("id_members",             "integer")
+            )
+          )
+        )
+
+    def __init__ (self, n_nodes, seed = 42) :
+        self.n_nodes = n_nodes
+        self.random  = random.Random (seed)
+        self.members = []
+        self.nodes   = []
+        self.devices = []
+        self.ips     = []
+        self.dev_ips = {}
+        self._generate ()
+    # end def __init__
+
+    def _generate (self) :
+        r         = self.random
+        n_members = max (2, self.n_nodes // 2)
+        for id in range (1, n_members + 1) :
+            self.members.append (self._member (id, n_members))
+        next_ip   = self.network.ip + 1
+        dev_id    = 1
+        ip_id     = 1
+        for id in range (1, self.n_nodes + 1) :
+            owner = r.randint (1, n_members)
+            tech  = r.randint (1, n_members) if r.random () < 0.1 else None
+            self.nodes.append \
+                ( ( id, "node%d" % id, owner, tech
+                  , 48 + r.random (), None, None
+                  , 16 + r.random (), None, None
+                  , r.random () < 0.9
+                  , self.changed, self.created
+                  )
+                )
+            for _ in range (r.choice ((1, 1, 1, 2, 2, 3))) :
+                self.devices.append \
+                    ( ( dev_id, id, None, "dev%d" % dev_id
+                      , "Linksys WRT54GL", "Omni 8dBi", ""
+                      , self.changed, self.created
+                      )
+                    )
+                ips = self.dev_ips [dev_id] = []
+                for _ in range (r.choice ((1, 1, 1, 1, 2))) :
+                    ip = str (IP4_Address (next_ip))
+                    # ips of devices are assigned to the admin member 1
+                    self.ips.append ((ip_id, ip, 24, dev_id, None, 1))
+                    ips.append ((id, ip))
+                    next_ip += 1
+                    ip_id   += 1
+                dev_id += 1
+    # end def _generate
+
+    def _member (self, id, n_members) :
+        r     = self.random
+        email = "user%d@example.com" % id
+        if r.random () < 0.02 :
+            # duplicate contact data exercises the dedup of the converter
+            email = "user%d@example.com" % r.randint (1, id)
+        phone = "01 %07d" % r.randint (1000000, 9999999)
+        return \
+            ( id, "First%d" % id, "Last%d" % id
+            , "nick%d" % id if r.random () < 0.5 else ""
+            , email
+            , ""
+            , phone if r.random () < 0.6 else ""
+            , "0664 %07d" % r.randint (1000000, 9999999)
+                if r.random () < 0.4 else ""
+            , "www.example.com/~%d" % id if r.random () < 0.1 else ""
+            , ""
+            , "Street %d" % id, str (r.randint (1, 200))
+            , str (1010 + 10 * r.randint (0, 22)), "Wien"
+            , r.randint (1, n_members) if r.random () < 0.3 else None
+            , self.changed, self.created
+            )
+    # end def _member
+
+    def write_dump (self, filename) :
+        rows = dict \
+            ( members = self.members
+            , nodes   = self.nodes
+            , devices = self.devices
+            , ips     = self.ips
+            )
+        with open (filename, "w") as f :
+            for name, columns in self.tables :
+                f.write ("CREATE TABLE %s (\n" % name)
+                f.write \
+                    ( ",\n".join
+                        ("    %s %s" % (c, t) for c, t in columns)
+                    )
+                f.write ("\n);\n\n")
+            for name, columns in self.tables :
+                f.write \
+                    ( "COPY %s (%s) FROM stdin;\n"
+                    % (name, ", ".join (c for c, _ in columns))
+                    )
+                for row in rows [name] :
+                    f.write ("\t".join (self._sql_value (v) for v in row))
+                    f.write ("\n")
+                f.write ("\\.\n\n")
+    # end def write_dump
+
+    @staticmethod
+    def _sql_value (v) :
+        if v is None :
+            return "\\N"
+        if v is True or v is False :
+            return "t" if v else "f"
+        return str (v)
+    # end def _sql_value
+
+    def olsr_tables (self) :
+        """ Return topology nodes, MID table, HNA destinations, and the
+            topology links.
+        """
+        r     = self.random
+        mid   = {}
+        mains = []
+        for dev_id, ips in sorted (pyk.iteritems (self.dev_ips)) :
+            main = IP4_Address (ips [0] [1])
+            mains.append (main)
+            if len (ips) > 1 :
+                mid [main] = [IP4_Address (ip) for _, ip in ips [1:]]
+        links = []
+        for i, a in enumerate (mains [1:], 1) :
+            links.append ((a, mains [r.randint (0, i - 1)]))
+        hna   = []
+        for i in range (max (1, len (mains) // 50)) :
+            net = IP4_Address (self.hna_net.ip + i * 16, 28)
+            hna.append ((net, r.choice (mains)))
+        return mains, mid, hna, links
+    # end def olsr_tables
+
+    def write_olsr (self, filename, binary = False) :
+        mains, mid, hna, links = self.olsr_tables ()
+        if binary :
+            OLSR_Snapshot.write (filename, mains, mid, [n for n, _ in hna])
+            return
+        with open (filename, "w") as f :
+            f.write ("Table: Topology\n")
+            f.write ("Dest. IP\tLast hop IP\tLQ\tNLQ\tCost\n")
+            for dst, last in links :
+                f.write ("%s\t%s\t1.000\t1.000\t1.000\n" % (dst, last))
+                f.write ("%s\t%s\t1.000\t1.000\t1.000\n" % (last, dst))
+            f.write ("\nTable: HNA\nDestination\tGateway\n")
+            for net, gw in hna :
+                f.write ("%s\t%s\n" % (net, gw))
+            f.write ("\nTable: MID\nIP address\tAliases\n")
+            for main, aliases in sorted (pyk.iteritems (mid)) :
+                f.write \
+                    ("%s\t%s\n" % (main, ";".join (str (a) for a in aliases)))
+            f.write ("\n")
+    # end def write_olsr
+
+    def spider_info (self) :
+        """ Dictionary mapping main ip to spider device for the devices
+            seen by the spider. Some spider devices span two redeemer
+            devices of a node, these are merged by the converter.
+        """
+        r      = self.random
+        result = {}
+        by_node = {}
+        for dev_id, ips in sorted (pyk.iteritems (self.dev_ips)) :
+            by_node.setdefault (ips [0] [0], []).append (ips)
+        for node_id, devs in sorted (pyk.iteritems (by_node)) :
+            if r.random () > 0.6 :
+                continue
+            if len (devs) > 1 and r.random () < 0.3 :
+                devs = [devs [0] + devs [1]] + devs [2:]
+            for ips in devs :
+                mainip = ips [0] [1]
+                dev    = Spider_Device (mainip)
+                for i, (_, ip) in enumerate (ips) :
+                    wlan = None
+                    name = "eth%d" % i
+                    if i == 0 :
+                        name = "wlan0"
+                        wlan = Spider_WLAN_Info \
+                            ( "802.11g", "Ad-Hoc", "02:CA:FF:EE:BA:BE"
+                            , "wien.funkfeuer.at", r.choice ((1, 6, 11))
+                            )
+                    iface = Spider_Interface (name, wlan is not None, wlan)
+                    iface.append_inet4 (Spider_Inet4 (ip, iface = name))
+                    dev.interfaces [name] = iface
+                result [mainip] = dev
+        return result
+    # end def spider_info
+
+    def write_spider (self, filename, binary = False) :
+        info = self.spider_info ()
+        if binary :
+            Spider_Store.write (filename, info)
+        else :
+            with open (filename, "wb") as f :
+                pickle.dump (info, f, pickle.HIGHEST_PROTOCOL)
+    # end def write_spider
+
+    def write (self, directory, binary = False) :
+        """ Write all inputs to `directory`, return their file names """
+        if not os.path.isdir (directory) :
+            os.makedirs (directory)
+        ext    = ".bin" if binary else ""
+        result = dict \
+            ( dump   = os.path.join (directory, "redeemer.sql")
+            , olsr   = os.path.join (directory, "txtinfo.txt" + ext)
+            , spider = os.path.join (directory, "spider.dump" + ext)
+            )
+        self.write_dump   (result ["dump"])
+        self.write_olsr   (result ["olsr"],   binary)
+        self.write_spider (result ["spider"], binary)
+        result ["rules"] = os.path.join (directory, "empty.rules")
+        with open (result ["rules"], "w") as f :
+            f.write \
+                ( "# No dedup and cleanup rules: the rules for the "
+                  "production data\n"
+                  "# refer to members that are random in the generated dump\n"
+                )
+        return result
+    # end def write
+
+# end class Mesh_Generator
+
+def git_commit () :
+    try :
+        return subprocess.check_output \
+            (["git", "rev-parse", "--short", "HEAD"]).decode ("ascii").strip ()
+    except (OSError, subprocess.CalledProcessError) :
+        return None
+# end def git_commit
+
+def run_convert (cmd, files, profile) :
+    """ Run convert_0xff on `files` in a separate process (so that the
+        peak RSS is that of one conversion), return its profile report.
+    """
+    script = os.path.join \
+        (os.path.dirname (os.path.abspath (__file__)), "convert_0xff.py")
+    args   = \
+        [ sys.executable, script
+        , "-olsr_file",   files ["olsr"]
+        , "-spider_dump", files ["spider"]
+        , "-network",     "%s;Synthetic mesh" % Mesh_Generator.network
+        , "-profile",     profile
+        , "-rules_file",  cmd.rules_file or files ["rules"]
+        ]
+    if cmd.plan :
+        args.append ("-plan")
+    if cmd.convert_args :
+        args.extend (cmd.convert_args.split ())
+    args.append (files ["dump"])
+    with open (os.devnull, "w") as devnull :
+        subprocess.check_call (args, stdout = devnull)
+    with open (profile) as f :
+        return json.load (f)
+# end def run_convert
+
+def compare (results, filename) :
+    """ Print wall time of each stage relative to the results in
+        `filename` (of a previous run, e.g., for another commit).
+    """
+    with open (filename) as f :
+        old = json.load (f)
+    for size, r in sorted (pyk.iteritems (results ["runs"]), key = int) :
+        o = old ["runs"].get (size)
+        if not o :
+            continue
+        print \
+            ( "Nodes: %s (%s vs. %s)"
+            % (size, results ["commit"], old ["commit"])
+            )
+        o_stages = dict ((s ["name"], s) for s in o ["profile"] ["stages"])
+        for s in r ["profile"] ["stages"] :
+            s_old = o_stages.get (s ["name"])
+            if s_old and s_old ["wall"] :
+                print \
+                    ( "    %-25s %8.3fs %8.3fs %6.2fx"
+                    % ( s ["name"], s ["wall"], s_old ["wall"]
+                      , s ["wall"] / s_old ["wall"]
+                      )
+                    )
+# end def compare
+
+def _main (cmd) :
+    results = dict (commit = git_commit (), runs = {})
+    for size in cmd.sizes :
+        directory = os.path.join (cmd.directory, str (size))
+        start     = time.time ()
+        gen       = Mesh_Generator (size, cmd.seed)
+        files     = gen.write (directory, cmd.binary)
+        run       = dict \
+            ( generate = time.time () - start
+            , inputs   = dict
+                (   (k, os.path.getsize (files [k]))
+                for k in ("dump", "olsr", "spider")
+                )
+            )
+        print \
+            ("Nodes: %7d, input generated in %.1fs" % (size, run ["generate"]))
+        if not cmd.generate_only :
+            profile = os.path.join (directory, "profile.json")
+            run ["profile"] = p = run_convert (cmd, files, profile)
+            for s in p ["stages"] :
+                print \
+                    ( "    %-25s wall %8.3fs cpu %8.3fs rss %8d kB (+%d)"
+                    % ( s ["name"], s ["wall"], s ["cpu"]
+                      , s ["max_rss_so_far"], s ["rss_increase"]
+                      )
+                    )
+        results ["runs"] [str (size)] = run
+    with open (cmd.output, "w") as f :
+        json.dump (results, f, indent = 2, sort_keys = True)
+    if cmd.compare and not cmd.generate_only :
+        compare (results, cmd.compare)
+# end def _main
+
+_Command = TFL.CAO.Cmd \
+    ( handler         = _main
+    , opts            =
+        ( "sizes:I,=1000,10000?Number of nodes of the generated meshes"
+        , "seed:I=42?Seed of the random generator"
+        , "directory:S=bench?Directory for generated input"
+        , "binary:B?Generate OLSR snapshot and spider store"
+        , "plan:B?Run the converter in plan mode (no database)"
+        , "convert_args:S?Additional arguments passed to convert_0xff"
+        , "rules_file:S?Rules file passed to convert_0xff "
+            "(default: empty rules)"
+        , "generate_only:B?Only generate input, don't run the converter"
+        , "output:S=bench_results.json?File for results"
+        , "compare:S?Compare with results of a previous run"
+        )
+    , max_args        = 0
+    )
+
+if __name__ == "__main__" :
+    _Command ()
+### __END__ bench_convert_0xff
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+### pytest puts the directory of this file, i.e., the directory containing
+### the modules of the converter, on `sys.path` for the tests in `tests/`
+
+### __END__ conftest
@@ -12,11 +12,11 @@ import sys, os
 import re
 import uuid
 import pickle
+import multiprocessing
 
 from   datetime               import datetime, tzinfo, timedelta
 from   rsclib.IP_Address      import IP4_Address, IP6_Address
-from   rsclib.Phone           import Phone
-from   rsclib.sqlparser       import make_naive, SQL_Parser
+from   rsclib.sqlparser       import make_naive
 from   _GTW                   import GTW
 from   _TFL                   import TFL
 from   _TFL.pyk               import pyk
@@ -24,19 +24,63 @@ from   _CNDB                  import CNDB
 import _CNDB._OMP
 from   _GTW._OMP._PAP         import PAP
 from   _GTW._OMP._Auth        import Auth
-from   _MOM.import_MOM        import Q
+from   _MOM.import_MOM        import MOM, Q
 from   ff_olsr.parser         import get_olsr_container
-from   ff_spider.parser       import Guess
-from   ff_spider.common       import unroutable, Interface, Inet4, WLAN_Config
+from   ff_spider.common       import unroutable, WLAN_Config
 
 import _TFL.CAO
 import Command
 
+from   dedup                  import Dedup_Index
+from   diagnostics            import Diagnostics
+from   ip_index               import Net_Index, Network_Cache
+from   ip_index               import Address_Index, Address_Set
+from   ip_index               import address, address_key
+from   olsr_snapshot          import OLSR_Snapshot
+from   phone_normalizer       import Phone_Normalizer
+from   plan                   import Plan_Scope
+from   profiler               import Stage_Profiler
+from   rules                  import Rules
+from   snapshot               import Snapshot
+from   spider_store           import Spider_Store
+from   spider_store           import Spider_Interface, Spider_Inet4
+from   spider_store           import Spider_Inet6
+from   sql_dump               import Dump_Reader
+from   sync_state             import Sync_State
+from   union_find             import Union_Find
+
 def ip_mask_key (x) :
     """ Key for sorting IPs (as key of a dict iter) """
     return (x [0].mask, x [0], x [1:])
 # end def ip_mask_key
 
+unroutable_ip6 = Net_Index \
+    ( IP6_Address (n)
+    for n in ("::1/128", "::/128", "fe80::/10", "fc00::/7", "ff00::/8")
+    )
+
+def unroutable_ip (ip) :
+    """ True if address string `ip` is not routable: rfc1918, link
+        local, localnet (IPv4), loopback, unspecified, link local, unique
+        local, multicast (IPv6).
+    """
+    if ':' in ip :
+        return IP6_Address (ip) in unroutable_ip6
+    return unroutable (ip)
+# end def unroutable_ip
+
+def ip_key (ip) :
+    """ Integer key of address string `ip`, independent of its spelling
+        (case and compression of IPv6 addresses)
+    """
+    return address_key (address (ip))
+# end def ip_key
+
+def spider_addresses (iface) :
+    """ Sorted IPv4 and IPv6 addresses of spider interface `iface` """
+    return sorted (iface.inet4) + sorted (getattr (iface, 'inet6', ()))
+# end def spider_addresses
+
 class Consolidated_Interface (object) :
     """ An interface built from several redeemer devices using
         information from the OLSR MID table and the spider data.
@@ -47,28 +91,37 @@ class Consolidated_Interface (object) :
         These interfaces can later be merged using spider info (from the
         olsr mid table we don't know if these belong to the same or
         different interfaces of the same device).
-        The original ip address is used as identity of this object, it
-        is used to store the interface in a Consolidated_Device.
+        The original ip address is used as identity of this object, its
+        `ip_key` is used to store the interface in a Consolidated_Device.
+        The addresses of the interface are stored by `ip_key`, too.
     """
 
     wl_modes = WLAN_Config.modes
 
+    __slots__ = \
+        ( "convert", "debug", "device", "idxdev", "ip", "key", "idx", "ips"
+        , "merged_ifs", "merged", "is_wlan", "wlan_info", "names"
+        , "spider_ip", "verbose", "name", "net_interface"
+        )
+
     def __init__ (self, convert, device, ip, idx) :
         self.convert       = convert
         self.debug         = convert.debug
         self.device        = device
         self.idxdev        = device
         self.ip            = ip.ip
+        self.key           = ip_key (ip.ip)
         self.idx           = idx
-        self.ips           = { ip.ip : ip }
+        self.ips           = { self.key : ip }
         self.merged_ifs    = []
         self.merged        = None
-        self.debug         = convert.debug
         self.is_wlan       = False
         self.wlan_info     = None
         self.names         = []
         self.spider_ip     = None
         self.verbose       = convert.verbose
+        self.name          = device.name
+        self.net_interface = None
         assert self.device
     # end def __init__
 
@@ -84,9 +137,12 @@ class Consolidated_Interface (object) :
         if self.spider_ip :
             desc.append ('Spider IP: %s' % self.spider_ip)
         desc = '\n'.join (desc) or None
+        create = self.convert.loader
         if self.is_wlan :
-            iface   = self.net_interface = ffw.Wireless_Interface \
-                (left = dev, name = self.ifname, desc = desc, raw = True)
+            iface   = self.net_interface = create \
+                ( ffw.Wireless_Interface
+                , left = dev, name = self.ifname, desc = desc, raw = True
+                )
             if self.wlan_info :
                 std = None
                 if self.wlan_info.standard is not None :
@@ -99,12 +155,14 @@ class Consolidated_Interface (object) :
                 bsid = self.wlan_info.bssid
                 ssid = self.wlan_info.ssid
                 if bsid is not None and len (bsid.split (':')) != 6 :
-                    print ("INFO: Ignoring bssid: %s" % bsid)
+                    self.convert.diag.info \
+                        ("invalid_bssid", "Ignoring bssid: %s", bsid)
                     bsid = None
                 if ssid is not None :
                     ssid = ssid.replace (r'\x09', '\x09')
                     if len (ssid) > 32 :
-                        print ("WARN: Ignoring long ssid %s" % ssid)
+                        self.convert.diag.warn \
+                            ("invalid_ssid", "Ignoring long ssid %s", ssid)
                         ssid = None
                 iface.set_raw \
                     ( mode     = mode
@@ -117,10 +175,11 @@ class Consolidated_Interface (object) :
                         (std, self.wlan_info.channel, raw = True)
                     ffw.Wireless_Interface_uses_Wireless_Channel (iface, chan)
         else :
-            iface   = self.net_interface = ffw.Wired_Interface \
-                (left = dev, name = self.ifname, desc = desc, raw = True)
+            iface   = self.net_interface = create \
+                ( ffw.Wired_Interface
+                , left = dev, name = self.ifname, desc = desc, raw = True
+                )
         manager = dev.node.manager
-        scope   = self.convert.scope
         for ip in pyk.itervalues (self.ips) :
             if self.verbose :
                 print \
@@ -129,13 +188,12 @@ class Consolidated_Interface (object) :
                     )
             assert not ip.done
             ip.set_done ()
-            net     = IP4_Address (ip.ip, ip.cidr)
-            network = ffw.IP4_Network.instance (net)
-            netadr  = network.reserve (ip.ip, manager)
-            ffw.Net_Interface_in_IP4_Network \
-                (iface, netadr, mask_len = 32, name = self.ipname)
-            if len (scope.uncommitted_changes) > 10 :
-                scope.commit ()
+            netadr = self.convert.reserve_address (ip.ip, manager)
+            etype, mask_len = ffw.Net_Interface_in_IP4_Network, 32
+            if ':' in ip.ip :
+                etype, mask_len = ffw.Net_Interface_in_IP6_Network, 128
+            create \
+                (etype, iface, netadr, mask_len = mask_len, name = self.ipname)
     # end def create
 
     @property
@@ -160,19 +218,11 @@ class Consolidated_Interface (object) :
             print ("Merge: %s\n    -> %s" % (other, self))
             print ("Merge: dev: %s" % self.device)
         self.ips.update (other.ips)
-        del other.device.interfaces [other.ip]
+        del other.device.interfaces [other.key]
         self.merged_ifs.append (other)
         other.merged = self
     # end def merge
 
-    def __getattr__ (self, name) :
-        if not hasattr (self, 'idxdev') :
-            raise AttributeError ("device info gone")
-        r = getattr (self.idxdev, name)
-        setattr (self, name, r)
-        return r
-    # end def __getattr__
-
     def __repr__ (self) :
         return "%s (ip = %s)" % (self.__class__.__name__, self.ip)
     # end def __repr__
@@ -184,7 +234,18 @@ class Consolidated_Device (object) :
     """ A device built from several redeemer devices using information
         from the OLSR MID table and the spider data.
         Initially we have a single interface with our devid.
+        The fields of the redeemer device used by the conversion are
+        copied from the redeemer row.
     """
+
+    __slots__ = \
+        ( "convert", "debug", "devid", "redeemer_devs", "interfaces"
+        , "merged", "merged_devs", "mid_ip", "if_idx", "net_device", "hna"
+        , "node", "done"
+        ### fields of the redeemer device
+        , "id", "id_nodes", "id_members", "name", "changed", "created"
+        )
+
     def __init__ (self, convert, redeemer_dev) :
         self.convert       = convert
         self.debug         = convert.debug
@@ -194,10 +255,16 @@ class Consolidated_Device (object) :
         self.merged        = None
         self.merged_devs   = []
         self.mid_ip        = None
-        self.debug         = convert.debug
         self.if_idx        = 0
         self.net_device    = None
         self.hna           = False
+        self.done          = False
+        self.id            = redeemer_dev.id
+        self.id_nodes      = redeemer_dev.id_nodes
+        self.id_members    = redeemer_dev.id_members
+        self.name          = redeemer_dev.name
+        self.changed       = redeemer_dev.changed
+        self.created       = redeemer_dev.created
         self.redeemer_devs [self.devid] = redeemer_dev
         self.node          = convert.node_by_id [self.id_nodes]
     # end def __init__
@@ -211,14 +278,14 @@ class Consolidated_Device (object) :
         """ Add redeemer ip address. """
         assert not ip.id_nodes
         if ip.id_members or ip.id_members != 1 :
-            print \
-                ( "WARN: IP %s %s has member ID %s" \
-                % (ip.ip, ip.id, ip.id_members)
+            self.convert.diag.warn \
+                ( "ip_has_member"
+                , "IP %s %s has member ID %s", ip.ip, ip.id, ip.id_members
                 )
         assert not self.merged_devs
-        assert ip.ip not in self.interfaces
-        self.interfaces [ip.ip] = \
-            Consolidated_Interface (self.convert, self, ip, self.if_idx)
+        iface = Consolidated_Interface (self.convert, self, ip, self.if_idx)
+        assert iface.key not in self.interfaces
+        self.interfaces [iface.key] = iface
         self.if_idx += 1
     # end def add_redeemer_ip
 
@@ -229,16 +296,19 @@ class Consolidated_Device (object) :
         ffw = self.convert.ffw
         if self.debug :
             print ('dev:', self.id, self.name)
+        diag = self.convert.diag
         if self.if_idx > 1 :
-            print \
-                ( "WARN: dev %s.%s has %d ips in redeemer" \
-                % (self.node.name, self.name, self.if_idx)
+            diag.warn \
+                ( "device_multiple_ips"
+                , "dev %s.%s has %d ips in redeemer"
+                , self.node.name, self.name, self.if_idx
                 )
         for d in self.merged_devs :
             if d.if_idx > 1 :
-                print \
-                    ( "WARN: dev %s.%s has %d ips in redeemer" \
-                    % (d.node.name, d.name, self.if_idx)
+                diag.warn \
+                    ( "device_multiple_ips"
+                    , "dev %s.%s has %d ips in redeemer"
+                    , d.node.name, d.name, self.if_idx
                     )
         # FIXME: We want correct info from nodes directly
         # looks like most firmware can give us this info
@@ -251,8 +321,9 @@ class Consolidated_Device (object) :
         d    = self.redeemer_devs [self.devid]
         desc = '\n'.join \
             (': '.join ((v, d [k])) for k, v in pyk.iteritems (comments) if d [k])
-        dev = self.net_device = ffw.Net_Device \
-            ( left = devtype
+        dev = self.net_device = self.convert.loader \
+            ( ffw.Net_Device
+            , left = devtype
             , node = self.ffw_node
             , name = self.shortest_name
             , desc = desc
@@ -263,13 +334,12 @@ class Consolidated_Device (object) :
         assert not self.id_members
         for iface in pyk.itervalues (self.interfaces) :
             iface.create ()
-        self.convert.scope.commit ()
         return dev
     # end def create
 
     def ip_iter (self) :
-        for ip in pyk.iterkeys (self.interfaces) :
-            yield ip
+        for ifc in pyk.itervalues (self.interfaces) :
+            yield ifc.ip
     # end def ip_iter
 
     def merge (self, other) :
@@ -278,11 +348,7 @@ class Consolidated_Device (object) :
         self.interfaces.update    (other.interfaces)
         if self.debug :
             print ("Merge: %s\n    -> %s" % (other, self))
-        #assert not other.merged
-        if other.merged :
-            msg = "Merge: already merged to %s" % other.merged
-            print (msg)
-            raise ValueError (msg)
+        assert not other.merged
         for ifc in pyk.itervalues (other.interfaces) :
             ifc.device = self
         other.merged = self
@@ -292,6 +358,25 @@ class Consolidated_Device (object) :
         assert other.devid in self.redeemer_devs
     # end def merge
 
+    @property
+    def signature (self) :
+        """ Changes if any of the redeemer devices, the ip addresses,
+            or the interface info from the spider changes.
+        """
+        return \
+            ( self.id_nodes
+            , sorted
+                ( (d.id, d.changed, d.created)
+                for d in pyk.itervalues (self.redeemer_devs)
+                )
+            , sorted
+                ( (ip.ip, ifc.names, ifc.is_wlan)
+                for ifc in pyk.itervalues (self.interfaces)
+                for ip  in pyk.itervalues (ifc.ips)
+                )
+            )
+    # end def signature
+
     @property
     def shortest_name (self) :
         """ Shortest name of all merged devices """
@@ -302,13 +387,9 @@ class Consolidated_Device (object) :
         return sn
     # end def shortest_name
 
-    def __getattr__ (self, name) :
-        if not hasattr (self, 'redeemer_devs') or not hasattr (self, 'devid') :
-            raise AttributeError ("redeemer dev info gone")
-        r = getattr (self.redeemer_devs [self.devid], name)
-        setattr (self, name, r)
-        return r
-    # end def __getattr__
+    def set_done (self, done = True) :
+        self.done = done
+    # end def set_done
 
     def __repr__ (self) :
         ndev = self.net_device
@@ -321,8 +402,274 @@ class Consolidated_Device (object) :
 
 # end class Consolidated_Device
 
+def load_olsr (olsr_file, diag) :
+    """ Parse OLSR txtinfo file into compact, picklable tables:
+        topology nodes, MID table by ip, HNA destinations, and the
+        reverse MID table (all MID aliases, supporting `in_net`). The
+        Diagnostics `diag` is returned as last element.
+        `olsr_file` is either a txtinfo dump or a binary snapshot of it
+        written by `olsr_snapshot.py`. The tables of a snapshot are used
+        as they are (they support the lookups and the iteration done by
+        the converter), only the reverse MID table is computed.
+        The tables are read-only: addresses not in the redeemer database
+        are skipped by the converter, not removed.
+    """
+    if OLSR_Snapshot.is_snapshot (olsr_file) :
+        olsr    = OLSR_Snapshot.load (olsr_file)
+        nodes   = olsr.nodes
+        mid     = olsr.by_ip
+        hna     = olsr.by_dest
+        n_alias = len (mid.aliases)
+        rev_mid = olsr.alias_table ()
+    else :
+        olsr    = get_olsr_container (olsr_file)
+        nodes   = dict.fromkeys (olsr.topo.forward, True)
+        nodes.update (dict.fromkeys (olsr.topo.reverse, True))
+        mid     = dict (olsr.mid.by_ip)
+        hna     = dict.fromkeys (olsr.hna.by_dest, True)
+        aliases = [a for v in pyk.itervalues (mid) for a in v]
+        n_alias = len (aliases)
+        rev_mid = Address_Set (aliases)
+    for k in mid :
+        if k not in nodes :
+            diag.warn \
+                ("mid_not_in_topology", "MIB %s: not in OLSR Topology", k)
+        #assert k in nodes
+    # each address is an alias of at most one MID entry
+    assert len (rev_mid) == n_alias
+    return nodes, mid, hna, rev_mid, diag
+# end def load_olsr
+
+class Spider_Index (object) :
+    """ Spider devices of a Spider_Store with the routable addresses each
+        of them owns, resolved lazily: a device is only built and checked
+        when `devices` reaches it, the owner of an address is found via
+        `Spider_Store.lookup_all` without building other devices.
+        An address is owned by the first device of the store having it
+        (and not ignoring it via `-spider_ignore_ip`), the spider address
+        of a device counts as one of its addresses (if none of its
+        interfaces has it, the device gets an interface `unknown` with
+        it). Interfaces of a device sharing an address are merged into
+        the first of them.
+    """
+
+    def __init__ (self, store, spider_ignore_ip, verbose = False) :
+        self.store    = store
+        self.ignore   = spider_ignore_ip
+        self.verbose  = verbose
+        self.resolved = {}
+    # end def __init__
+
+    def devices (self, diag) :
+        """ Yield `(device, owned)` for the devices owning an address, in
+            the order of the store; `owned` maps the `ip_key` of each
+            address owned by the device to the spider interface of it.
+        """
+        for i in range (len (self.store)) :
+            owned = self._resolve (i, diag)
+            if owned :
+                yield self.store.device (i), owned
+    # end def devices
+
+    def _ignored (self, i) :
+        return self.ignore.get (self.store.columns ["devices.mainip"] [i], ())
+    # end def _ignored
+
+    def _owner (self, ip) :
+        """ Index of the device owning routable address `ip` or None """
+        store      = self.store
+        candidates = set (i for i, j in store.lookup_all (ip))
+        if str (ip) in store.by_mainip :
+            candidates.add (store.by_mainip [str (ip)])
+        for i in sorted (candidates) :
+            if str (ip) not in self._ignored (i) :
+                return i
+    # end def _owner
+
+    def _resolve (self, i, diag) :
+        """ Build device `i`, return dict mapping the `ip_key` of each
+            address owned by it to its spider interface.
+        """
+        try :
+            return self.resolved [i]
+        except KeyError :
+            pass
+        result  = self.resolved [i] = {}
+        dev     = self.store.device (i)
+        ip      = dev.mainip
+        ignore  = self._ignored (i)
+        verbose = self.verbose
+        if verbose :
+            print ("IP:", ip)
+        for iface in sorted (pyk.itervalues (dev.interfaces)) :
+            target = iface
+            owned  = []
+            for ip4 in spider_addresses (iface) :
+                i4 = ip4.ip
+                # ignore rfc1918, link local, localnet
+                if unroutable_ip (i4) :
+                    continue
+                # ignore explicitly specified ips
+                if str (i4) in ignore :
+                    diag.info ("spider_ip_ignored", "Ignoring %s/%s", ip, i4)
+                    continue
+                owner = self._owner (i4)
+                if owner != i :
+                    other = self.store.device (owner)
+                    diag.warn \
+                        ( "spider_device_conflict"
+                        , "Device %s/%s not equal:", ip, i4
+                        , detail = lambda : "\n".join
+                            ( ( "=" * 60
+                              , dev.verbose_repr ()
+                              , "-" * 60
+                              , other.verbose_repr ()
+                              , "=" * 60
+                              )
+                            )
+                        )
+                    continue
+                k    = ip_key (i4)
+                spif = result.get (k)
+                if spif is not None and spif is not iface :
+                    diag.warn \
+                        ( "spider_shared_ip"
+                        , "Interfaces %s/%s of dev-ip %s share ip %s"
+                        , iface.name, spif.name, ip, i4
+                        )
+                    if target is iface :
+                        target = spif
+                        spif.names.append (iface.name)
+                        if iface.is_wlan :
+                            spif.is_wlan   = iface.is_wlan
+                            spif.wlan_info = iface.wlan_info
+                    if verbose :
+                        print ("=" * 60)
+                        print (iface)
+                        print (spif)
+                        print ("-" * 60)
+                        print (dev.verbose_repr ())
+                        print ("=" * 60)
+                    continue
+                owned.append (k)
+            for k in owned :
+                result [k] = target
+        k = ip_key (ip)
+        if  (   k not in result
+            and not unroutable_ip (ip)
+            and self._owner (ip) == i
+            ) :
+            diag.warn ("spider_ip_not_in_dev", "ip %s not in dev", ip)
+            if verbose :
+                print ("=" * 60)
+                print (dev.verbose_repr ())
+                print ("=" * 60)
+            name = 'unknown'
+            assert name not in dev.interfaces
+            iface = Spider_Interface (name)
+            if ':' in str (ip) :
+                iface.append_inet6 (Spider_Inet6 (ip, iface = name))
+            else :
+                iface.append_inet4 (Spider_Inet4 (ip, iface = name))
+            iface.device = dev
+            dev.interfaces [name] = result [k] = iface
+        return result
+    # end def _resolve
+
+# end class Spider_Index
+
+def load_spider (spider_dump, spider_ignore_ip, diag, verbose = False) :
+    """ Load spider store (a pickled spider dump is converted to a store in
+        memory), return a Spider_Index of it and the Diagnostics `diag`.
+    """
+    if Spider_Store.is_store (spider_dump) :
+        store = Spider_Store.load (spider_dump)
+    else :
+        with open (spider_dump, 'rb') as f :
+            store = Spider_Store.from_info (pickle.load (f))
+    return Spider_Index (store, spider_ignore_ip, verbose), diag
+# end def load_spider
+
+def load_inputs (loaders, parallel = False, local = None) :
+    """ Call each `(function, args)` of `loaders`, return list of results.
+        With `parallel`, the loaders run concurrently in a process pool,
+        each result is pickled back to this process in one piece (so
+        objects shared inside a result stay shared); `local` is called in
+        this process while the pool is busy.
+    """
+    if not parallel :
+        result = [fun (* args) for fun, args in loaders]
+        if local is not None :
+            local ()
+        return result
+    pool = multiprocessing.Pool (len (loaders))
+    try :
+        results = [pool.apply_async (fun, args) for fun, args in loaders]
+        if local is not None :
+            local ()
+        return [r.get () for r in results]
+    finally :
+        pool.close ()
+        pool.join  ()
+# end def load_inputs
+
+class Batch_Loader (object) :
+    """ Bulk-load entities created by the conversion.
+        All creations of the conversion go to the scope, the loader
+        commits them in batches: when `batch_size` changes are pending
+        before the next entity is created, the whole batch is flushed in
+        a single transaction. Flushing only before a creation keeps an
+        entity and the changes made to it right after creation (e.g.,
+        `set_last_change`) in the same transaction.
+        All entities created in the scope are counted by type, from the
+        `Create` changes of the change summary of the scope (so entities
+        created directly, not via the loader, are counted, too). Commits
+        are counted if they are done via `flush`, including the final
+        one.
+    """
+
+    def __init__ (self, scope, batch_size) :
+        self.scope      = scope
+        self.batch_size = batch_size
+        self.count      = {}
+        self.commits    = 0
+    # end def __init__
+
+    def __call__ (self, etype, * args, ** kw) :
+        """ Create entity of `etype`, flush batch first if it is full """
+        if len (self.scope.uncommitted_changes) >= self.batch_size :
+            self.flush ()
+        return etype (* args, ** kw)
+    # end def __call__
+
+    def created (self) :
+        """ Number of entities created by type name, committed or not """
+        result = dict (self.count)
+        self._count_created (result)
+        return result
+    # end def created
+
+    def flush (self) :
+        """ Commit pending changes """
+        if self.scope.uncommitted_changes :
+            self._count_created (self.count)
+            self.scope.commit ()
+            self.commits += 1
+    # end def flush
+
+    def _count_created (self, count) :
+        for c in self.scope.uncommitted_changes :
+            if isinstance (c, MOM.SCM.Change.Create) :
+                count [c.type_name] = count.get (c.type_name, 0) + 1
+    # end def _count_created
+
+# end class Batch_Loader
+
 class Convert (object) :
 
+    # Only these tables of the redeemer dump are read
+    dump_tables = ("nodes", "devices", "ips", "members")
+
     def __init__ (self, cmd, scope, debug = False) :
         self.debug     = debug
         self.verbose   = cmd.verbose
@@ -349,120 +696,80 @@ class Convert (object) :
                 if ip_dev not in self.spider_ignore_ip :
                     self.spider_ignore_ip [ip_dev] = []
                 self.spider_ignore_ip [ip_dev].append (ip)
-        olsr = get_olsr_container (cmd.olsr_file)
-        self.olsr_nodes   = {}
-        for t in pyk.iterkeys (olsr.topo.forward) :
-            self.olsr_nodes [t]   = True
-        for t in pyk.iterkeys (olsr.topo.reverse) :
-            self.olsr_nodes [t]   = True
-        self.olsr_mid     = olsr.mid.by_ip
-        self.olsr_hna     = olsr.hna
-        self.rev_mid      = {}
-        for k, v in pyk.iteritems (self.olsr_mid) :
-            if k not in self.olsr_nodes :
-                print ("WARN: MIB %s: not in OLSR Topology" % k)
-            #assert k in self.olsr_nodes
-            for mid in v :
-                assert mid not in self.rev_mid
-                self.rev_mid [mid] = True
-        self.spider_info  = pickle.load (open (cmd.spider_dump, 'rb'))
-        self.spider_devs  = {}
-        self.spider_iface = {}
-        for ip, dev in pyk.iteritems (self.spider_info) :
-            if self.verbose :
-                print ("IP:", ip)
-            ignore = {}
-            if str (ip) in self.spider_ignore_ip :
-                ignore = dict.fromkeys (self.spider_ignore_ip [str (ip)])
-            # ignore spider errors
-            if not isinstance (dev, Guess) :
-                continue
-            dev.mainip = ip
-            dev.done   = False
-            for iface in pyk.itervalues (dev.interfaces) :
-                iface.done = False
-                for ip4 in iface.inet4 :
-                    i4 = ip4.ip
-                    # ignore rfc1918, link local, localnet
-                    if unroutable (i4) :
-                        continue
-                    # ignore explicitly specified ips
-                    if str (i4) in ignore :
-                        print ("INFO: Ignoring %s/%s" % (ip, i4))
-                        continue
-                    if  (   i4 in self.spider_devs
-                        and self.spider_devs [i4] != dev
-                        ) :
-                        print ("WARN: Device %s/%s not equal:" % (ip, i4))
-                        print ("=" * 60)
-                        print (dev.verbose_repr ())
-                        print ("-" * 60)
-                        print (self.spider_devs [i4].verbose_repr ())
-                        print ("=" * 60)
-                        continue
-                    elif (   i4 in self.spider_iface
-                         and self.spider_iface [i4] != iface
-                         ) :
-                        assert dev == self.spider_devs [i4]
-                        spif = self.spider_iface [i4]
-                        print \
-                            ( "WARN: Interfaces %s/%s of dev-ip %s share ip %s"
-                            % (iface.name, spif.name, ip, i4)
-                            )
-                        spif.names.append (iface.name)
-                        if iface.is_wlan :
-                            spif.is_wlan = iface.is_wlan
-                            spif.wlan_info = getattr (iface, 'wlan_info', None)
-                        if self.verbose :
-                            print ("=" * 60)
-                            print (iface)
-                            print (spif)
-                            print ("-" * 60)
-                            print (dev.verbose_repr ())
-                            print ("=" * 60)
-                        iface = spif
-                    self.spider_devs  [i4] = dev
-                    self.spider_iface [i4] = iface
-                    iface.device = dev
-            if ip not in self.spider_devs :
-                print ("WARN: ip %s not in dev" % ip)
-                if self.verbose :
-                    print ("=" * 60)
-                    print (dev.verbose_repr ())
-                    print ("=" * 60)
-                name = 'unknown'
-                assert name not in dev.interfaces
-                iface = Interface (4711, name)
-                iface.done = False
-                dev.interfaces [name] = iface
-                iface.device = dev
-                iface.append_inet4 (Inet4 (ip, None, None, iface = name))
-                self.spider_iface [ip] = iface
-                self.spider_devs  [ip] = dev
-
         self.scope          = scope
-        self.ffw            = self.scope.CNDB
-        self.pap            = self.scope.GTW.OMP.PAP
+        self.loader         = Batch_Loader (scope, cmd.batch_size)
+        self.profiler       = Stage_Profiler (self.loader)
+        self.diag           = Diagnostics \
+            (limit = cmd.diag_limit, echo = not cmd.diag_file)
+        self.ffw            = scope.CNDB
+        self.pap            = scope.GTW.OMP.PAP
         self.mentor         = {}
         self.rsrvd_nets     = {}
+        self.net_cache      = {}
         self.ffw_node_by_id = {}
         self.node_by_id     = {}
-        self.ip_by_ip       = {}
-        self.email_ids      = {}
+        self.ip_by_ip       = Address_Index ()
+        self.emails         = Dedup_Index (lambda e : e.address.lower ())
         self.manager_by_id  = {}
-        self.phone_ids      = {}
+        self.phones         = Dedup_Index \
+            (lambda e : tuple (str (x) for x in e.epk [:-1]))
+        self.urls           = Dedup_Index (lambda e : e.value.lower ())
+        self.rules          = Rules.load (cmd.rules_file)
+        self.phone_norm     = Phone_Normalizer (self.rules.phone_bogus)
         self.person_by_id   = {}
         self.member_by_id   = {}
         self.dev_by_node    = {}
         self.cons_dev       = {}
-
-        self.parser         = SQL_Parser \
-            (verbose = False, fix_double_encode = True)
-        self.parser.parse (f)
-        self.contents       = self.parser.contents
-        self.tables         = self.parser.tables
+        self.delta          = cmd.delta
+        self.kept_members   = {}
+        self.sync_state     = None
+        # a plan must not overwrite the state of the last real conversion
+        if cmd.sync_state and not cmd.plan :
+            self.sync_state = Sync_State (cmd.sync_state, load = cmd.delta)
+        self.snapshot       = None
+        self.consolidated   = False
+        if cmd.snapshot_dir and f is not sys.stdin :
+            self.snapshot   = Snapshot \
+                ( cmd.snapshot_dir
+                , (cmd.argv [0], cmd.olsr_file, cmd.spider_dump)
+                , sorted (cmd.network or ())
+                , sorted (pyk.iteritems (self.spider_ignore_ip))
+                , self.dump_tables
+                )
+        if self.snapshot and self.snapshot.exists :
+            print ("Using snapshot %s" % self.snapshot.filename)
+            f.close ()
+            with self.profiler ("load_snapshot") :
+                self.snapshot.load (self)
+            self.consolidated = True
+        else :
+            with self.profiler ("read_inputs") :
+                self.read_inputs (cmd, f)
     # end def __init__
 
+    def read_inputs (self, cmd, f) :
+        diag    = self.diag
+        loaders = \
+            [ (load_olsr,   (cmd.olsr_file, diag.child ()))
+            , ( load_spider
+              , ( cmd.spider_dump, self.spider_ignore_ip, diag.child ()
+                , self.verbose
+                )
+              )
+            ]
+        # The dump is read lazily, each table is parsed on first access.
+        # With `parallel_load`, the dump is parsed by this process while
+        # the workers parse OLSR and spider data: pickling the rows back
+        # from a worker would double the peak memory
+        self.contents = Dump_Reader (f, self.dump_tables)
+        local         = self.contents.read_all if cmd.parallel_load else None
+        olsr, spider  = load_inputs (loaders, cmd.parallel_load, local)
+        self.olsr_nodes, self.olsr_mid, self.olsr_hna, self.rev_mid = olsr [:4]
+        self.spider = spider [0]
+        diag.merge (olsr [-1])
+        diag.merge (spider [-1])
+    # end def read_inputs
+
     def set_last_change (self, obj, change_time, create_time) :
         change_time = make_naive (change_time)
         create_time = make_naive (create_time)
@@ -472,253 +779,192 @@ class Convert (object) :
     # end def set_last_change
 
     def create_nodes (self) :
-        scope = self.scope
         for n in self.contents ['nodes'] :
-            if n.id < 0 and n.id != -803 :
-                print ("WARN: Ignoring Node %s/%s" % (n.name, n.id))
-                continue
-            if n.name == '-803' :
-                n.name = 'n-803'
+            self.create_node (n)
+    # end def create_nodes
+
+    def create_node (self, n) :
+        attrs = self.node_attributes (n)
+        if attrs :
+            node = self.loader (self.ffw.Node, raw = True, ** attrs)
+            self.set_last_change (node, n.changed, n.created)
+            assert (node)
+            self.ffw_node_by_id [n.id] = node
+    # end def create_node
+
+    def update_node (self, n) :
+        """ Update Node of changed redeemer node `n` """
+        node = self.ffw_node_by_id.get (n.id)
+        if node is None :
+            self.create_node (n)
+            return
+        attrs = self.node_attributes (n)
+        if attrs :
+            node.set   (manager = attrs.pop ('manager'))
+            node.set   (owner   = attrs.pop ('owner'))
+            node.set_raw (** attrs)
+            self.set_last_change (node, n.changed, n.created)
+    # end def update_node
+
+    def node_attributes (self, n) :
+        """ Attributes of Node for redeemer node `n`, None if `n` is
+            ignored.
+        """
+        if n.id < 0 and n.id != -803 :
+            self.diag.warn ("node_ignored", "Ignoring Node %s/%s", n.name, n.id)
+            return
+        if n.name == '-803' :
+            n.name = 'n-803'
+        if self.verbose :
             print ("Processing Node: %s" % n.name)
-            if len (scope.uncommitted_changes) > 100 :
-                scope.commit ()
-            gps = None
-            #print ("LAT:", n.gps_lat_deg, n.gps_lat_min, n.gps_lat_sec)
-            #print ("LON:", n.gps_lon_deg, n.gps_lon_min, n.gps_lon_sec)
-            if n.gps_lat_deg is None :
-                assert n.gps_lat_min is None
-                assert n.gps_lat_sec is None
-                assert n.gps_lon_deg is None
-                assert n.gps_lon_min is None
-                assert n.gps_lon_sec is None
-            elif n.gps_lat_min is None :
-                assert n.gps_lat_sec is None
-                assert n.gps_lon_min is None
-                assert n.gps_lon_sec is None
-                if self.anonymize :
-                    lat = "%2.2f" % n.gps_lat_deg
-                    lon = "%2.2f" % n.gps_lon_deg
-                else :
-                    lat = "%f" % n.gps_lat_deg
-                    lon = "%f" % n.gps_lon_deg
-                gps = dict (lat = lat, lon = lon)
-            elif n.gps_lat_min == 0 and n.gps_lat_sec == 0 :
-                assert not n.gps_lon_min
-                assert not n.gps_lon_sec
-                if self.anonymize :
-                    lat = "%2.2f" % n.gps_lat_deg
-                    lon = "%2.2f" % n.gps_lon_deg
-                else :
-                    lat = "%f" % n.gps_lat_deg
-                    lon = "%f" % n.gps_lon_deg
-                gps = dict (lat = lat, lon = lon)
+        gps = None
+        #print ("LAT:", n.gps_lat_deg, n.gps_lat_min, n.gps_lat_sec)
+        #print ("LON:", n.gps_lon_deg, n.gps_lon_min, n.gps_lon_sec)
+        if n.gps_lat_deg is None :
+            assert n.gps_lat_min is None
+            assert n.gps_lat_sec is None
+            assert n.gps_lon_deg is None
+            assert n.gps_lon_min is None
+            assert n.gps_lon_sec is None
+        elif n.gps_lat_min is None :
+            assert n.gps_lat_sec is None
+            assert n.gps_lon_min is None
+            assert n.gps_lon_sec is None
+            if self.anonymize :
+                lat = "%2.2f" % n.gps_lat_deg
+                lon = "%2.2f" % n.gps_lon_deg
             else :
-                assert n.gps_lat_deg == int (n.gps_lat_deg)
-                assert n.gps_lat_min == int (n.gps_lat_min)
-                assert n.gps_lon_deg == int (n.gps_lon_deg)
-                assert n.gps_lon_min == int (n.gps_lon_min)
-                lat = "%d d %d m" % (int (n.gps_lat_deg), int (n.gps_lat_min))
-                lon = "%d d %d m" % (int (n.gps_lon_deg), int (n.gps_lon_min))
-                if n.gps_lat_sec is not None :
-                    lat = lat + " %f s" % n.gps_lat_sec
-                if n.gps_lon_sec is not None :
-                    lon = lon + " %f s" % n.gps_lon_sec
-                gps = dict (lat = lat, lon = lon)
-                if self.anonymize :
-                    lat = \
-                        ( n.gps_lat_deg
-                        + (n.gps_lat_min or 0) / 60.
-                        + (n.gps_lat_sec or 0) / 3600.
-                        )
-                    lon = \
-                        ( n.gps_lon_deg
-                        + (n.gps_lon_min or 0) / 60.
-                        + (n.gps_lon_sec or 0) / 3600.
-                        )
-                    gps = dict (lat = "%2.2f" % lat, lon = "%2.2f" % lon)
-            id = self.person_dupes.get (n.id_members, n.id_members)
-            owner = self.person_by_id.get (id)
+                lat = "%f" % n.gps_lat_deg
+                lon = "%f" % n.gps_lon_deg
+            gps = dict (lat = lat, lon = lon)
+        elif n.gps_lat_min == 0 and n.gps_lat_sec == 0 :
+            assert not n.gps_lon_min
+            assert not n.gps_lon_sec
             if self.anonymize :
-                manager = owner
-            elif not isinstance (owner, self.pap.Person) :
-                manager = self.manager_by_id [id]
-            elif n.id_tech_c and n.id_tech_c != n.id_members :
-
-                tid = self.person_dupes.get (n.id_tech_c, n.id_tech_c)
-                manager = self.person_by_id.get (tid)
-                assert (manager)
-                if not isinstance (manager, self.pap.Person) :
-                    manager = self.manager_by_id [tid]
-                print ("INFO: Tech contact found: %s" % n.id_tech_c)
+                lat = "%2.2f" % n.gps_lat_deg
+                lon = "%2.2f" % n.gps_lon_deg
             else :
-                manager = owner
-            # node with missing manager has devices, use 0xff admin as owner
-            if not owner and n.id in self.dev_by_node :
-                owner = self.person_by_id.get (1)
-                manager = self.manager_by_id [1]
-                print \
-                    ( "WARN: Node %s: member %s not found, using 1"
-                    % (n.id, n.id_members)
+                lat = "%f" % n.gps_lat_deg
+                lon = "%f" % n.gps_lon_deg
+            gps = dict (lat = lat, lon = lon)
+        else :
+            assert n.gps_lat_deg == int (n.gps_lat_deg)
+            assert n.gps_lat_min == int (n.gps_lat_min)
+            assert n.gps_lon_deg == int (n.gps_lon_deg)
+            assert n.gps_lon_min == int (n.gps_lon_min)
+            lat = "%d d %d m" % (int (n.gps_lat_deg), int (n.gps_lat_min))
+            lon = "%d d %d m" % (int (n.gps_lon_deg), int (n.gps_lon_min))
+            if n.gps_lat_sec is not None :
+                lat = lat + " %f s" % n.gps_lat_sec
+            if n.gps_lon_sec is not None :
+                lon = lon + " %f s" % n.gps_lon_sec
+            gps = dict (lat = lat, lon = lon)
+            if self.anonymize :
+                lat = \
+                    ( n.gps_lat_deg
+                    + (n.gps_lat_min or 0) / 60.
+                    + (n.gps_lat_sec or 0) / 3600.
                     )
-            if owner :
-                node = self.ffw.Node \
-                    ( name        = n.name
-                    , position    = gps
-                    , show_in_map = n.map
-                    , manager     = manager
-                    , owner       = owner
-                    , raw         = True
+                lon = \
+                    ( n.gps_lon_deg
+                    + (n.gps_lon_min or 0) / 60.
+                    + (n.gps_lon_sec or 0) / 3600.
                     )
-                self.set_last_change (node, n.changed, n.created)
-                assert (node)
-                self.ffw_node_by_id [n.id] = node
-            else :
-                print \
-                    ( "ERR:  Node %s: member %s not found"
-                    % (n.id, n.id_members)
-                    )
-    # end def create_nodes
+                gps = dict (lat = "%2.2f" % lat, lon = "%2.2f" % lon)
+        id = self.rules.person_dupes.get (n.id_members, n.id_members)
+        owner = self.person_by_id.get (id)
+        if self.anonymize :
+            manager = owner
+        elif not isinstance (owner, self.pap.Person) :
+            manager = self.manager_by_id [id]
+        elif n.id_tech_c and n.id_tech_c != n.id_members :
 
-    # first id is the one to remove, the second one is the correct one
-    person_dupes = dict (( (373, 551) # checked, real dupe
-                         , (338, 109) # checked, real dupe
-                         , (189, 281) # checked, 189 contains almost no data
-                                      # and 189 has no nodes
-                         , (285, 284) # checked, real dupe
-                         , (299, 297) # checked, real dupe
-                         , (300, 462) # checked, real dupe
-                         , (542, 586) # checked, real dupe
-                         , (251, 344) # checked, real dupe
-                         , (188, 614) # checked, real dupe
-                         , (177, 421) # checked, real dupe
-                         , (432, 433) # checked, real dupe, merge addresses
-                         , ( 26, 480) # probably: almost same nick, merge adrs
-                         , ( 90, 499) # FIXME: same person? merge adrs?
-                                      #  90 has node 1110
-                                      # 499 has node 1105 and 812
-                                      # two accounts, one for HTL, one private?
-                                      # maybe create company?
-                                      # make company owner of 1110 and
-                                      # 499 tech-c of all nodes?
-                         , (505, 507) # checked, real dupe
-                         , (410, 547) # checked, real dupe
-                         , (712, 680) # checked, real dupe
-                         , (230, 729) # checked, real dupe
-                         , (375, 743) # checked, real dupe
-                         , (755, 175) # checked, real dupe
-                         , (219, 759) # Probably same (nick similar), merge adr
-                         , (453, 454) # checked, real dupe
-                         , (803, 804) # checked, real dupe
-                         , (295, 556) # same gmx address, merge adr
-                         , (697, 814) # checked, real dupe
-                         , (476, 854) # checked, real dupe
-                         , (312, 307) # checked, real dupe
-                         , (351, 355) # checked, real dupe
-                         , (401, 309) # checked, real dupe
-                         , (871, 870) # checked, real dupe
-                         , (580, 898) # checked, real dupe
-                         , (894, 896) # checked, real dupe
-                         , (910, 766) # checked, real dupe
-                         , (926, 927) # checked, real dupe
-                         , (938, 939) # checked, real dupe
-                         , (584, 939) # not entirely sure but all
-                                      # lowercase in both records
-                                      # indicates same person
-                         , (756, 758) # checked, real dupe
-                         , (  0,   1) # ignore Funkfeuer Parkplatz
-                         , (442,1019) # checked, old address listed in whois
-                         , (1082, 1084) # checked, same email and phone
-                         , (1096, 1094) # checked, same attributes
-                         , (1113, 1114) # checked
-                        ))
-    rev_person_dupes = dict ((v, k) for k, v in pyk.iteritems (person_dupes))
-
-    merge_adr = dict.fromkeys ((432, 26, 759, 295))
-
-    phone_bogus   = dict.fromkeys \
-        (( '01111111'
-        ,  '1234567'
-        ,  '0048334961656'
-        ,  '001123456789'
-        ,  '+972 1234567'
-        ,  '003468110524227'
-        ,  '1234'
-        ,  '0'
-        ,  '-'
-        ,  '+49 1 35738755'
-        ,  '974 5517 9729'
-        ,  '0525001340'
-        ,  '59780'
-        ,  '1013'
-        ,  '\\t'
-        ))
-
-    companies         = dict.fromkeys ((112, ))
-    associations      = dict.fromkeys ((146, 176, 318, 438, 737, 809))
-    company_actor     = {134 : 37}
-    association_actor = {  1 : 15, 838 : 671}
-    person_disable    = dict.fromkeys ((263, 385, 612, 621))
-    person_remove     = dict.fromkeys ((549, 608))
-
-    def try_insert_phone (self, person, m, x, c) :
-        if x :
-            x = x.strip ()
-        if x :
-            p = None
-            if x in self.phone_bogus :
-                return
-            try :
-                p = Phone (x, m.town, c)
-            except ValueError as err :
-                if str (err).startswith ('WARN') :
-                    print (err)
-                    return
-            if not p :
-                return
-            t = self.pap.Phone.instance (* p)
-            k = str (p)
+            tid = self.rules.person_dupes.get (n.id_tech_c, n.id_tech_c)
+            manager = self.person_by_id.get (tid)
+            assert (manager)
+            if not isinstance (manager, self.pap.Person) :
+                manager = self.manager_by_id [tid]
+            self.diag.info \
+                ("node_tech_contact", "Tech contact found: %s", n.id_tech_c)
+        else :
+            manager = owner
+        # node with missing manager has devices, use 0xff admin as owner
+        if not owner and n.id in self.dev_by_node :
+            owner = self.person_by_id.get (1)
+            manager = self.manager_by_id [1]
+            self.diag.warn \
+                ( "node_member_missing"
+                , "Node %s: member %s not found, using 1", n.id, n.id_members
+                )
+        if not owner :
+            self.diag.error \
+                ( "node_member_missing"
+                , "Node %s: member %s not found", n.id, n.id_members
+                )
+            return
+        return dict \
+            ( name        = n.name
+            , position    = gps
+            , show_in_map = n.map
+            , manager     = manager
+            , owner       = owner
+            )
+    # end def node_attributes
+
+    def try_insert_phone (self, person, m, attr) :
+        x         = getattr (m, attr)
+        k, reason = self.phone_norm.member (m, attr)
+        if reason and reason.startswith ('WARN') :
+            self.diag.warn ("invalid_phone", reason [4:].lstrip (': '))
+        if k :
+            t = self.phones.get (k)
             if t :
-                eid = self.phone_ids [k]
-                prs = self.person_by_id [eid]
-                if  (  prs.pid == person.pid
-                    or self.pap.Subject_has_Phone.instance (person, t)
+                # owner is unknown if phone was created by a previous run
+                eid = self.phones.owner (k)
+                prs = self.person_by_id.get (eid)
+                if  (  (prs and prs.pid == person.pid)
+                    or self.phones.is_linked (k, person)
                     ) :
                     return # don't insert twice
-                print \
-                    ( "WARN: %s/%s %s/%s: Duplicate phone: %s"
-                    % (eid, prs.pid, m.id, person.pid, x)
+                self.diag.warn \
+                    ( "duplicate_phone", "%s/%s %s/%s: Duplicate phone: %s"
+                    , eid, prs and prs.pid, m.id, person.pid, x.strip ()
                     )
             else :
-                t = self.pap.Phone (* p)
-                self.phone_ids [k] = m.id
+                t = self.pap.Phone (* k)
+                self.phones.add (k, t, m.id)
             self.pap.Subject_has_Phone (person, t)
+            self.phones.link (k, person)
     # end def try_insert_phone
 
     def try_insert_email (self, person, m, attr = 'email', second = False) :
         mail  = getattr (m, attr)
-        email = self.pap.Email.instance (address = mail)
+        k     = mail.lower ()
+        email = self.emails.get (k)
         if email :
-            if mail.lower () in (e.address for e in person.emails) :
+            if self.emails.is_linked (k, person) :
                 return
-            eid = self.email_ids [mail.lower ()]
-            prs = self.person_by_id [eid]
-            print \
-                ( "WARN: %s/%s %s/%s: Duplicate email: %s"
-                % (eid, prs.pid, m.id, person.pid, mail)
+            # owner is unknown if email was created by a previous run
+            eid = self.emails.owner (k)
+            prs = self.person_by_id.get (eid)
+            self.diag.warn \
+                ( "duplicate_email", "%s/%s %s/%s: Duplicate email: %s"
+                , eid, prs and prs.pid, m.id, person.pid, mail
                 )
         else :
             desc = None
             if second :
                 desc = "von 2. Account"
-                print \
-                    ( "INFO: Second email for %s/%s: %s"
-                    % (m.id, person.pid, mail)
+                self.diag.info \
+                    ( "second_email", "Second email for %s/%s: %s"
+                    , m.id, person.pid, mail
                     )
-            self.email_ids [mail.lower ()] = m.id
             email = self.pap.Email (address = mail, desc = desc)
+            self.emails.add  (k, email, m.id)
             self.pap.Subject_has_Email (person, email)
-            if  (   m.id not in self.company_actor
-                and m.id not in self.association_actor
+            self.emails.link (k, person)
+            if  (   m.id not in self.rules.company_actor
+                and m.id not in self.rules.association_actor
                 ) :
                 # Some accounts are in fixtures
                 auth  = self.scope.Auth.Account.instance (mail)
@@ -736,11 +982,11 @@ class Convert (object) :
         hp = m.homepage
         if not hp.startswith ('http') :
             hp = 'http://' + hp
-        url = self.pap.Url.instance (hp, raw = True)
-        assert url is None or url.value == hp.lower ()
-        if url :
+        k  = hp.lower ()
+        if k in self.urls :
             return
         url = self.pap.Url (hp, desc = 'Homepage', raw = True)
+        self.urls.add (k, url, m.id)
         self.pap.Subject_has_Url (person, url)
     # end def try_insert_url
 
@@ -755,7 +1001,8 @@ class Convert (object) :
         if m.instant_messenger_nick.startswith ('housing') :
             return
         if self.im_hash.match (m.instant_messenger_nick) :
-            print ("WARN: Got hash in nick: %s" % m.instant_messenger_nick)
+            self.diag.warn \
+                ("im_hash", "Got hash in nick: %s", m.instant_messenger_nick)
             return
         if m.instant_messenger_nick.startswith ('Wohnadresse:') :
             adr = m.instant_messenger_nick.split (':', 1) [1].strip ()
@@ -768,14 +1015,22 @@ class Convert (object) :
                 , city       = ort
                 , country    = pyk.decoded ('Austria', 'utf-8')
                 )
-            self.pap.Subject_has_Address (person, address)
+            self.instance_or_new (self.pap.Subject_has_Address, person, address)
             return
-        print \
-            ("INFO: Instant messenger nickname: %s" % m.instant_messenger_nick)
-        im = self.pap.IM_Handle (address = m.instant_messenger_nick)
-        self.pap.Subject_has_IM_Handle (person, im)
+        self.diag.info \
+            ( "im_nickname", "Instant messenger nickname: %s"
+            , m.instant_messenger_nick
+            )
+        im = self.instance_or_new \
+            (self.pap.IM_Handle, address = m.instant_messenger_nick)
+        self.instance_or_new (self.pap.Subject_has_IM_Handle, person, im)
     # end def try_insert_im
 
+    def try_insert_nickname (self, person, m) :
+        nick = self.instance_or_new (self.pap.Nickname, m.nickname, raw = True)
+        self.instance_or_new (self.pap.Subject_has_Nickname, person, nick)
+    # end def try_insert_nickname
+
     phone_types = dict \
         ( telephone   = 'Festnetz'
         , mobilephone = 'Mobil'
@@ -787,9 +1042,9 @@ class Convert (object) :
         if street or m.town or m.zip :
             country = pyk.decoded ('Austria', 'utf-8')
             if not m.town :
-                print \
-                    ( 'INFO: no city (setting to "Wien"): %s/%s'
-                    % (m.id, person.pid)
+                self.diag.info \
+                    ( "address_no_city", 'no city (setting to "Wien"): %s/%s'
+                    , m.id, person.pid
                     )
                 m ['town'] = 'Wien'
             if not m.zip :
@@ -800,14 +1055,16 @@ class Convert (object) :
                 elif m.id == 836 :
                     m ['zip'] = '1160'
                 else :
-                    print ("INFO: no zip: %s/%s" % (m.id, person.pid))
+                    self.diag.info \
+                        ("address_no_zip", "no zip: %s/%s", m.id, person.pid)
             elif m.zip.startswith ('I-') :
                 m ['zip'] = m.zip [2:]
                 country = pyk.decoded ('Italy', 'utf-8')
             if not street and not m.zip and m.town == 'Wien' :
                 return
             if not street :
-                print ("INFO: no street: %s/%s" % (m.id, person.pid))
+                self.diag.info \
+                    ("address_no_street", "no street: %s/%s", m.id, person.pid)
                 return
             address = self.pap.Address.instance_or_new \
                 ( street     = street
@@ -815,131 +1072,57 @@ class Convert (object) :
                 , city       = m.town
                 , country    = country
                 )
-            self.pap.Subject_has_Address (person, address)
+            self.instance_or_new (self.pap.Subject_has_Address, person, address)
     # end def try_insert_address
 
     def create_persons (self) :
         # FIXME: Set role for person so that person can edit only their
-        # personal data, see self.person_disable
-        scope = self.scope
-        # ignore person dupes that have meanwhile been removed
-        known_ids = {}
-        for m in self.contents ['members'] :
-            known_ids [m.id] = True
-        for d_id, m_id in self.person_dupes.items () :
-            if m_id not in known_ids or d_id not in known_ids :
-                del self.person_dupes [d_id]
-                del self.rev_person_dupes [m_id]
-        for id, act in self.company_actor.items () :
-            if id not in known_ids or act not in known_ids :
-                del self.company_actor [id]
-        for id, act in self.association_actor.items () :
-            if id not in known_ids or act not in known_ids :
-                del self.association_actor [id]
-
+        # personal data, see self.rules.person_disable
+        self.load_dedup_indexes        ()
+        self.validate_rules            ()
+        self.phone_norm.normalize_members \
+            (self.contents ['members'], self.phone_types)
         for m in sorted (self.contents ['members'], key = lambda x : x.id) :
-            if len (scope.uncommitted_changes) > 10 :
-                scope.commit ()
-            self.member_by_id [m.id] = m
-            if m.id == 309 and m.street.startswith ("'") :
-                m.street = m.street [1:]
-            if m.id in self.person_remove :
-                print \
-                    ( "INFO: removing person %s %s %s"
-                    % (m.id, m.firstname, m.lastname)
-                    )
-                continue
-            if m.id in self.person_dupes :
-                print \
-                    ( "INFO: skipping person %s (duplicate of %s)"
-                    % (m.id, self.person_dupes [m.id])
-                    )
-                continue
-            if not m.firstname and not m.lastname :
-                print ("WARN: skipping person, no name:", m.id)
-                continue
-            if not m.lastname :
-                print ("WARN: skipping person, no lastname: %s" % m.id)
-                continue
-            if m.firstname.startswith ('Armin"/><script') :
-                m.firstname = 'Armin'
-            cls  = self.pap.Person
-            name = ' '.join ((m.firstname, m.lastname))
-            pd   = dict (name = name)
-            if m.id in self.company_actor :
-                cls = self.pap.Company
-            elif m.id in self.association_actor :
-                cls = self.pap.Association
-            else :
-                pd = dict (first_name = m.firstname, last_name = m.lastname)
-            if self.anonymize :
-                cls = self.pap.Person
-                pd = dict (first_name = m.id, last_name = 'Funkfeuer')
-            if self.verbose :
-                typ = cls._etype.__name__.lower ()
-                print ( "Creating %s: %s" % (typ, repr (name)))
-            person = cls (raw = True, ** pd)
-            if m.id == 1 :
-                self.ff_subject = person
-            if m.id not in self.rev_person_dupes :
-                self.set_last_change (person, m.changed, m.created)
-            self.person_by_id [m.id] = person
-            if self.anonymize :
-                continue
-            self.try_insert_address (m, person)
-            if m.email :
-                self.try_insert_email (person, m)
-            if m.fax and '@' in m.fax :
-                self.try_insert_email (person, m, attr = 'fax')
-                print \
-                    ("INFO: Using email %s in fax field as email" % m.fax)
-            if m.instant_messenger_nick :
-                self.try_insert_im (person, m)
-            for a, c in pyk.iteritems (self.phone_types) :
-                x = getattr (m, a)
-                self.try_insert_phone (person, m, x, c)
-            if m.mentor_id and m.mentor_id != m.id :
-                self.mentor [m.id] = m.mentor_id
-            if m.nickname :
-                nick = self.pap.Nickname (m.nickname, raw = True)
-                self.pap.Subject_has_Nickname (person, nick)
-            if m.homepage :
-                self.try_insert_url (m, person)
-            if m.id in self.companies or m.id in self.associations :
-                if m.id in self.companies :
-                    cls = self.pap.Company
-                if m.id in self.associations :
-                    cls = self.pap.Association
-                name = ' '.join ((m.firstname, m.lastname))
-                typ  = cls._etype.__name__.lower ()
-                print ( "Creating %s: %s" % (typ, repr (name)))
-                legal = cls (name = name, raw = True)
-                # copy property links over
-                q = self.pap.Subject_has_Property.query
-                for p in q (left = person).all () :
-                    self.pap.Subject_has_Property (legal, p.right)
-                self.pap.Person_in_Group (person, legal)
-                self.manager_by_id [m.id] = person
+            self.create_person (m)
         if self.anonymize :
             return
-        x = dict (self.company_actor)
-        x.update (self.association_actor)
+        self.create_actor_links  ()
+        self.merge_dupes         ()
+        self.create_mentor_links ()
+    # end def create_persons
+
+    def create_actor_links (self, ids = None) :
+        """ Link the actors of companies and associations to them (only
+            the links of legal entities or actors in `ids` if given).
+        """
+        x = dict (self.rules.company_actor)
+        x.update (self.rules.association_actor)
         for l_id, p_id in pyk.iteritems (x) :
+            if ids is not None and l_id not in ids and p_id not in ids :
+                continue
             person = self.person_by_id [p_id]
             legal  = self.person_by_id [l_id]
-            self.pap.Person_in_Group (person, legal)
+            self.instance_or_new (self.pap.Person_in_Group, person, legal)
             self.manager_by_id [l_id] = person
-        # Retrieve info from dupe account
-        for dupe, id in pyk.iteritems (self.person_dupes) :
+    # end def create_actor_links
+
+    def merge_dupes (self, ids = None) :
+        """ Retrieve info from dupe accounts (only of the dupes or the
+            accounts they are merged into in `ids` if given).
+        """
+        for dupe, id in pyk.iteritems (self.rules.person_dupes) :
             # older version of db or dupe removed:
             if id not in self.person_by_id :
                 continue
+            if ids is not None and dupe not in ids and id not in ids :
+                continue
             d = self.member_by_id [dupe]
             m = self.member_by_id [id]
-            print \
-                ( "Handling dupe: %s->%s %s %s" \
-                % (dupe, id, d.firstname, d.lastname)
-                )
+            if self.verbose :
+                print \
+                    ( "Handling dupe: %s->%s %s %s" \
+                    % (dupe, id, d.firstname, d.lastname)
+                    )
             person = self.person_by_id [id]
             changed = max \
                 (d for d in (m.changed, d.changed, m.created, d.created) if d)
@@ -947,65 +1130,270 @@ class Convert (object) :
             self.set_last_change (person, changed, created)
             if d.email :
                 self.try_insert_email (person, d, second = True)
-            for a, c in pyk.iteritems (self.phone_types) :
-                x = getattr (d, a)
-                self.try_insert_phone (person, d, x, c)
+            for a in self.phone_types :
+                self.try_insert_phone (person, d, a)
             if  (   d.mentor_id is not None
                 and d.mentor_id != d.id
                 and d.mentor_id != id
                 and d.mentor_id != 305
                 ) :
-                print ("WARN mentor: %s->%s %s" % (d.id, id, d.mentor_id))
+                self.diag.warn \
+                    ( "dupe_mentor", "mentor: %s->%s %s"
+                    , d.id, id, d.mentor_id
+                    )
                 assert (False)
             if d.mentor_id is not None and d.mentor_id != d.id :
                 if m.id not in self.mentor :
                     self.mentor [m.id] = d.mentor_id
             if d.nickname :
-                nick = self.pap.Nickname (d.nickname, raw = True)
-                self.pap.Subject_has_Nickname (person, nick)
+                self.try_insert_nickname (person, d)
             if d.homepage :
                 self.try_insert_url (d, person)
             if d.instant_messenger_nick :
                 self.try_insert_im (person, d)
-            if dupe in self.merge_adr :
+            if dupe in self.rules.merge_adr :
                 self.try_insert_address (d, person)
+    # end def merge_dupes
+
+    def load_dedup_indexes (self) :
+        """ Add emails, phones, and urls already in the scope (from
+            fixtures or a previous run) to the dedup indexes.
+        """
+        pap = self.pap
+        self.emails.load (pap.Email, pap.Subject_has_Email)
+        self.phones.load (pap.Phone, pap.Subject_has_Phone)
+        self.urls.load   (pap.Url)
+    # end def load_dedup_indexes
+
+    def validate_rules (self) :
+        """ Drop rules referring to members not in the dump (e.g.,
+            meanwhile removed).
+        """
+        self.rules = self.rules.validated \
+            (dict.fromkeys (m.id for m in self.contents ['members']))
+    # end def validate_rules
+
+    def create_person (self, m) :
+        self.member_by_id [m.id] = m
+        if m.id == 309 and m.street.startswith ("'") :
+            m.street = m.street [1:]
+        if m.id in self.rules.person_remove :
+            self.diag.info \
+                ( "person_removed", "removing person %s %s %s"
+                , m.id, m.firstname, m.lastname
+                )
+            return
+        if m.id in self.rules.person_dupes :
+            self.diag.info \
+                ( "person_duplicate", "skipping person %s (duplicate of %s)"
+                , m.id, self.rules.person_dupes [m.id]
+                )
+            return
+        if not m.firstname and not m.lastname :
+            self.diag.warn \
+                ("person_no_name", "skipping person, no name: %s", m.id)
+            return
+        if not m.lastname :
+            self.diag.warn \
+                ("person_no_name", "skipping person, no lastname: %s", m.id)
+            return
+        if m.firstname.startswith ('Armin"/><script') :
+            m.firstname = 'Armin'
+        cls, pd = self.person_attributes (m)
+        name    = ' '.join ((m.firstname, m.lastname))
+        if self.verbose :
+            typ = cls.type_base_name.lower ()
+            print ( "Creating %s: %s" % (typ, repr (name)))
+        person = self.loader (cls, raw = True, ** pd)
+        if m.id == 1 :
+            self.ff_subject = person
+        if m.id not in self.rules.rev_person_dupes :
+            self.set_last_change (person, m.changed, m.created)
+        self.person_by_id [m.id] = person
+        if self.anonymize :
+            return
+        self.person_properties (m, person)
+    # end def create_person
+
+    def create_legal_entity (self, m, person) :
+        """ Company or association of member `m` managed by `person`, in
+            delta mode the one of a previous run is updated.
+        """
+        cls   = self.legal_entity_type (m)
+        name  = ' '.join ((m.firstname, m.lastname))
+        typ   = cls.type_base_name.lower ()
+        legal = self.legal_entity (m, person)
+        if legal is None :
+            self.diag.info \
+                ("legal_entity", "Creating %s: %s", typ, repr (name))
+            legal = cls (name = name, raw = True)
+        else :
+            legal.set_raw (name = name)
+        # copy property links over
+        q = self.pap.Subject_has_Property.query
+        for p in q (left = person).all () :
+            self.instance_or_new (self.pap.Subject_has_Property, legal, p.right)
+        self.instance_or_new (self.pap.Person_in_Group, person, legal)
+        self.manager_by_id [m.id] = person
+    # end def create_legal_entity
+
+    def legal_entity (self, m, person) :
+        """ Company or association of member `m` created by a previous
+            run (in delta mode) or None.
+        """
+        cls = self.legal_entity_type (m)
+        if cls is None or not self.delta :
+            return
+        # legal entities of other members are linked via actor links
+        subjects = set (p.pid for p in pyk.itervalues (self.person_by_id))
+        for l in self.pap.Person_in_Group.query (left = person).all () :
+            if isinstance (l.right, cls) and l.right.pid not in subjects :
+                return l.right
+    # end def legal_entity
+
+    def legal_entity_type (self, m) :
+        """ Type of legal entity of member `m` or None """
+        if m.id in self.rules.associations :
+            return self.pap.Association
+        if m.id in self.rules.companies :
+            return self.pap.Company
+    # end def legal_entity_type
+
+    def person_properties (self, m, person) :
+        """ Add address, contact data, nickname, mentor and legal entity
+            of member `m` to `person`.
+        """
+        self.try_insert_address (m, person)
+        if m.email :
+            self.try_insert_email (person, m)
+        if m.fax and '@' in m.fax :
+            self.try_insert_email (person, m, attr = 'fax')
+            self.diag.info \
+                ("email_in_fax", "Using email %s in fax field as email", m.fax)
+        if m.instant_messenger_nick :
+            self.try_insert_im (person, m)
+        for a in self.phone_types :
+            self.try_insert_phone (person, m, a)
+        if m.mentor_id and m.mentor_id != m.id :
+            self.mentor [m.id] = m.mentor_id
+        if m.nickname :
+            self.try_insert_nickname (person, m)
+        if m.homepage :
+            self.try_insert_url (m, person)
+        if self.legal_entity_type (m) is not None :
+            self.create_legal_entity (m, person)
+    # end def person_properties
+
+    def person_attributes (self, m) :
+        """ Entity type and attributes of PAP subject for member `m` """
+        cls  = self.pap.Person
+        pd   = dict (name = ' '.join ((m.firstname, m.lastname)))
+        if m.id in self.rules.company_actor :
+            cls = self.pap.Company
+        elif m.id in self.rules.association_actor :
+            cls = self.pap.Association
+        else :
+            pd = dict (first_name = m.firstname, last_name = m.lastname)
+        if self.anonymize :
+            cls = self.pap.Person
+            pd = dict (first_name = m.id, last_name = 'Funkfeuer')
+        return cls, pd
+    # end def person_attributes
+
+    def update_person (self, m) :
+        """ Update PAP subject of changed member `m` """
+        person = self.person_by_id.get (m.id)
+        if person is None or not m.lastname :
+            self.create_person (m)
+            return
+        self.member_by_id [m.id] = m
+        cls, pd = self.person_attributes (m)
+        if self.verbose :
+            print ("Updating %s: %s" % (person.type_name, pd))
+        person.set_raw (** pd)
+        if m.id not in self.rules.rev_person_dupes :
+            self.set_last_change (person, m.changed, m.created)
+        if self.anonymize :
+            return
+        # mentor and property links are re-created from the changed member,
+        # the legal entity has copies of the property links of the person
+        for l in self.ffw.Person_mentors_Person.query (left = person).all () :
+            l.destroy ()
+        legal = self.legal_entity (m, person)
+        if legal is not None :
+            self.unlink_properties (legal)
+        self.unlink_properties (person)
+        self.person_properties (m, person)
+    # end def update_person
+
+    def unlink_properties (self, subject) :
+        """ Destroy the property links (address, email, phone, ...) of
+            `subject`, and the properties no other subject links to.
+            Accounts created for an email are kept.
+        """
+        pap     = self.pap
+        ShP     = pap.Subject_has_Property
+        indexes = \
+            ( (pap.Email, self.emails)
+            , (pap.Phone, self.phones)
+            , (pap.Url,   self.urls)
+            )
+        for l in ShP.query (left = subject).all () :
+            prop  = l.right
+            index = None
+            for etype, idx in indexes :
+                if isinstance (prop, etype) :
+                    index = idx
+            l.destroy ()
+            if index is not None :
+                index.unlink (index.key (prop), subject)
+            if not ShP.query (right = prop).count () :
+                if index is not None :
+                    index.remove (index.key (prop))
+                prop.destroy ()
+    # end def unlink_properties
+
+    def create_mentor_links (self) :
         for mentor_id, person_id in pyk.iteritems (self.mentor) :
             # can happen if a duplicate inserted this:
             if mentor_id == person_id :
                 continue
-            mentor_id = self.person_dupes.get (mentor_id, mentor_id)
-            person_id = self.person_dupes.get (person_id, person_id)
+            mentor_id = self.rules.person_dupes.get (mentor_id, mentor_id)
+            person_id = self.rules.person_dupes.get (person_id, person_id)
             mentor = self.person_by_id [mentor_id]
             person = self.person_by_id [person_id]
-            actors = (self.company_actor, self.association_actor)
+            actors = (self.rules.company_actor, self.rules.association_actor)
             for a in actors :
                 if mentor_id in a :
                     mentor = self.person_by_id [a [mentor_id]]
                     break
-            if  (  person_id in self.company_actor
-                or person_id in self.association_actor
+            if  (  person_id in self.rules.company_actor
+                or person_id in self.rules.association_actor
                 ) :
                 self.ffw.Person_acts_for_Legal_Entity.instance_or_new \
                     (mentor, person)
             else :
-                self.ffw.Person_mentors_Person (mentor, person)
-    # end def create_persons
+                self.instance_or_new \
+                    (self.ffw.Person_mentors_Person, mentor, person)
+    # end def create_mentor_links
 
     def check_spider_dev (self, sdev, in4, ips, nodeid) :
         i4       = in4.ip
         nodename = self.ffw_node_by_id [nodeid].name
         if not routable (i4) :
             return
-        ip4 = IP4_Address (i4)
+        ip4 = address (i4)
         if i4 not in ips :
-            print \
-                ( "WARN: IP %s of spidered device %s not in mid dev for node %s"
-                % (i4, sdev.mainip, nodename)
+            self.diag.warn \
+                ( "spider_ip_not_in_mid"
+                , "IP %s of spidered device %s not in mid dev for node %s"
+                , i4, sdev.mainip, nodename
                 )
             if ip4 not in self.ip_by_ip :
-                print \
-                    ( "WARN: IP %s of spidered device %s not in ips"
-                    % (i4, sdev.mainip)
+                self.diag.warn \
+                    ( "spider_ip_not_in_redeemer"
+                    , "IP %s of spidered device %s not in ips"
+                    , i4, sdev.mainip
                     )
             else :
                 d   = self.ip_by_ip [ip4].id_devices
@@ -1013,33 +1401,38 @@ class Convert (object) :
                     dev  = self.dev_by_id  [d]
                     nid  = dev.id_nodes
                     node = self.ffw_node_by_id [dev.id_nodes]
-                    print \
-                        ( "WARN: IP %s of spidered device %s"
+                    self.diag.warn \
+                        ( "spider_ip_other_device"
+                        , "IP %s of spidered device %s"
                           " belongs to dev %s node %s"
-                        % (i4, sdev.mainip, dev.name, node.name)
+                        , i4, sdev.mainip, dev.name, node.name
                         )
                 else :
-                    print \
-                        ( "WARN: IP %s of spidered device %s has no device"
-                        % (i4, sdev.mainip)
+                    self.diag.warn \
+                        ( "spider_ip_no_device"
+                        , "IP %s of spidered device %s has no device"
+                        , i4, sdev.mainip
                         )
     # end def check_spider_dev
 
     def create_ips_and_devices (self) :
         # devices and reserved nets from hna table
-        for ip4 in pyk.iterkeys (self.olsr_hna.by_dest) :
-            for n in pyk.iterkeys (self.ip4nets) :
-                if ip4 in n :
-                    break
-            else :
-                # only subnets of one of our ip4nets
+        ipnets     = Net_Index   (self.ip4nets)
+        olsr_nodes = Address_Set \
+            (ip4 for ip4 in self.olsr_nodes if ip4 in self.ip_by_ip)
+        for net in self.ip6nets :
+            ipnets.add (net)
+        for ip4 in self.olsr_hna :
+            if ip4 not in ipnets :
+                # only subnets of one of our networks
                 if self.verbose :
                     print ("HNA: %s not in our networks" % ip4)
                 continue
-            if ip4.mask == 32 :
-                if ip4 not in self.olsr_nodes :
+            if ip4.mask == ip4.bitlen :
+                if ip4 not in olsr_nodes :
                     if ip4 not in self.ip_by_ip :
-                        print ("WARN: IP %s not in DB" % ip4)
+                        self.diag.warn \
+                            ("hna_ip_not_in_redeemer", "IP %s not in DB", ip4)
                     else :
                         ip = self.ip_by_ip [ip4]
                         if ip.id_devices :
@@ -1051,21 +1444,19 @@ class Convert (object) :
             else :
                 # FIXME: Reserve network in database
                 self.rsrvd_nets [ip4] = True
-                for i in ip4 :
-                    if i in self.olsr_nodes :
-                        print \
-                            ( "WARN: IP %s from hna-range %s also in olsr nodes"
-                            % (i, ip4)
-                            )
-                    assert i not in self.rev_mid
+                for i in olsr_nodes.in_net (ip4) :
+                    self.diag.warn \
+                        ( "hna_range_in_olsr_nodes"
+                        , "IP %s from hna-range %s also in olsr nodes", i, ip4
+                        )
+                assert not self.rev_mid.in_net (ip4)
         if self.verbose :
             for k in pyk.iterkeys (self.rsrvd_nets) :
                 print ("HNA route to: %s" % k)
         if self.debug :
-            for ip4 in self.olsr_hna.by_dest :
-                for nw in pyk.iterkeys (self.ip4nets) :
-                    if ip4 in nw :
-                        print ("HNA: %s" % ip4)
+            for ip4 in self.olsr_hna :
+                for nw, _ in ipnets.containing (ip4) :
+                    print ("HNA: %s" % ip4)
 
         for dev in pyk.itervalues (self.cons_dev) :
             if dev.merged :
@@ -1073,16 +1464,42 @@ class Convert (object) :
             dev.create ()
     # end def create_ips_and_devices
 
+    def network_cache (self, etype) :
+        """ Network_Cache for `etype`, created on first use """
+        try :
+            return self.net_cache [etype.type_name]
+        except KeyError :
+            result = self.net_cache [etype.type_name] = Network_Cache \
+                (etype, self.loader)
+            return result
+    # end def network_cache
+
+    def reserve_address (self, ip, owner) :
+        """ Reserve address `ip` in the most specific network containing
+            it. In delta mode the address may have been reserved by a
+            previous run.
+        """
+        adr   = address (ip)
+        etype = self.ffw.IP4_Network
+        if adr.bitlen == 128 :
+            etype = self.ffw.IP6_Network
+        cache = self.network_cache (etype)
+        if self.delta :
+            result = cache.instance (adr)
+            if result is not None :
+                return result
+        return cache.reserve (adr, owner)
+    # end def reserve_address
+
     def reserve_net (self, nets, typ) :
+        cache = self.network_cache (typ)
         for net, comment in sorted (pyk.iteritems (nets), key = ip_mask_key) :
             if self.verbose :
                 print (net, comment)
-            r = typ.query \
-                ( Q.net_address.CONTAINS (net)
-                , sort_key = TFL.Sorted_By ("-net_address.mask_len")
-                ).first ()
-            reserver = r.reserve if r else typ
-            network  = reserver (net, owner = self.ff_subject)
+            if cache.instance (net) is not None :
+                # reserved by a previous run (delta mode)
+                continue
+            network = cache.reserve (net, self.ff_subject)
             if isinstance (comment, type ('')) :
                 network.set_raw (desc = comment [:80])
     # end def reserve_net
@@ -1096,201 +1513,166 @@ class Convert (object) :
             self.dev_by_node [d.id_nodes].append (d)
             self.cons_dev [d.id] = Consolidated_Device (self, d)
         for ip in self.contents ['ips'] :
-            self.ip_by_ip [IP4_Address (ip.ip)] = ip
+            self.ip_by_ip [ip.ip] = ip
             if ip.id_devices :
                 did = ip.id_devices
                 self.cons_dev [did].add_redeemer_ip (ip)
-            net = IP4_Address (ip.ip, ip.cidr)
-            if net not in self.ip4nets :
-                print ("WARN: Adding network reservation: %s" % net)
-                self.ip4nets [net] = True
-        # consistency check of olsr data against redeemer db
+            net  = address (ip.ip, ip.cidr)
+            nets = self.ip6nets if net.bitlen == 128 else self.ip4nets
+            if net not in nets :
+                self.diag.warn \
+                    ( "network_added"
+                    , "Adding network reservation: %s", net
+                    )
+                nets [net] = True
+        # consistency check of olsr data against redeemer db, ips not in
+        # the redeemer db are skipped by the later steps
         # check nodes from topology
         for ip4 in self.olsr_nodes :
             if ip4 not in self.ip_by_ip :
-                print ("WARN: ip %s from olsr topo not in ips" % ip4)
-                del self.olsr_nodes [ip4]
+                self.diag.warn \
+                    ( "olsr_ip_not_in_redeemer"
+                    , "ip %s from olsr topo not in ips", ip4
+                    )
         # check mid table
         midkey = []
-        midtbl = {}
         for ip4, aliases in pyk.iteritems (self.olsr_mid) :
             if ip4 not in self.ip_by_ip :
-                print ("WARN: key ip %s from olsr mid not in ips" % ip4)
+                self.diag.warn \
+                    ( "olsr_ip_not_in_redeemer"
+                    , "key ip %s from olsr mid not in ips", ip4
+                    )
                 midkey.append (ip4)
             for a in aliases :
                 if a not in self.ip_by_ip :
-                    print ("WARN: ip %s from olsr mid not in ips" % a)
-                    if ip4 not in midtbl :
-                        midtbl [ip4] = []
-                    midtbl [ip4].append (a)
+                    self.diag.warn \
+                        ( "olsr_ip_not_in_redeemer"
+                        , "ip %s from olsr mid not in ips", a
+                        )
         assert not midkey
-        for k, v in pyk.iteritems (midtbl) :
-            x = dict.fromkeys (self.olsr_mid [k])
-            for ip4 in v :
-                del x [ip4]
-            self.olsr_mid [k] = x.keys ()
-        # consolidate devices using information from spider data
-        node_by_sdev = {}
-        for mainip, sdev in sorted (pyk.iteritems (self.spider_devs)) :
-            if sdev.done :
-                continue
-            sdev.done = True
-            seen_ip = {}
-            nodeid  = None
+        # consolidate devices and interfaces using information from the
+        # spider data and the mid table: devices of one node seen by the
+        # same spider device or listed in the same mid entry end up in
+        # one component of `dev_uf`, ips of one node on the same spider
+        # interface in one component of `if_uf` (by `ip_key`, the spider
+        # and redeemer spelling of an IPv6 address may differ)
+        dev_uf  = Union_Find ()
+        if_uf   = Union_Find ()
+        spif_of = {}
+        ip_of   = {}
+        for sdev, owned in self.spider.devices (self.diag) :
+            dev_by_n  = {}
+            ip_by_if  = {}
             for sif in sorted (pyk.itervalues (sdev.interfaces)) :
-                assert not sif.done
-                sif.done = True
-                for in4 in sorted (sif.inet4) :
-                    if unroutable (in4.ip) :
+                for in4 in spider_addresses (sif) :
+                    if unroutable_ip (in4.ip) :
                         continue
-                    seen_ip [in4.ip] = 1
-                    i4 = IP4_Address (in4.ip)
+                    i4 = address (in4.ip)
                     ip = self.ip_by_ip.get (i4)
                     if not ip :
-                        print \
-                            ("WARN: ip %s from spider not in redeemer" % i4)
+                        self.diag.warn \
+                            ( "spider_ip_not_in_redeemer"
+                            , "ip %s from spider not in redeemer", i4
+                            )
                         continue
                     if not ip.id_devices :
-                        print ("ERR: ip %s from spider has no device" % i4)
+                        self.diag.error \
+                            ( "spider_ip_no_device"
+                            , "ip %s from spider has no device", i4
+                            )
                         continue
-                    d = self.cons_dev [ip.id_devices]
-                    if sdev not in node_by_sdev :
-                        node_by_sdev [sdev] = {}
-                    if d.id_nodes not in node_by_sdev [sdev] :
-                        node_by_sdev [sdev] [d.id_nodes] = {}
-                    if d.id not in node_by_sdev [sdev] [d.id_nodes] :
-                        node_by_sdev [sdev] [d.id_nodes] [d.id] = {}
-                    node_by_sdev [sdev] [d.id_nodes] [d.id] [in4.ip] = True
-            assert mainip in seen_ip
-        for sdev, nodes in sorted (pyk.iteritems (node_by_sdev)) :
-            if len (nodes) > 1 :
-                print \
-                    ( "WARN: spider device %s expands to %s nodes: %s"
-                    % ( sdev.mainip
-                      , len (nodes)
-                      , ', '.join
-                        (self.node_by_id [n].name for n in pyk.iterkeys (nodes))
-                      )
-                    )
-            for n, devs in sorted (pyk.iteritems (nodes)) :
-                sdevs = {}
-                sifs  = {}
-                dev1  = None
-                err   = False
-                for devid, ips in sorted (pyk.iteritems (devs)) :
-                    d = self.cons_dev [devid]
-                    if d.merged :
-                        print \
-                            ("ERR: %s already merged to %s" % (d, d.merged))
-                        err = True
+                    k    = address_key (i4)
+                    spif = owned.get (k)
+                    if spif is None :
+                        self.diag.error \
+                            ( "merge_conflict"
+                            , "ip %s of spider device %s not merged"
+                            , i4, sdev.mainip
+                            )
                         continue
-                    if dev1 and d.id != dev1.id :
-                        if self.verbose :
-                            print \
-                                ( "Spider %-15s: Merging device %s.%s to %s.%s"
-                                % ( sdev.mainip
-                                  , d.node.name
-                                  , d.name
-                                  , dev1.node.name
-                                  , dev1.name
-                                  )
-                                )
-                        assert dev1 != d
-                        assert not dev1.merged
-                        dev1.merge (d)
-                    else :
-                        dev1 = d
-                    for ip in sorted (pyk.iterkeys (ips)) :
-                        sdevs [self.spider_devs  [ip]] = True
-                        if self.spider_iface [ip] not in sifs :
-                            sifs  [self.spider_iface [ip]] = {}
-                        sifs  [self.spider_iface [ip]] [ip] = True
-
-                if not err :
-                    assert len (sdevs) == 1
-                    if sdev not in sdevs :
-                        print ("ERR:  Merged interface differ:")
-                        print ("------------------------------")
-                        print (sdevs.keys () [0].verbose_repr ())
-                        print ("------------------------------")
-                        print (sdev.verbose_repr ())
-                        print ("------------------------------")
-                    assert len (sifs)  >= 1
-                    assert dev1
-                for sif, ips in sorted (pyk.iteritems (sifs)) :
-                    l = len (ips)
-                    assert l >= 1
-                    ifaces = {}
-                    for ip in ips :
-                        ifaces [ip] = dev1.interfaces [ip]
-                    assert len (ifaces) == len (ips)
-                    if1 = ip1 = None
-                    for ip, ifc in sorted (pyk.iteritems (ifaces)) :
-                        if if1 :
-                            print \
-                                ( "Spider %-15s: "
-                                  "Merging iface %s.%s:%s to %s.%s:%s"
-                                % ( sdev.mainip
-                                  , d.node.name
-                                  , d.name
-                                  , ip
-                                  , dev1.node.name
-                                  , dev1.name
-                                  , ip1
-                                  )
-                                )
-                            if1.merge (ifc)
-                        else :
-                            if1 = ifc
-                            ip1 = ip
-                            if sif.is_wlan :
-                                if1.is_wlan   = True
-                                if1.wlan_info = getattr (sif, 'wlan_info', None)
-                            if1.names = sif.names
-                            if1.spider_ip = sif.device.mainip
-        # compound devices from mid table
+                    d    = self.cons_dev [ip.id_devices]
+                    dev_uf.union (dev_by_n.setdefault (d.id_nodes, d.id), d.id)
+                    if_uf.union (ip_by_if.setdefault ((spif, d.id_nodes), k), k)
+                    spif_of [k] = spif
+                    ip_of   [k] = ip
+            if len (dev_by_n) > 1 :
+                self.diag.warn \
+                    ( "spider_device_nodes"
+                    , "spider device %s expands to %s nodes: %s"
+                    , sdev.mainip
+                    , len (dev_by_n)
+                    , ', '.join
+                        (self.node_by_id [n].name for n in sorted (dev_by_n))
+                    )
         # We index nodes by mid-table entry (by the mid key-ip address)
         # for each mid entry there can be several nodes (config bug)
         for ip4, aliases in sorted (pyk.iteritems (self.olsr_mid)) :
-            nodes = {}
-            ip    = self.ip_by_ip [ip4]
-            if ip.id_devices :
-                d = self.cons_dev [ip.id_devices]
-                d.mid_ip = ip4
-                nodes [d.id_nodes] = d
-            else :
-                print ("ERR:  key %s from mid has no device" % ip4)
-            for a in sorted (aliases) :
-                ip = self.ip_by_ip [a]
+            dev_by_n = {}
+            for a in [ip4] + sorted (aliases) :
+                ip = self.ip_by_ip.get (a)
+                if ip is None :
+                    continue
                 if not ip.id_devices :
-                    print ("ERR:  %s from mid %s has no device" % (a, ip4))
+                    self.diag.error \
+                        ( "mid_ip_no_device"
+                        , "%s from mid %s has no device", a, ip4
+                        )
                     continue
                 d  = self.cons_dev [ip.id_devices]
                 d.mid_ip = ip4
-                if d.id_nodes not in nodes :
-                    nodes [d.id_nodes] = d
-                elif d != nodes [d.id_nodes] :
-                    if d.merged :
-                        if d.merged != nodes [d.id_nodes] :
-                            print \
-                                ( "ERR: %s already merged to %s "
-                                  "not merging to %s"
-                                % (d, d.merged, nodes [d.id_nodes])
-                                )
-                        continue
-                    if nodes [d.id_nodes].merged :
-                        print \
-                            ("ERR: %s already merged" % (nodes [d.id_nodes]))
-                    else :
-                        nodes [d.id_nodes].merge (d)
-            if len (nodes) > 1 :
-                print \
-                    ("WARN: mid %s expands to %s nodes" % (ip4, len (nodes)))
+                dev_uf.union (dev_by_n.setdefault (d.id_nodes, d.id), d.id)
+            if len (dev_by_n) > 1 :
+                self.diag.warn \
+                    ( "mid_nodes"
+                    , "mid %s expands to %s nodes", ip4, len (dev_by_n)
+                    )
+        # compound devices: all devices of a component are merged into
+        # the one with the lowest id
+        for component in dev_uf.components () :
+            dev1 = self.cons_dev [component [0]]
+            for devid in component [1:] :
+                d = self.cons_dev [devid]
+                if self.verbose :
+                    print \
+                        ( "Merging device %s.%s to %s.%s"
+                        % (d.node.name, d.name, dev1.node.name, dev1.name)
+                        )
+                dev1.merge (d)
+        # compound interfaces: all interfaces of a component are merged
+        # into the one with the lowest ip (numerically, by `ip_key`)
+        for component in if_uf.components () :
+            ifaces = []
+            for k in component :
+                d = self.cons_dev [ip_of [k].id_devices]
+                ifaces.append ((d.merged or d).interfaces [k])
+            if1  = ifaces [0]
+            spif = spif_of [component [0]]
+            if spif.is_wlan :
+                if1.is_wlan   = True
+                if1.wlan_info = getattr (spif, 'wlan_info', None)
+            if1.names     = spif.names
+            if1.spider_ip = spif.device.mainip
+            for ifc in ifaces [1:] :
+                if ifc.device is not if1.device :
+                    self.diag.error \
+                        ( "merge_conflict"
+                        , "interface %s on device %s, not on %s"
+                        , ifc.ip, ifc.device, if1.device
+                        )
+                    continue
+                self.diag.info \
+                    ( "spider_iface_merge"
+                    , "Spider %-15s: Merging iface %s:%s to %s:%s"
+                    , spif.device.mainip, ifc.device.name, ifc.ip
+                    , if1.device.name, if1.ip
+                    )
+                if1.merge (ifc)
     # end def build_device_structure
 
     def debug_output (self) :
-        for k in sorted (pyk.iterkeys (self.olsr_nodes)) :
-            print (k)
+        for k in sorted (self.olsr_nodes) :
+            if k in self.ip_by_ip :
+                print (k)
         for node in self.contents ['nodes'] :
             nn = pyk.encoded (node.name, 'utf-8')
             print ("Node: %s (%s)" % (nn, node.id))
@@ -1298,33 +1680,251 @@ class Convert (object) :
                 print ("    Device: %s" % d.name)
     # end def debug_output
 
-    def create (self) :
-        self.build_device_structure ()
+    def consolidate (self) :
+        if not self.consolidated :
+            self.build_device_structure ()
+            self.consolidated = True
+            if self.snapshot :
+                self.snapshot.save  (self)
         if self.debug :
             self.debug_output       ()
-        self.create_persons         ()
-        self.reserve_net            (self.ip4nets, self.ffw.IP4_Network)
-        self.reserve_net            (self.ip6nets, self.ffw.IP6_Network)
-        self.create_nodes           ()
-        self.create_ips_and_devices ()
+    # end def consolidate
+
+    def create (self) :
+        profile = self.profiler
+        with profile ("consolidate") :
+            self.consolidate            ()
+        with profile ("create_persons") :
+            self.create_persons         ()
+        with profile ("reserve_net_ip4") :
+            self.reserve_net            (self.ip4nets, self.ffw.IP4_Network)
+        with profile ("reserve_net_ip6") :
+            self.reserve_net            (self.ip6nets, self.ffw.IP6_Network)
+        with profile ("create_nodes") :
+            self.create_nodes           ()
+        with profile ("create_ips_and_devices") :
+            self.create_ips_and_devices ()
+            self.loader.flush           ()
+        self.save_sync_state            ()
     # end def create
 
+    def instance_or_new (self, etype, * args, ** kw) :
+        """ Entity of `etype` for `args` and `kw`: a full conversion
+            always creates it, in delta mode an existing one is reused.
+        """
+        if self.delta :
+            return etype.instance_or_new (* args, ** kw)
+        return etype (* args, ** kw)
+    # end def instance_or_new
+
+    def entity (self, pid) :
+        """ Entity with `pid` or None if it doesn't exist anymore """
+        if pid is not None :
+            try :
+                return self.scope.pid_query (pid)
+            except LookupError :
+                pass
+    # end def entity
+
+    def destroy (self, pid) :
+        e = self.entity (pid)
+        if e is not None :
+            if self.verbose :
+                print ("Destroying %s" % (e, ))
+            e.destroy ()
+    # end def destroy
+
+    def stamps (self) :
+        """ Stamps of redeemer records compared by delta conversion """
+        contents = self.contents
+        return dict \
+            ( members = dict
+                ((m.id, (m.changed, m.created)) for m in contents ['members'])
+            , nodes   = dict
+                ((n.id, (n.changed, n.created)) for n in contents ['nodes'])
+            , devices = dict
+                ( (d.devid, d.signature)
+                for d in pyk.itervalues (self.cons_dev) if not d.merged
+                )
+            )
+    # end def stamps
+
+    def save_sync_state (self) :
+        if self.sync_state is None :
+            return
+        stamps   = self.stamps ()
+        stamps ["members"].update (self.kept_members)
+        entities = dict \
+            ( members = self.person_by_id
+            , nodes   = self.ffw_node_by_id
+            , devices = dict
+                ( (d.devid, d.net_device)
+                for d in pyk.itervalues (self.cons_dev) if not d.merged
+                )
+            )
+        for kind, s in pyk.iteritems (stamps) :
+            self.sync_state.record (kind, s, entities [kind])
+        self.sync_state.save ()
+    # end def save_sync_state
+
+    def update (self) :
+        """ Apply changes of redeemer records since the run recorded in
+            `sync_state` to the existing scope: entities of created
+            records are created, of changed records updated (devices are
+            re-created), and of removed records destroyed. Actor links,
+            dupe accounts, mentor links, and legal entities are re-applied
+            for created and changed members; a person of a removed member
+            still owning or managing nodes is kept (see `destroy_person`).
+        """
+        state  = self.sync_state
+        with self.profiler ("consolidate") :
+            self.consolidate ()
+        with self.profiler ("update") :
+            self._update (state)
+        self.save_sync_state ()
+    # end def update
+
+    def _update (self, state) :
+        stamps = self.stamps ()
+        self.load_dedup_indexes        ()
+        self.validate_rules            ()
+        for m in self.contents ['members'] :
+            self.member_by_id [m.id] = m
+        created, changed, removed = state.diff ("members", stamps ["members"])
+        for id, pid in pyk.iteritems (state.pids.get ("members", {})) :
+            person = self.entity (pid)
+            if person is not None and id not in removed :
+                self.person_by_id [id] = person
+        for id in list (self.rules.companies) + list (self.rules.associations) :
+            if id in self.person_by_id :
+                self.manager_by_id [id] = self.person_by_id [id]
+        for actors in self.rules.company_actor, self.rules.association_actor :
+            for l_id, p_id in pyk.iteritems (actors) :
+                if p_id in self.person_by_id :
+                    self.manager_by_id [l_id] = self.person_by_id [p_id]
+        self.ff_subject = self.person_by_id.get (1)
+        # the subject of an account includes the data of its dupe accounts
+        for dupe, id in pyk.iteritems (self.rules.person_dupes) :
+            if dupe in changed and id in self.member_by_id :
+                if id not in created and id not in changed :
+                    changed.append (id)
+        for id in created :
+            self.create_person (self.member_by_id [id])
+        for id in changed :
+            self.update_person (self.member_by_id [id])
+        if not self.anonymize :
+            ids = set (created + changed)
+            self.create_actor_links  (ids)
+            self.merge_dupes         (ids)
+            self.create_mentor_links ()
+        rm_members = removed
+        self.reserve_net (self.ip4nets, self.ffw.IP4_Network)
+        self.reserve_net (self.ip6nets, self.ffw.IP6_Network)
+
+        nodes = dict ((n.id, n) for n in self.contents ['nodes'])
+        created, changed, removed = state.diff ("nodes", stamps ["nodes"])
+        for id, pid in pyk.iteritems (state.pids.get ("nodes", {})) :
+            node = self.entity (pid)
+            if node is not None and id not in removed :
+                self.ffw_node_by_id [id] = node
+        for id in created :
+            self.create_node (nodes [id])
+        for id in changed :
+            self.update_node (nodes [id])
+        rm_nodes = removed
+
+        created, changed, removed = state.diff ("devices", stamps ["devices"])
+        for id in removed + changed :
+            self.destroy (state.pid ("devices", id))
+        for id in created + changed :
+            dev = self.cons_dev [id]
+            if dev.id_nodes not in self.ffw_node_by_id :
+                self.diag.error \
+                    ( "device_node_missing"
+                    , "Device %s: node %s not found", id, dev.id_nodes
+                    )
+                continue
+            dev.create ()
+        for id in rm_nodes :
+            self.destroy (state.pid ("nodes", id))
+        self.loader.flush ()
+        for id in rm_members :
+            self.destroy_person (id, state)
+        self.loader.flush ()
+    # end def _update
+
+    def destroy_person (self, id, state) :
+        """ Destroy subject of removed member `id` unless it still owns or
+            manages nodes: it is kept, with the old stamp of the member in
+            the sync state, i.e., the next run tries again.
+        """
+        person = self.entity (state.pid ("members", id))
+        if person is None :
+            return
+        n = self.ffw.Node.query \
+            (Q.OR (Q.owner == person, Q.manager == person)).count ()
+        if n :
+            self.diag.error \
+                ( "person_owns_nodes"
+                , "Member %s removed, but %s still owns or manages %s nodes"
+                , id, person, n
+                )
+            self.person_by_id [id] = person
+            self.kept_members [id] = state.stamps ["members"] [id]
+            return
+        self.destroy (person.pid)
+    # end def destroy_person
+
 # end def Convert
 
 def _main (cmd) :
+    if cmd.delta and not (cmd.sync_state and os.path.exists (cmd.sync_state)) :
+        print ("ERR:  -delta needs the -sync_state file of a previous run")
+        return
+    if cmd.plan :
+        _plan (cmd)
+        return
     scope = Command.scope (cmd)
     if cmd.Break :
         TFL.Environment.py_shell ()
     c = Convert (cmd, scope, debug = False)
     #c.dump ()
-    c.create ()
-    scope.commit ()
-    scope.ems.compact ()
+    if cmd.delta :
+        c.update ()
+    else :
+        c.create ()
+    with c.profiler ("commit") :
+        c.loader.flush ()
+        scope.ems.compact ()
     scope.destroy ()
-    Command.command._handle_load_auth_mig \
-        (cmd, mig_auth_file = Command.command.default_mig_auth_file + ".0xff")
+    if cmd.profile :
+        c.profiler.save (cmd.profile)
+    if cmd.diag_file :
+        c.diag.write (cmd.diag_file)
+        print ("\n".join (c.diag.summary ()))
+    if not cmd.delta :
+        Command.command._handle_load_auth_mig \
+            ( cmd
+            , mig_auth_file = Command.command.default_mig_auth_file + ".0xff"
+            )
 # end def _main
 
+def _plan (cmd) :
+    """ Dry run: summarize the entities a conversion would create. The
+        conversion runs as usual but creates the entities in a Plan_Scope
+        instead of a database.
+    """
+    scope = Plan_Scope ()
+    c     = Convert (cmd, scope, debug = False)
+    c.create ()
+    print ("\n".join (scope.summary ()))
+    if cmd.profile :
+        c.profiler.save (cmd.profile)
+    if cmd.diag_file :
+        c.diag.write (cmd.diag_file)
+        print ("\n".join (c.diag.summary ()))
+# end def _plan
+
 _Command = TFL.CAO.Cmd \
     ( handler         = _main
     , args            =
@@ -1335,8 +1935,20 @@ _Command = TFL.CAO.Cmd \
         ( "verbose:B"
         , "create:B"
         , "anonymize:B"
-        , "olsr_file:S=olsr/txtinfo.txt?OLSR dump-file to convert"
-        , "spider_dump:S=Funkfeuer.dump?Spider pickle dump"
+        , "batch_size:I=500?Number of changes committed in one transaction"
+        , "parallel_load:B"
+            "?Parse OLSR and spider data in worker processes while parsing "
+            "the SQL dump"
+        , "snapshot_dir:S?Directory for snapshots of the consolidated input"
+        , "sync_state:S?File recording the state of the last conversion"
+        , "delta:B?Only apply changes since the run recorded in -sync_state"
+        , "plan:B?Only print summary of entities to create, no database"
+        , "rules_file:S?File with dedup and cleanup rules for persons"
+        , "profile:S?Write JSON report of time and memory per stage to file"
+        , "diag_file:S?Write diagnostics to file (JSON Lines or .sqlite)"
+        , "diag_limit:I=0?Maximum number of diagnostics kept per category"
+        , "olsr_file:S=olsr/txtinfo.txt?OLSR dump-file or snapshot to convert"
+        , "spider_dump:S=Funkfeuer.dump?Spider store or pickle dump"
         , "network:S,?Networks already reserved"
         , "spider_ignore_ip:S,?<IP>:<IP> ignore sub-IP for spidered device"
         ) + Command.opts
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    dedup
+#
+# Purpose
+#    In-memory dedup indexes of emails, phones, and urls
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Add `remove` and `unlink`
+#    ««revision-date»»···
+#--
+
+class Dedup_Index (object) :
+    """ In-memory index of the entities of one essential type (e.g.,
+        PAP.Email) by a normalized key. For each key the index knows the
+        entity, the id of the redeemer member the entity was created
+        for, and the subjects linked to the entity. This answers the
+        questions of the converter about already existing entities
+        without querying the scope for each field of each member.
+        `key` is a function returning the key of an existing entity.
+    """
+
+    def __init__ (self, key) :
+        self.key      = key
+        self.entities = {}
+        self.owners   = {}
+        self.links    = {}
+    # end def __init__
+
+    def add (self, key, entity, owner = None) :
+        self.entities [key] = entity
+        if owner is not None :
+            self.owners [key] = owner
+    # end def add
+
+    def get (self, key) :
+        return self.entities.get (key)
+    # end def get
+
+    def is_linked (self, key, subject) :
+        return (key, subject.pid) in self.links
+    # end def is_linked
+
+    def link (self, key, subject) :
+        self.links [key, subject.pid] = True
+    # end def link
+
+    def load (self, etype, link_etype = None) :
+        """ Add all entities of `etype` and all links of `link_etype`
+            already in the scope (one query each).
+        """
+        key = self.key
+        for e in etype.query ().all () :
+            self.entities [key (e)] = e
+        if link_etype is not None :
+            for l in link_etype.query ().all () :
+                self.links [key (l.right), l.left.pid] = True
+    # end def load
+
+    def remove (self, key) :
+        """ Forget entity with `key` (e.g., after it was destroyed) """
+        self.entities.pop (key, None)
+        self.owners.pop   (key, None)
+    # end def remove
+
+    def unlink (self, key, subject) :
+        self.links.pop ((key, subject.pid), None)
+    # end def unlink
+
+    def owner (self, key) :
+        """ Id of member for which the entity with `key` was created """
+        return self.owners.get (key)
+    # end def owner
+
+    def __contains__ (self, key) :
+        return key in self.entities
+    # end def __contains__
+
+# end class Dedup_Index
+
+### __END__ dedup
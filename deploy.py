@@ -22,6 +22,8 @@
 #     2-Jun-2012 (CT) Replace `config_defaults` by `Config`
 #     3-Jun-2012 (CT) Factor `_Base_Command_`, add `App_Config`
 #    10-Jul-2014 (CT) Derive `Command` from `CNDB.GTW.deploy.Command`, too
+#    17-Oct-2026 (agent) Add sub-command `prerender_pages`, option
+#                        `-prerendered_pages` of `uwsgi_config`
 #    ««revision-date»»···
 #--
 from   __future__  import absolute_import, division, print_function #, unicode_literals
@@ -34,6 +36,8 @@ import _CNDB.deploy
 
 from   _Base_Command_           import _Base_Command_
 
+from   _TFL                     import sos
+
 class Command (_Base_Command_, CNDB.deploy.Command) :
     """Manage deployment of FFW application."""
 
@@ -61,6 +65,76 @@ class Command (_Base_Command_, CNDB.deploy.Command) :
 
     # end class _Babel_
 
+    class _Prerender_Pages_ (GTW.Werkzeug.deploy.Command._Setup_Cache_) :
+        """Pre-render the read-only pages of the application."""
+
+    # end class _Prerender_Pages_
+
+    class _UBYCMS_ (GTW.Werkzeug.deploy.Command._UBYCMS_) :
+        """Update, Babel compile, pYcompile, setup Cache, Migrate, Prerender,
+           Switch.
+        """
+
+        _sub_command_seq = \
+            [ "update"
+            , "pycompile"
+            , ["babel", "compile"]
+            , ["migrate", "-Active", "-Passive"]
+            , "setup_cache"
+            , "prerender_pages"
+            , "switch"
+            ]
+
+    # end class _UBYCMS_
+
+    class _UWSGI_Config_ (GTW.Werkzeug.deploy.Command._UWSGI_Config_) :
+
+        _opts                   = \
+            ( "-prerendered_pages:B"
+                "?Serve the pages written by `prerender_pages` by nginx"
+            ,
+            )
+
+    # end class _UWSGI_Config_
+
+    def _create_config_http (self, cao, xxgi_macro_name, ** kw) :
+        socket = kw.get ("socket")
+        if socket and cao.GET ("prerendered_pages") :
+            x_locs = dict \
+                ( self._extra_locations
+                , ** self._prerendered_locations (cao, socket)
+                )
+            with self.LET (_extra_locations = x_locs) :
+                return self.__super._create_config_http \
+                    (cao, xxgi_macro_name, ** kw)
+        return self.__super._create_config_http (cao, xxgi_macro_name, ** kw)
+    # end def _create_config_http
+
+    def _handle_prerender_pages (self, cao) :
+        P    = self._P (cao)
+        app  = self._app_cmd (cao, P)
+        args = ("prerender_pages", ) + tuple (cao.argv)
+        self._app_call (cao, P, app, args)
+    # end def _handle_prerender_pages
+
+    def _prerendered_locations (self, cao, socket) :
+        www  = sos.path.join (cao.root_dir, "www")
+        locs = "|".join (p.strip ("/") for p in self.prerendered_pages)
+        return \
+            { "~ ^/(?:%s)(?:/|$)" % (locs, ) : dict
+                ( include         = sos.path.join
+                    (www, "app", "httpd_config", "prerendered.nginx")
+                , root            = sos.path.join (www, "prerendered")
+                )
+            , "@ffw_app" : dict
+                ( add_header      = ['Vary "Cookie"']
+                , include         = "uwsgi_params"
+                , proxy_buffering = "off"
+                , uwsgi_pass      = socket
+                )
+            }
+    # end def _prerendered_locations
+
 # end class Command
 
 command = Command ()
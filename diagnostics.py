@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    diagnostics
+#
+# Purpose
+#    Structured diagnostics of `convert_0xff`
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+import json
+import sqlite3
+
+from   _TFL.pyk               import pyk
+
+class Diagnostics (object) :
+    """ Collect findings of the conversion (warnings, errors, infos) in
+        memory, each finding has a level and a category (e.g.,
+        `duplicate_email`). The message is formatted only if the finding
+        is kept: with a `limit`, only the first `limit` findings of each
+        category are kept, the others are just counted.
+        With `echo`, kept findings are printed immediately (like the
+        converter did before), otherwise they are written in bulk by
+        `write`.
+    """
+
+    def __init__ (self, limit = 0, echo = True) :
+        self.limit    = limit
+        self.echo     = echo
+        self.counts   = {}
+        self.kept     = {}
+        self.findings = []
+    # end def __init__
+
+    def child (self) :
+        """ New, empty collector with the same limit, e.g., for use in a
+            worker process. Merge it back with `merge`, which applies the
+            limit to the findings of all children together and echoes
+            the findings kept.
+        """
+        return self.__class__ (self.limit, echo = False)
+    # end def child
+
+    def add (self, level, category, fmt, * args, ** kw) :
+        """ Record finding, `fmt % args` is the message. If `detail` is
+            passed, it must be a callable returning additional text
+            appended to the message (only called if finding is kept).
+        """
+        key   = (category, level)
+        self.counts [key] = self.counts.get (key, 0) + 1
+        if self._full (key) :
+            return
+        msg = fmt % args if args else fmt
+        detail = kw.get ("detail")
+        if detail is not None :
+            msg = "\n".join ((msg, detail ()))
+        self._keep (key, msg)
+    # end def add
+
+    def error (self, category, fmt, * args, ** kw) :
+        self.add ("ERR", category, fmt, * args, ** kw)
+    # end def error
+
+    def info (self, category, fmt, * args, ** kw) :
+        self.add ("INFO", category, fmt, * args, ** kw)
+    # end def info
+
+    def warn (self, category, fmt, * args, ** kw) :
+        self.add ("WARN", category, fmt, * args, ** kw)
+    # end def warn
+
+    def merge (self, other) :
+        for key, count in pyk.iteritems (other.counts) :
+            self.counts [key] = self.counts.get (key, 0) + count
+        for level, category, msg in other.findings :
+            key = (category, level)
+            if not self._full (key) :
+                self._keep (key, msg)
+    # end def merge
+
+    def summary (self) :
+        """ Return lines with number of findings per category """
+        return \
+            [ "%-4s %-32s %6d" % (level, category, count)
+            for (category, level), count in sorted (pyk.iteritems (self.counts))
+            ]
+    # end def summary
+
+    def _full (self, key) :
+        return self.limit and self.kept.get (key, 0) >= self.limit
+    # end def _full
+
+    def _keep (self, key, msg) :
+        category, level = key
+        self.kept [key] = self.kept.get (key, 0) + 1
+        self.findings.append ((level, category, msg))
+        if self.echo :
+            print ("%-5s %s" % (level + ":", msg))
+    # end def _keep
+
+    def write (self, filename) :
+        """ Write findings to `filename`: to an SQLite database if the
+            name ends in `.sqlite` or `.db`, as JSON Lines otherwise.
+        """
+        if filename.endswith ((".sqlite", ".db")) :
+            self._write_sqlite (filename)
+        else :
+            self._write_jsonl  (filename)
+    # end def write
+
+    def _write_jsonl (self, filename) :
+        with open (filename, "w") as f :
+            for level, category, msg in self.findings :
+                f.write \
+                    ( json.dumps
+                        (dict (level = level, category = category, msg = msg))
+                    )
+                f.write ("\n")
+            counts = dict \
+                ( ("%s/%s" % (level, category), count)
+                for (category, level), count in pyk.iteritems (self.counts)
+                )
+            f.write (json.dumps (dict (counts = counts), sort_keys = True))
+            f.write ("\n")
+    # end def _write_jsonl
+
+    def _write_sqlite (self, filename) :
+        db = sqlite3.connect (filename)
+        try :
+            db.execute ("drop table if exists findings")
+            db.execute ("drop table if exists counts")
+            db.execute \
+                ("create table findings (level text, category text, msg text)")
+            db.execute \
+                ("create table counts (level text, category text, count int)")
+            db.executemany \
+                ("insert into findings values (?, ?, ?)", self.findings)
+            db.executemany \
+                ( "insert into counts values (?, ?, ?)"
+                , ( (level, category, count)
+                  for (category, level), count in pyk.iteritems (self.counts)
+                  )
+                )
+            db.commit ()
+        finally :
+            db.close ()
+    # end def _write_sqlite
+
+# end class Diagnostics
+
+### __END__ diagnostics
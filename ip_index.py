@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    ip_index
+#
+# Purpose
+#    Indexes of IP networks and addresses
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+from   bisect                 import bisect_left, bisect_right
+from   rsclib.IP_Address      import IP4_Address, IP6_Address
+from   _TFL.pyk               import pyk
+
+def address (ip, mask = None) :
+    """ Parse string `ip` into an IP6_Address or IP4_Address """
+    cls = IP6_Address if ':' in ip else IP4_Address
+    if mask is None :
+        return cls (ip)
+    return cls (ip, mask)
+# end def address
+
+def address_key (adr) :
+    """ Integer key of address (or network address of network) `adr`,
+        unique across IPv4 and IPv6: IPv6 keys have bit 128 set.
+    """
+    if adr.bitlen == 128 :
+        return adr.ip | (1 << 128)
+    return adr.ip
+# end def address_key
+
+class Net_Index (object) :
+    """ Index of IP networks (rsclib IP4_Address or IP6_Address objects
+        with a netmask) answering containment questions without scanning
+        all networks. Networks are hashed by their network address, one
+        hash per address family and mask length, so a lookup costs one
+        probe per distinct mask length of the family of the address (at
+        most 33 for IPv4, 129 for IPv6). IPv4 and IPv6 networks can be
+        mixed in one index.
+        A value can be stored with each network.
+    """
+
+    def __init__ (self, nets = ()) :
+        self.by_mask = {}
+        self.masks   = []
+        self.bitmask = {}
+        if isinstance (nets, dict) :
+            nets = pyk.iteritems (nets)
+        else :
+            nets = ((n, True) for n in nets)
+        for net, value in nets :
+            self.add (net, value)
+    # end def __init__
+
+    def add (self, net, value = True) :
+        k = (net.bitlen, net.mask)
+        if k not in self.by_mask :
+            self.by_mask [k] = {}
+            self.bitmask [k] = \
+                ((1 << net.mask) - 1) << (net.bitlen - net.mask)
+            self.masks = sorted (self.by_mask, reverse = True)
+        self.by_mask [k] [net.ip] = (net, value)
+    # end def add
+
+    def containing (self, adr) :
+        """ Yield (net, value) for all networks containing `adr` (an
+            address or a network), most specific network first.
+        """
+        for k in self.masks :
+            bitlen, mask = k
+            if bitlen != adr.bitlen or mask > adr.mask :
+                continue
+            r = self.by_mask [k].get (adr.ip & self.bitmask [k])
+            if r is not None :
+                yield r
+    # end def containing
+
+    def get (self, net) :
+        """ Value stored for exactly `net` or None """
+        r = self.by_mask.get ((net.bitlen, net.mask), {}).get (net.ip)
+        if r is not None :
+            return r [1]
+    # end def get
+
+    def most_specific (self, adr) :
+        """ Return (net, value) of most specific network containing `adr`
+            or None.
+        """
+        for r in self.containing (adr) :
+            return r
+    # end def most_specific
+
+    def __contains__ (self, adr) :
+        return self.most_specific (adr) is not None
+    # end def __contains__
+
+    def __len__ (self) :
+        return sum (len (v) for v in pyk.itervalues (self.by_mask))
+    # end def __len__
+
+# end class Net_Index
+
+class Network_Cache (Net_Index) :
+    """ In-memory hierarchy of the networks of one essential type (e.g.,
+        CNDB.IP4_Network) during a conversion. All networks in the scope
+        are fetched with a single query, networks reserved via the cache
+        are added to it. Lookups of a network by address and of the most
+        specific network containing an address don't query the scope.
+        Networks created by splitting a pool during `reserve` aren't in
+        the cache but are always contained in a cached network, `reserve`
+        of that network descends into them.
+        Reservations are done via `create` (e.g., a Batch_Loader), called
+        with the reserving function and its arguments.
+    """
+
+    def __init__ (self, etype, create = None) :
+        Net_Index.__init__ (self)
+        if create is None :
+            create = lambda fun, * args, ** kw : fun (* args, ** kw)
+        self.etype  = etype
+        self.create = create
+        for n in etype.query ().all () :
+            self.add (n.net_address, n)
+    # end def __init__
+
+    def instance (self, net) :
+        """ Network with address `net` or None """
+        return self.get (net)
+    # end def instance
+
+    def reserve (self, net, owner) :
+        """ Reserve `net` in the most specific network containing it (a
+            top-level network is created if there is none).
+        """
+        r        = self.most_specific (net)
+        reserver = r [1].reserve if r else self.etype
+        result   = self.create (reserver, net, owner = owner)
+        self.add (net, result)
+        return result
+    # end def reserve
+
+# end class Network_Cache
+
+class Address_Index (object) :
+    """ Mapping of IPv4 and IPv6 host addresses to values keyed by the
+        integer `address_key`, much smaller than a dictionary keyed by
+        address objects. Addresses can be passed as rsclib address
+        objects or as strings.
+    """
+
+    def __init__ (self) :
+        self.by_key = {}
+    # end def __init__
+
+    def get (self, adr, default = None) :
+        return self.by_key.get (self._key (adr), default)
+    # end def get
+
+    def _key (self, adr) :
+        if isinstance (adr, pyk.string_types) :
+            adr = address (adr)
+        return address_key (adr)
+    # end def _key
+
+    def __contains__ (self, adr) :
+        return self._key (adr) in self.by_key
+    # end def __contains__
+
+    def __getitem__ (self, adr) :
+        return self.by_key [self._key (adr)]
+    # end def __getitem__
+
+    def __len__ (self) :
+        return len (self.by_key)
+    # end def __len__
+
+    def __setitem__ (self, adr, value) :
+        self.by_key [self._key (adr)] = value
+    # end def __setitem__
+
+# end class Address_Index
+
+class Address_Set (object) :
+    """ Set of IPv4 and IPv6 host addresses kept as sorted array of
+        integer keys (see `address_key`). Answers which of the addresses
+        lie in a given network by binary search, without enumerating the
+        addresses of the network.
+    """
+
+    def __init__ (self, addresses = ()) :
+        self.by_int = dict ((address_key (a), a) for a in addresses)
+        self.ints   = sorted (self.by_int)
+    # end def __init__
+
+    def in_net (self, net) :
+        """ List of addresses contained in `net` """
+        k  = address_key (net)
+        lo = bisect_left  (self.ints, k)
+        hi = bisect_right (self.ints, k | net.invmask)
+        return [self.by_int [i] for i in self.ints [lo:hi]]
+    # end def in_net
+
+    def __contains__ (self, adr) :
+        return address_key (adr) in self.by_int
+    # end def __contains__
+
+    def __len__ (self) :
+        return len (self.ints)
+    # end def __len__
+
+# end class Address_Set
+
+### __END__ ip_index
@@ -0,0 +1,240 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    olsr_snapshot
+#
+# Purpose
+#    Binary snapshot of the OLSR tables
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Read tables with `array.fromfile` (Python 2 and 3)
+#    ««revision-date»»···
+#--
+
+import struct
+
+from   array                  import array
+from   bisect                 import bisect_left, bisect_right
+from   rsclib.IP_Address      import IP4_Address
+from   _TFL                   import TFL
+from   _TFL.pyk               import pyk
+
+import _TFL.CAO
+
+class _Address_Table (object) :
+    """ Sorted array of integer IPv4 addresses """
+
+    def __init__ (self, ips) :
+        self.ips = ips
+    # end def __init__
+
+    def in_net (self, net) :
+        """ List of addresses contained in `net` """
+        lo = bisect_left  (self.ips, net.ip)
+        hi = bisect_right (self.ips, net.ip | net.invmask)
+        return [IP4_Address (ip) for ip in self.ips [lo:hi]]
+    # end def in_net
+
+    def __contains__ (self, adr) :
+        i = bisect_left (self.ips, adr.ip)
+        return i < len (self.ips) and self.ips [i] == adr.ip
+    # end def __contains__
+
+    def __iter__ (self) :
+        for ip in self.ips :
+            yield IP4_Address (ip)
+    # end def __iter__
+
+    def __len__ (self) :
+        return len (self.ips)
+    # end def __len__
+
+# end class _Address_Table
+
+class _MID_Table (_Address_Table) :
+    """ MID table: sorted array of main addresses, the aliases of the
+        i-th main address are `aliases [offsets [i]:offsets [i+1]]`.
+    """
+
+    def __init__ (self, ips, offsets, aliases) :
+        _Address_Table.__init__ (self, ips)
+        self.offsets = offsets
+        self.aliases = aliases
+    # end def __init__
+
+    def get (self, adr, default = None) :
+        i = bisect_left (self.ips, adr.ip)
+        if i < len (self.ips) and self.ips [i] == adr.ip :
+            return self._aliases (i)
+        return default
+    # end def get
+
+    def iteritems (self) :
+        for i, ip in enumerate (self.ips) :
+            yield IP4_Address (ip), self._aliases (i)
+    # end def iteritems
+
+    def _aliases (self, i) :
+        a = self.aliases [self.offsets [i]:self.offsets [i + 1]]
+        return [IP4_Address (ip) for ip in a]
+    # end def _aliases
+
+    def __getitem__ (self, adr) :
+        result = self.get (adr)
+        if result is None :
+            raise KeyError (adr)
+        return result
+    # end def __getitem__
+
+# end class _MID_Table
+
+class _HNA_Table (_Address_Table) :
+    """ HNA destinations: networks sorted by address and mask, the masks
+        are kept in a parallel byte array.
+    """
+
+    def __init__ (self, ips, masks) :
+        _Address_Table.__init__ (self, ips)
+        self.masks = masks
+    # end def __init__
+
+    def __contains__ (self, net) :
+        lo = bisect_left  (self.ips, net.ip)
+        hi = bisect_right (self.ips, net.ip)
+        return any (self.masks [i] == net.mask for i in range (lo, hi))
+    # end def __contains__
+
+    def __iter__ (self) :
+        for ip, mask in zip (self.ips, self.masks) :
+            yield IP4_Address (ip, mask)
+    # end def __iter__
+
+# end class _HNA_Table
+
+class OLSR_Snapshot (object) :
+    """ Binary snapshot of the OLSR topology nodes, MID and HNA tables
+        parsed from a txtinfo dump. IPv4 addresses are stored as arrays
+        of 32 bit integers in native byte order:
+
+        - header: magic, number of nodes, MID entries, MID aliases, and
+          HNA entries
+        - sorted topology nodes
+        - sorted MID main addresses, offsets into the aliases, aliases
+        - HNA destinations sorted by address and mask, masks (1 byte
+          each)
+
+        `load` reads each table with a single `array.fromfile`, nothing
+        is parsed (this works with Python 2 and 3, unlike views into a
+        memory mapping). `by_ip` (the MID table)
+        and `by_dest` (the HNA table) are looked up by binary search
+        like the corresponding tables of `ff_olsr`.
+    """
+
+    magic  = b"FFOLSR\x00\x01"
+    header = struct.Struct ("=8s4I")
+
+    def __init__ (self, nodes, mid_ips, mid_offsets, mid_aliases, hna, masks) :
+        self.nodes   = _Address_Table (nodes)
+        self.by_ip   = _MID_Table     (mid_ips, mid_offsets, mid_aliases)
+        self.by_dest = _HNA_Table     (hna, masks)
+    # end def __init__
+
+    def alias_table (self) :
+        """ Table of the distinct aliases of all MID entries (the reverse
+            MID table), a sorted copy of the aliases.
+        """
+        return _Address_Table (array ("I", sorted (set (self.by_ip.aliases))))
+    # end def alias_table
+
+    @classmethod
+    def is_snapshot (cls, filename) :
+        with open (filename, "rb") as f :
+            return f.read (len (cls.magic)) == cls.magic
+    # end def is_snapshot
+
+    @classmethod
+    def load (cls, filename) :
+        assert array ("I").itemsize == 4
+        with open (filename, "rb") as f :
+            magic, n_nodes, n_mid, n_alias, n_hna = cls.header.unpack \
+                (f.read (cls.header.size))
+            if magic != cls.magic :
+                raise ValueError ("%s: not an OLSR snapshot" % filename)
+            tables = []
+            sizes  = \
+                ( ("I", n_nodes), ("I", n_mid), ("I", n_mid + 1)
+                , ("I", n_alias), ("I", n_hna), ("B", n_hna)
+                )
+            for code, n in sizes :
+                a = array (code)
+                a.fromfile (f, n)
+                tables.append (a)
+        return cls (* tables)
+    # end def load
+
+    @classmethod
+    def write (cls, filename, nodes, mid, hna) :
+        """ Write snapshot of topology `nodes`, `mid` (mapping main
+            address to aliases), and HNA destinations `hna` to `filename`.
+        """
+        mid_ips     = array ("I")
+        mid_offsets = array ("I", [0])
+        mid_aliases = array ("I")
+        for k, aliases in sorted (pyk.iteritems (mid)) :
+            mid_ips.append (k.ip)
+            mid_aliases.extend (sorted (a.ip for a in aliases))
+            mid_offsets.append (len (mid_aliases))
+        hna   = sorted ((n.ip, n.mask) for n in hna)
+        nodes = array ("I", sorted (n.ip for n in nodes))
+        assert array ("I").itemsize == 4
+        with open (filename, "wb") as f :
+            f.write \
+                ( cls.header.pack
+                    ( cls.magic
+                    , len (nodes), len (mid_ips), len (mid_aliases), len (hna)
+                    )
+                )
+            for a in nodes, mid_ips, mid_offsets, mid_aliases :
+                a.tofile (f)
+            array ("I", (ip for ip, _ in hna)).tofile (f)
+            array ("B", (m  for _, m in hna)).tofile (f)
+    # end def write
+
+# end class OLSR_Snapshot
+
+def convert_txtinfo (txtinfo, filename) :
+    """ Parse OLSR txtinfo dump and write binary snapshot of it """
+    from ff_olsr.parser import get_olsr_container
+    olsr  = get_olsr_container (txtinfo)
+    nodes = dict.fromkeys (olsr.topo.forward)
+    nodes.update (dict.fromkeys (olsr.topo.reverse))
+    OLSR_Snapshot.write (filename, nodes, olsr.mid.by_ip, olsr.hna.by_dest)
+# end def convert_txtinfo
+
+def _main (cmd) :
+    convert_txtinfo (* cmd.argv)
+# end def _main
+
+_Command = TFL.CAO.Cmd \
+    ( handler         = _main
+    , args            =
+        ( "txtinfo:S?OLSR txtinfo dump to convert"
+        , "snapshot:S?Binary OLSR snapshot to write"
+        )
+    , min_args        = 2
+    , max_args        = 2
+    )
+
+if __name__ == "__main__" :
+    _Command ()
+### __END__ olsr_snapshot
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    phone_normalizer
+#
+# Purpose
+#    Memoized normalization of member phone numbers
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Pass the effective town to `_normalize`, too
+#    ««revision-date»»···
+#--
+
+from   rsclib.Phone           import Phone
+from   _TFL.pyk               import pyk
+
+class Phone_Normalizer (object) :
+    """ Normalize phone numbers of redeemer members to the key
+        `(country code, area code, number)` used for PAP.Phone.
+        Calling the normalizer returns a pair `(key, reason)`: `key` is
+        None if the number is rejected, `reason` then tells why (None
+        for an empty field). Results are memoized by the stripped
+        number and the town, the phone type doesn't influence the key.
+        Members without town are in `default_town` (like their address,
+        see `Convert.try_insert_address`).
+    """
+
+    def __init__ (self, bogus = (), default_town = 'Wien') :
+        self.bogus        = bogus
+        self.default_town = default_town
+        self.cache        = {}
+        self.by_member    = {}
+        self.hits         = 0
+    # end def __init__
+
+    def __call__ (self, raw, town) :
+        x = raw.strip () if raw else raw
+        if not x :
+            return None, None
+        town = town or self.default_town
+        k    = (x, town)
+        try :
+            result = self.cache [k]
+        except KeyError :
+            result = self.cache [k] = self._normalize (x, town)
+        else :
+            self.hits += 1
+        return result
+    # end def __call__
+
+    def member (self, m, field) :
+        """ Return `(key, reason)` for the phone `field` of member `m`,
+            as computed by `normalize_members`, if possible.
+        """
+        try :
+            return self.by_member [m.id, field]
+        except KeyError :
+            return self (getattr (m, field), m.town)
+    # end def member
+
+    def normalize_members (self, members, fields) :
+        """ Normalize the phone `fields` of all `members` in one pass.
+            Return dict mapping `(member id, field)` to `(key, reason)`,
+            used by `member`.
+        """
+        result = self.by_member
+        for m in members :
+            for f in fields :
+                result [m.id, f] = self (getattr (m, f), m.town)
+        return result
+    # end def normalize_members
+
+    def _normalize (self, x, town) :
+        if x in self.bogus :
+            return None, "bogus"
+        try :
+            p = Phone (x, town)
+        except ValueError as err :
+            return None, str (err)
+        if not p :
+            return None, "empty"
+        return tuple (str (v) for v in p), None
+    # end def _normalize
+
+    def __len__ (self) :
+        return len (self.cache)
+    # end def __len__
+
+# end class Phone_Normalizer
+
+### __END__ phone_normalizer
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    plan
+#
+# Purpose
+#    Scope for the dry run `convert_0xff -plan`
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+from   itertools              import count as counter
+from   _TFL                   import TFL
+from   _TFL.pyk               import pyk
+
+import _TFL.Record
+
+class Plan_Entity (object) :
+    """ Entity the conversion would create. The positional arguments of
+        the creation are kept as `epk`, the first two are also available
+        as `left` and `right` (the roles of link types), keyword
+        arguments as attributes.
+    """
+
+    def __init__ (self, e_type, pid, args, kw) :
+        self.e_type    = e_type
+        self.type_name = e_type.type_name
+        self.pid       = pid
+        self.epk       = args
+        for k, v in zip (("left", "right"), args) :
+            setattr (self, k, v)
+        self.set (** kw)
+    # end def __init__
+
+    def reserve (self, net, owner = None) :
+        """ Reserve `net` in this network: creates a network of the same
+            type (networks created by splitting a pool aren't planned).
+        """
+        return self.e_type (net, owner = owner)
+    # end def reserve
+
+    def set (self, ** kw) :
+        kw.pop ("raw", None)
+        self.__dict__.update (kw)
+    # end def set
+
+    set_raw = set
+
+    def __repr__ (self) :
+        return "%s (pid = %s)" % (self.type_name, self.pid)
+    # end def __repr__
+
+# end class Plan_Entity
+
+class Plan_E_Type (object) :
+    """ Stand-in for the E_Type_Manager of essential type `type_name`
+        counting the entities created via it.
+    """
+
+    def __init__ (self, scope, type_name) :
+        self.scope          = scope
+        self.type_name      = type_name
+        self.type_base_name = type_name.split (".") [-1]
+        self.type_names     = \
+            (type_name, ) + scope.descendants.get (type_name, ())
+        self.by_key         = {}
+    # end def __init__
+
+    def create_new_account_x (self, name, ** kw) :
+        return self (name = name, ** kw)
+    # end def create_new_account_x
+
+    def instance (self, * args, ** kw) :
+        """ Entities of fixture types are assumed to exist (they aren't
+            counted), for all other types there is no existing instance.
+        """
+        if self.type_name in self.scope.fixture_types :
+            key = self._key (args, kw)
+            try :
+                return self.by_key [key]
+            except KeyError :
+                result = self.by_key [key] = Plan_Entity \
+                    (self, self.scope.new_pid (), args, kw)
+                return result
+    # end def instance
+
+    def instance_or_new (self, * args, ** kw) :
+        key = self._key (args, kw)
+        try :
+            return self.by_key [key]
+        except KeyError :
+            result = self.by_key [key] = self (* args, ** kw)
+            return result
+    # end def instance_or_new
+
+    def query (self, ** kw) :
+        """ Planned entities of this type (and its descendants) with the
+            attribute values in `kw`.
+        """
+        return Plan_Query \
+            ( e
+            for tn in self.type_names
+            for e  in self.scope.entities.get (tn, ())
+            if all (getattr (e, k, None) is v for k, v in pyk.iteritems (kw))
+            )
+    # end def query
+
+    def _key (self, args, kw) :
+        kw = dict (kw)
+        kw.pop ("raw", None)
+        return (args, tuple (sorted (pyk.iteritems (kw))))
+    # end def _key
+
+    def __call__ (self, * args, ** kw) :
+        return self.scope.add \
+            (Plan_Entity (self, self.scope.new_pid (), args, kw))
+    # end def __call__
+
+    def __instancecheck__ (self, instance) :
+        return getattr (instance, "type_name", None) in self.type_names
+    # end def __instancecheck__
+
+# end class Plan_E_Type
+
+class Plan_Query (list) :
+
+    def all (self) :
+        return self
+    # end def all
+
+# end class Plan_Query
+
+class Plan_Namespace (object) :
+    """ Plan_E_Types of the essential types of package namespace `name`,
+        created on first access.
+    """
+
+    def __init__ (self, scope, name) :
+        self._scope = scope
+        self._name  = name
+    # end def __init__
+
+    def __getattr__ (self, name) :
+        if name.startswith ("_") :
+            raise AttributeError (name)
+        result = Plan_E_Type (self._scope, ".".join ((self._name, name)))
+        setattr (self, name, result)
+        return result
+    # end def __getattr__
+
+# end class Plan_Namespace
+
+class Plan_Scope (object) :
+    """ Scope for a dry run of a conversion: the converter runs exactly as
+        for a real conversion (consolidation of devices and interfaces,
+        dedup and cleanup of persons, reservation of networks), but the
+        entities are created in memory and counted by type name instead
+        of being stored in a database. Nothing is ever committed.
+        The plan starts from an empty database: entities of fixtures or
+        of previous runs are unknown to it, except for the fixture types
+        in `fixture_types` which are assumed to exist. Networks created
+        by splitting a pool during reservation aren't counted.
+    """
+
+    ### types whose instances are expected to exist (from fixtures)
+    fixture_types = \
+        ( "CNDB.Net_Device_Type"
+        , "CNDB.Wireless_Channel"
+        , "CNDB.Wireless_Standard"
+        )
+
+    ### types whose queries and `isinstance` checks include other types
+    ### created by the conversion
+    descendants   = \
+        { "PAP.Subject_has_Property" :
+            ( "PAP.Subject_has_Address"
+            , "PAP.Subject_has_Email"
+            , "PAP.Subject_has_IM_Handle"
+            , "PAP.Subject_has_Nickname"
+            , "PAP.Subject_has_Phone"
+            , "PAP.Subject_has_Url"
+            )
+        }
+
+    uncommitted_changes = ()
+
+    def __init__ (self) :
+        self.count    = {}
+        self.entities = {}
+        self.pids     = counter (1)
+        self.ems      = self
+        self.Auth     = Plan_Namespace (self, "Auth")
+        self.CNDB     = Plan_Namespace (self, "CNDB")
+        self.PAP      = Plan_Namespace (self, "PAP")
+        self.GTW      = TFL.Record (OMP = TFL.Record (PAP = self.PAP))
+    # end def __init__
+
+    def add (self, entity) :
+        tn = entity.type_name
+        self.count [tn] = self.count.get (tn, 0) + 1
+        self.entities.setdefault (tn, []).append (entity)
+        return entity
+    # end def add
+
+    def commit (self) :
+        pass
+    # end def commit
+
+    def convert_creation_change (self, pid, ** kw) :
+        pass
+    # end def convert_creation_change
+
+    def new_pid (self) :
+        return next (self.pids)
+    # end def new_pid
+
+    def summary (self) :
+        """ Lines summarizing the counts """
+        items  = sorted (pyk.iteritems (self.count))
+        result = ["%-40s %8d" % kv for kv in items]
+        result.append ("%-40s %8d" % ("Total", sum (self.count.values ())))
+        return result
+    # end def summary
+
+# end class Plan_Scope
+
+### __END__ plan
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    profiler
+#
+# Purpose
+#    Time and memory per stage of `convert_0xff`
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Report `max_rss_so_far` and `rss_increase` per stage
+#    ««revision-date»»···
+#--
+
+import json
+import resource
+import time
+
+from   contextlib             import contextmanager
+from   _TFL.pyk               import pyk
+
+class Stage_Profiler (object) :
+    """ Record wall time, CPU time, RSS, and the number of objects
+        created and commits issued for each stage of the conversion.
+        Object and commit counts are taken from `loader` (a
+        Batch_Loader), if given: objects created in the scope are
+        counted (no matter how they were created), but only commits done
+        by the loader.
+        CPU time includes that of the terminated child processes (e.g.,
+        the workers of `-parallel_load`). The kernel only reports the
+        peak RSS of a process since its start, so for a stage
+        `max_rss_so_far` is the peak RSS of this process up to the end of
+        the stage and `rss_increase` the growth of that peak during the
+        stage (0 for a stage staying below the peak of an earlier one);
+        `max_rss_so_far_children` is the peak RSS of the largest child
+        process terminated so far. The report of the whole run has
+        `peak_rss` and `peak_rss_children` (the peak memory use of
+        processes running at the same time isn't known, it is at most the
+        sum of both).
+        Usage::
+
+            with profiler ("create_nodes") :
+                ...
+    """
+
+    def __init__ (self, loader = None) :
+        self.loader = loader
+        self.stages = []
+        self.start  = time.time ()
+    # end def __init__
+
+    @contextmanager
+    def __call__ (self, name) :
+        counts  = dict (self._counts ())
+        commits = self._commits ()
+        wall    = time.time ()
+        cpu     = self._cpu_time ()
+        rss     = self._peak_rss ()
+        try :
+            yield
+        finally :
+            created = {}
+            peak    = self._peak_rss ()
+            for k, v in self._counts () :
+                if v != counts.get (k, 0) :
+                    created [k] = v - counts.get (k, 0)
+            self.stages.append \
+                ( dict
+                    ( name                    = name
+                    , wall                    = time.time ()      - wall
+                    , cpu                     = self._cpu_time () - cpu
+                    , max_rss_so_far          = peak
+                    , max_rss_so_far_children = self._peak_rss
+                        (resource.RUSAGE_CHILDREN)
+                    , rss_increase            = peak - rss
+                    , created                 = created
+                    , commits                 = self._commits ()  - commits
+                    )
+                )
+    # end def __call__
+
+    def report (self) :
+        return dict \
+            ( stages            = self.stages
+            , wall              = time.time () - self.start
+            , cpu               = self._cpu_time ()
+            , peak_rss          = self._peak_rss ()
+            , peak_rss_children = self._peak_rss (resource.RUSAGE_CHILDREN)
+            , created           = dict (self._counts ())
+            , commits           = self._commits ()
+            )
+    # end def report
+
+    def save (self, filename) :
+        with open (filename, "w") as f :
+            json.dump (self.report (), f, indent = 2, sort_keys = True)
+    # end def save
+
+    def _commits (self) :
+        return self.loader.commits if self.loader else 0
+    # end def _commits
+
+    def _counts (self) :
+        return pyk.iteritems (self.loader.created ()) if self.loader else ()
+    # end def _counts
+
+    def _cpu_time (self) :
+        result = 0
+        for who in resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN :
+            r = resource.getrusage (who)
+            result += r.ru_utime + r.ru_stime
+        return result
+    # end def _cpu_time
+
+    def _peak_rss (self, who = resource.RUSAGE_SELF) :
+        """ Peak resident set size in kB (as reported by Linux) """
+        return resource.getrusage (who).ru_maxrss
+    # end def _peak_rss
+
+# end class Stage_Profiler
+
+### __END__ profiler
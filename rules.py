@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    rules
+#
+# Purpose
+#    Person dedup and cleanup rules of `convert_0xff`
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+import os
+import re
+
+from   _TFL.pyk               import pyk
+
+class Frozen_Map (dict) :
+    """ Dictionary that cannot be changed after creation """
+
+    def _immutable (self, * args, ** kw) :
+        raise TypeError ("%s is read-only" % self.__class__.__name__)
+    # end def _immutable
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = _immutable
+
+    def __reduce__ (self) :
+        return (self.__class__, (dict (self), ))
+    # end def __reduce__
+
+# end class Frozen_Map
+
+class Rules_Error (ValueError) :
+    pass
+# end class Rules_Error
+
+class Rules (object) :
+    """ Dedup and cleanup rules for the persons of the redeemer database
+        read from a rules file and compiled into frozen indexes: member
+        ids into frozensets, pairs of member ids into Frozen_Maps.
+        `validated` returns a copy of the rules with the pairs referring
+        to members not in the dump removed.
+    """
+
+    default_file = os.path.join \
+        (os.path.dirname (os.path.abspath (__file__)), "convert_0xff.rules")
+
+    ### section name -> kind of section
+    sections = dict \
+        ( person_dupes      = "pairs"
+        , merge_adr         = "ids"
+        , phone_bogus       = "strings"
+        , companies         = "ids"
+        , associations      = "ids"
+        , company_actor     = "pairs"
+        , association_actor = "pairs"
+        , person_disable    = "ids"
+        , person_remove     = "ids"
+        )
+
+    pat_section = re.compile (r"^\[\s*(\w+)\s*\]$")
+
+    def __init__ (self, ** kw) :
+        for name, kind in pyk.iteritems (self.sections) :
+            v = kw.get (name, ())
+            if kind == "pairs" :
+                v = Frozen_Map (v)
+            else :
+                v = frozenset (v)
+            setattr (self, name, v)
+        self.rev_person_dupes = Frozen_Map \
+            ((v, k) for k, v in pyk.iteritems (self.person_dupes))
+    # end def __init__
+
+    @classmethod
+    def load (cls, filename = None) :
+        """ Read and compile rules from `filename` """
+        filename = filename or cls.default_file
+        kw       = {}
+        section  = None
+        with open (filename) as f :
+            for n, line in enumerate (f, 1) :
+                kind = cls.sections.get (section)
+                if kind == "strings" :
+                    line = line.rstrip ("\r\n")
+                    if line.lstrip ().startswith ("#") :
+                        continue
+                else :
+                    line = line.split ("#", 1) [0]
+                line = line.strip ()
+                if not line :
+                    continue
+                m = cls.pat_section.match (line)
+                if m :
+                    section = m.group (1)
+                    if section not in cls.sections :
+                        raise Rules_Error \
+                            ( "%s:%d: unknown section %s"
+                            % (filename, n, section)
+                            )
+                    kw.setdefault (section, [])
+                    continue
+                if section is None :
+                    raise Rules_Error \
+                        ("%s:%d: rule outside of section" % (filename, n))
+                try :
+                    if kind == "strings" :
+                        kw [section].append (line)
+                    elif kind == "ids" :
+                        kw [section].extend (int (x) for x in line.split ())
+                    else :
+                        k, v = (int (x) for x in line.split ())
+                        kw [section].append ((k, v))
+                except ValueError :
+                    raise Rules_Error \
+                        ( "%s:%d: invalid %s rule: %s"
+                        % (filename, n, section, line)
+                        )
+        return cls (** kw)
+    # end def load
+
+    def validated (self, known_ids) :
+        """ Return copy of rules without dupes and actors referring to
+            members not in `known_ids` (e.g., meanwhile removed).
+        """
+        def known (pairs) :
+            return \
+                [ (k, v) for k, v in pairs
+                  if k in known_ids and v in known_ids
+                ]
+        kw = dict \
+            ( (name, getattr (self, name))
+            for name, kind in pyk.iteritems (self.sections)
+            )
+        kw ["person_dupes"]      = known (pyk.iteritems (self.person_dupes))
+        kw ["company_actor"]     = known (pyk.iteritems (self.company_actor))
+        kw ["association_actor"] = known \
+            (pyk.iteritems (self.association_actor))
+        return self.__class__ (** kw)
+    # end def validated
+
+# end class Rules
+
+### __END__ rules
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    snapshot
+#
+# Purpose
+#    On-disk snapshot of the consolidated converter input
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Store and replay the diagnostics of consolidation
+#    ««revision-date»»···
+#--
+
+import os
+import pickle
+import hashlib
+
+class Snapshot (object) :
+    """ On-disk snapshot of the parsed and consolidated input of the
+        converter (redeemer tables, OLSR tables, spider data and the
+        consolidated devices and interfaces), i.e., everything computed
+        before the first object is created in the scope.
+        The snapshot file is named by a hash over the contents of the
+        input files and all parameters influencing the consolidation, a
+        changed input automatically results in a new snapshot.
+        References to the converter are not stored in the snapshot, they
+        are re-attached to the converter loading the snapshot.
+        The diagnostics emitted while reading and consolidating the input
+        are stored, too, and replayed into the diagnostics of the
+        converter loading the snapshot (the counts are complete, the
+        findings only as far as kept by the limit of the run saving the
+        snapshot).
+    """
+
+    ### increment when the structure of the snapshot changes
+    version    = 7
+    attributes = \
+        ( "contents"
+        , "ip4nets"
+        , "ip6nets"
+        , "olsr_nodes"
+        , "olsr_mid"
+        , "olsr_hna"
+        , "rev_mid"
+        , "spider"
+        , "node_by_id"
+        , "dev_by_node"
+        , "cons_dev"
+        , "ip_by_ip"
+        )
+
+    def __init__ (self, directory, files, * params) :
+        h = hashlib.sha1 (("%s %r" % (self.version, params)).encode ("utf-8"))
+        for fn in files :
+            with open (fn, "rb") as f :
+                for block in iter (lambda : f.read (1 << 20), b"") :
+                    h.update (block)
+        self.key      = h.hexdigest ()
+        self.filename = os.path.join (directory, "convert-%s.pck" % self.key)
+    # end def __init__
+
+    @property
+    def exists (self) :
+        return os.path.exists (self.filename)
+    # end def exists
+
+    def load (self, convert) :
+        """ Set attributes of `convert` from snapshot """
+        with open (self.filename, "rb") as f :
+            unpickler = pickle.Unpickler (f)
+            unpickler.persistent_load = lambda pid : convert
+            state = unpickler.load ()
+        for k in self.attributes :
+            setattr (convert, k, state [k])
+        convert.diag.merge (state ["diag"])
+    # end def load
+
+    def save (self, convert) :
+        """ Write snapshot of attributes of `convert` """
+        state = dict ((k, getattr (convert, k)) for k in self.attributes)
+        state ["contents"] = dict \
+            ((t, convert.contents [t]) for t in convert.dump_tables)
+        state ["diag"]     = convert.diag
+        tmp = self.filename + ".tmp"
+        with open (tmp, "wb") as f :
+            pickler = pickle.Pickler (f, pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = \
+                lambda obj : "convert" if obj is convert else None
+            pickler.dump (state)
+        os.rename (tmp, self.filename)
+    # end def save
+
+# end class Snapshot
+
+### __END__ snapshot
@@ -0,0 +1,453 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    spider_store
+#
+# Purpose
+#    Versioned columnar store of spider data
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Use `fromfile`/`tofile`, keep "" distinct from None
+#    ««revision-date»»···
+#--
+
+import pickle
+import struct
+
+from   array                  import array
+from   bisect                 import bisect_left
+from   ip_index               import address
+from   _TFL                   import TFL
+from   _TFL.pyk               import pyk
+
+import _TFL.CAO
+
+class Spider_Inet4 (object) :
+    """ IPv4 address of a spidered interface """
+
+    def __init__ (self, ip, iface = None) :
+        self.ip    = ip
+        self.iface = iface
+    # end def __init__
+
+    def __lt__ (self, other) :
+        return self.ip < other.ip
+    # end def __lt__
+
+    def __repr__ (self) :
+        return "IP4: %s" % (self.ip, )
+    # end def __repr__
+
+# end class Spider_Inet4
+
+class Spider_Inet6 (Spider_Inet4) :
+    """ IPv6 address of a spidered interface """
+
+    def __repr__ (self) :
+        return "IP6: %s" % (self.ip, )
+    # end def __repr__
+
+# end class Spider_Inet6
+
+class Spider_Interface (object) :
+    """ Interface of a spidered device """
+
+    def __init__ (self, name, is_wlan = False, wlan_info = None) :
+        self.name      = name
+        self.names     = [name]
+        self.is_wlan   = is_wlan
+        self.wlan_info = wlan_info
+        self.inet4     = []
+        self.inet6     = []
+        self.device    = None
+    # end def __init__
+
+    def append_inet4 (self, inet4) :
+        self.inet4.append (inet4)
+    # end def append_inet4
+
+    def append_inet6 (self, inet6) :
+        self.inet6.append (inet6)
+    # end def append_inet6
+
+    def __lt__ (self, other) :
+        return self.name < other.name
+    # end def __lt__
+
+    def __repr__ (self) :
+        r = ["Interface: %s" % self.name]
+        r.extend ("    %r" % i for i in self.inet4)
+        r.extend ("    %r" % i for i in self.inet6)
+        if self.wlan_info :
+            r.append ("    %r" % (self.wlan_info, ))
+        return "\n".join (r)
+    # end def __repr__
+
+# end class Spider_Interface
+
+class Spider_WLAN_Info (object) :
+    """ WLAN configuration of a spidered interface """
+
+    attributes = ("standard", "mode", "bssid", "ssid", "channel")
+
+    def __init__ (self, standard, mode, bssid, ssid, channel) :
+        self.standard = standard
+        self.mode     = mode
+        self.bssid    = bssid
+        self.ssid     = ssid
+        self.channel  = channel
+    # end def __init__
+
+    def __repr__ (self) :
+        return "WLAN: %s" % ", ".join \
+            ("%s=%s" % (a, getattr (self, a)) for a in self.attributes)
+    # end def __repr__
+
+# end class Spider_WLAN_Info
+
+class Spider_Device (object) :
+    """ Spidered device, `mainip` is the address it was spidered by """
+
+    def __init__ (self, mainip) :
+        self.mainip     = mainip
+        self.interfaces = {}
+    # end def __init__
+
+    def verbose_repr (self) :
+        r = ["Device: %s" % self.mainip]
+        for k in sorted (self.interfaces) :
+            r.append (repr (self.interfaces [k]))
+        return "\n".join (r)
+    # end def verbose_repr
+
+    def __repr__ (self) :
+        return "Device: %s" % self.mainip
+    # end def __repr__
+
+# end class Spider_Device
+
+class Spider_Store (object) :
+    """ Versioned columnar store of spider data with the tables
+        `devices`, `interfaces`, `inet4`, `inet6`, and `wlan`.
+
+        Each table consists of columns of equal length. Columns are
+        arrays of integers, strings are stored as an array of offsets
+        into an UTF-8 encoded blob and an array of flags marking None
+        (which is distinct from the empty string). Arrays are read and
+        written with `array.fromfile` and `array.tofile` (Python 2 and 3).
+        Devices refer to their interfaces, interfaces to their addresses
+        by the offset of the first entry in the next table (`if_start`,
+        `ip_start`, `ip6_start` have one more entry than the table).
+        Interfaces refer to their WLAN info by index, -1 if none.
+
+        The columns are read one after the other from the file, the
+        objects for a device are only built when the device is accessed.
+        `lookup` finds device and interface of an address by binary
+        search over the sorted integer IPv4 addresses or the sorted
+        IPv6 addresses (as 32 hex digits).
+    """
+
+    magic   = b"FFSPIDER"
+    version = 3
+    header  = struct.Struct ("=8sI")
+    column  = struct.Struct ("=cI")
+
+    tables  = \
+        ( ("devices",    ("mainip:S", "if_start:I"))
+        , ( "interfaces"
+          , ("name:S", "is_wlan:B", "wlan:i", "ip_start:I", "ip6_start:I")
+          )
+        , ("inet4",      ("ip:S", ))
+        , ("inet6",      ("ip:S", ))
+        , ( "wlan"
+          , ("standard:S", "mode:S", "bssid:S", "ssid:S", "channel:i")
+          )
+        , ("ip_index",   ("ip:I", "iface:I"))
+        , ("ip6_index",  ("ip:S", "iface:I"))
+        )
+
+    def __init__ (self, columns) :
+        self.columns    = columns
+        self.devices    = {}
+        self.by_mainip  = dict \
+            ((ip, i) for i, ip in enumerate (columns ["devices.mainip"]))
+        if_start        = columns ["devices.if_start"]
+        self.dev_of_iface = array ("I")
+        for i in range (len (if_start) - 1) :
+            self.dev_of_iface.extend \
+                ([i] * (if_start [i + 1] - if_start [i]))
+    # end def __init__
+
+    @classmethod
+    def is_store (cls, filename) :
+        with open (filename, "rb") as f :
+            return f.read (len (cls.magic)) == cls.magic
+    # end def is_store
+
+    @classmethod
+    def load (cls, filename) :
+        columns = {}
+        with open (filename, "rb") as f :
+            magic, version = cls.header.unpack (f.read (cls.header.size))
+            if magic != cls.magic :
+                raise ValueError ("%s: not a spider store" % filename)
+            if version != cls.version :
+                raise ValueError \
+                    ( "%s: spider store version %s, expected %s"
+                    % (filename, version, cls.version)
+                    )
+            for table, cols in cls.tables :
+                for col in cols :
+                    name, kind = col.split (":")
+                    columns ["%s.%s" % (table, name)] = \
+                        cls._read_column (f, kind)
+        return cls (columns)
+    # end def load
+
+    @classmethod
+    def _read_column (cls, f, kind) :
+        k, n = cls.column.unpack (f.read (cls.column.size))
+        k    = k.decode ("ascii")
+        assert k == kind
+        if kind == "S" :
+            offsets = cls._read_array (f, "I", n + 1)
+            nulls   = cls._read_array (f, "B", n)
+            blob    = f.read (offsets [-1])
+            return \
+                [ None if nulls [i]
+                    else blob [offsets [i]:offsets [i + 1]].decode ("utf-8")
+                  for i in range (n)
+                ]
+        return cls._read_array (f, kind, n)
+    # end def _read_column
+
+    @staticmethod
+    def _read_array (f, typecode, n) :
+        result = array (typecode)
+        result.fromfile (f, n)
+        return result
+    # end def _read_array
+
+    @classmethod
+    def from_info (cls, spider_info) :
+        """ Store of `spider_info` built in memory (see `write`) """
+        c       = cls._columns (spider_info)
+        columns = {}
+        for table, cols in cls.tables :
+            for col in cols :
+                name, kind = col.split (":")
+                k          = "%s.%s" % (table, name)
+                if kind == "S" :
+                    columns [k] = \
+                        [ None if v is None else pyk.decoded (v, "utf-8")
+                          for v in c [k]
+                        ]
+                else :
+                    columns [k] = array (kind, c [k])
+        return cls (columns)
+    # end def from_info
+
+    @classmethod
+    def write (cls, filename, spider_info) :
+        """ Write store of `spider_info` (dictionary mapping main ip to
+            device as read from a pickled spider dump, spider errors are
+            skipped).
+        """
+        c = cls._columns (spider_info)
+        with open (filename, "wb") as f :
+            f.write (cls.header.pack (cls.magic, cls.version))
+            for table, cols in cls.tables :
+                for col in cols :
+                    name, kind = col.split (":")
+                    cls._write_column (f, kind, c ["%s.%s" % (table, name)])
+    # end def write
+
+    @classmethod
+    def _columns (cls, spider_info) :
+        """ Dictionary mapping column names to lists of values """
+        c = dict \
+            ( (("%s.%s" % (t, col.split (":") [0])), [])
+            for t, cols in cls.tables for col in cols
+            )
+        c ["devices.if_start"].append     (0)
+        c ["interfaces.ip_start"].append  (0)
+        c ["interfaces.ip6_start"].append (0)
+        for mainip, dev in sorted (pyk.iteritems (spider_info)) :
+            if not hasattr (dev, "interfaces") :
+                continue
+            c ["devices.mainip"].append (str (mainip))
+            for iface in sorted (pyk.itervalues (dev.interfaces)) :
+                wlan = getattr (iface, "wlan_info", None)
+                if wlan is not None :
+                    c ["interfaces.wlan"].append (len (c ["wlan.channel"]))
+                    for a in Spider_WLAN_Info.attributes [:-1] :
+                        c ["wlan." + a].append (getattr (wlan, a))
+                    ch = wlan.channel
+                    c ["wlan.channel"].append (-1 if ch is None else int (ch))
+                else :
+                    c ["interfaces.wlan"].append (-1)
+                c ["interfaces.name"].append    (iface.name)
+                c ["interfaces.is_wlan"].append (int (bool (iface.is_wlan)))
+                j = len (c ["interfaces.name"]) - 1
+                for t, inet in ("", "inet4"), ("6", "inet6") :
+                    for i in getattr (iface, inet, ()) :
+                        ip = str (i.ip)
+                        try :
+                            k = cls._index_key (ip)
+                        except ValueError :
+                            pass
+                        else :
+                            c ["ip%s_index.ip"    % t].append (k)
+                            c ["ip%s_index.iface" % t].append (j)
+                        c [inet + ".ip"].append (ip)
+                    c ["interfaces.ip%s_start" % t].append \
+                        (len (c [inet + ".ip"]))
+            c ["devices.if_start"].append (len (c ["interfaces.name"]))
+        for t in "ip_index", "ip6_index" :
+            index = sorted (zip (c [t + ".ip"], c [t + ".iface"]))
+            c [t + ".ip"]    = [ip for ip, _ in index]
+            c [t + ".iface"] = [i  for _, i in index]
+        return c
+    # end def _columns
+
+    @staticmethod
+    def _index_key (ip) :
+        """ Key of `ip` in `ip_index` (integer) or `ip6_index` (string) """
+        adr = address (ip)
+        if adr.bitlen == 128 :
+            return "%032x" % adr.ip
+        return adr.ip
+    # end def _index_key
+
+    @classmethod
+    def _write_column (cls, f, kind, values) :
+        f.write (cls.column.pack (kind.encode ("ascii"), len (values)))
+        if kind == "S" :
+            nulls   = array ("B", (v is None for v in values))
+            values  = \
+                [ pyk.decoded (v or "", "utf-8").encode ("utf-8")
+                  for v in values
+                ]
+            offsets = array ("I", [0])
+            for v in values :
+                offsets.append (offsets [-1] + len (v))
+            offsets.tofile (f)
+            nulls.tofile   (f)
+            f.write (b"".join (values))
+        else :
+            array (kind, values).tofile (f)
+    # end def _write_column
+
+    def device (self, i) :
+        """ Device with index `i`, built on first access """
+        try :
+            return self.devices [i]
+        except KeyError :
+            pass
+        c     = self.columns
+        dev   = self.devices [i] = Spider_Device (c ["devices.mainip"] [i])
+        start = c ["devices.if_start"]
+        for j in range (start [i], start [i + 1]) :
+            iface = self._interface (j)
+            iface.device = dev
+            dev.interfaces [iface.name] = iface
+        return dev
+    # end def device
+
+    def _interface (self, j) :
+        c         = self.columns
+        wlan_info = None
+        w         = c ["interfaces.wlan"] [j]
+        if w >= 0 :
+            args      = \
+                [ c ["wlan." + a] [w]
+                  for a in Spider_WLAN_Info.attributes [:-1]
+                ]
+            ch        = c ["wlan.channel"] [w]
+            wlan_info = Spider_WLAN_Info (* (args + [None if ch < 0 else ch]))
+        name  = c ["interfaces.name"] [j]
+        iface = Spider_Interface \
+            (name, bool (c ["interfaces.is_wlan"] [j]), wlan_info)
+        start = c ["interfaces.ip_start"]
+        for k in range (start [j], start [j + 1]) :
+            iface.append_inet4 (Spider_Inet4 (c ["inet4.ip"] [k], name))
+        start = c ["interfaces.ip6_start"]
+        for k in range (start [j], start [j + 1]) :
+            iface.append_inet6 (Spider_Inet6 (c ["inet6.ip"] [k], name))
+        return iface
+    # end def _interface
+
+    def get (self, mainip) :
+        """ Device spidered by `mainip` or None """
+        i = self.by_mainip.get (str (mainip))
+        if i is not None :
+            return self.device (i)
+    # end def get
+
+    def lookup (self, ip) :
+        """ Return (device, interface) with address `ip` or None """
+        for i, j in self.lookup_all (ip) :
+            dev = self.device (i)
+            return dev, dev.interfaces [self.columns ["interfaces.name"] [j]]
+    # end def lookup
+
+    def lookup_all (self, ip) :
+        """ Yield (device index, interface index) of all interfaces with
+            address `ip`, in the order of the store.
+        """
+        i   = self._index_key (str (ip))
+        t   = "ip6_index" if isinstance (i, pyk.string_types) else "ip_index"
+        ips = self.columns [t + ".ip"]
+        k   = bisect_left (ips, i)
+        while k < len (ips) and ips [k] == i :
+            j = self.columns [t + ".iface"] [k]
+            yield self.dev_of_iface [j], j
+            k += 1
+    # end def lookup_all
+
+    def __len__ (self) :
+        return len (self.columns ["devices.mainip"])
+    # end def __len__
+
+    def __iter__ (self) :
+        """ Yield (mainip, device) for all devices, one at a time """
+        for i, mainip in enumerate (self.columns ["devices.mainip"]) :
+            yield mainip, self.device (i)
+    # end def __iter__
+
+# end class Spider_Store
+
+def convert_pickle (spider_dump, filename) :
+    """ Convert pickled spider dump into a spider store """
+    with open (spider_dump, "rb") as f :
+        spider_info = pickle.load (f)
+    Spider_Store.write (filename, spider_info)
+# end def convert_pickle
+
+def _main (cmd) :
+    convert_pickle (* cmd.argv)
+# end def _main
+
+_Command = TFL.CAO.Cmd \
+    ( handler         = _main
+    , args            =
+        ( "spider_dump:S?Pickled spider dump to convert"
+        , "store:S?Spider store to write"
+        )
+    , min_args        = 2
+    , max_args        = 2
+    )
+
+if __name__ == "__main__" :
+    _Command ()
+### __END__ spider_store
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    sql_dump
+#
+# Purpose
+#    Read the redeemer SQL dump table by table
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+import re
+
+from   rsclib.sqlparser       import SQL_Parser
+from   _TFL.pyk               import pyk
+
+class Dump_Reader (object) :
+    """ Read a PostgreSQL dump of the redeemer database table by table.
+        Only the tables named in `tables` are materialized, the `COPY`
+        blocks of all other tables are skipped without being parsed.
+        The dump is fed to the SQL_Parser in chunks of at most
+        `chunk_size` lines, a table is available as soon as its `COPY`
+        block has been read completely. Reading stops when all requested
+        tables are complete, the rest of the dump is never looked at.
+        Indexing the reader with a table name returns the list of rows
+        of that table (reading as much of the dump as necessary).
+    """
+
+    re_copy = re.compile (r'^COPY\s+(\S+)\s')
+
+    def __init__ (self, f, tables, chunk_size = 10000) :
+        self.lines      = iter (f)
+        self.wanted     = dict.fromkeys (tables)
+        self.chunk_size = chunk_size
+        self.contents   = {}
+        self.eof        = False
+        self.parser     = SQL_Parser (verbose = False, fix_double_encode = True)
+        self.tables     = self.parser.tables
+    # end def __init__
+
+    @property
+    def complete (self) :
+        return len (self.contents) == len (self.wanted)
+    # end def complete
+
+    def read_all (self) :
+        """ Read dump until all requested tables are complete. """
+        while self._feed () :
+            pass
+        return self.contents
+    # end def read_all
+
+    def _feed (self) :
+        """ Feed next chunk of the dump to the parser.
+            Returns False if there is nothing more to read.
+        """
+        if self.eof or self.complete :
+            return False
+        chunk = []
+        skip  = False
+        for line in self.lines :
+            end = line.rstrip () == '\\.'
+            if skip :
+                skip = not end
+                continue
+            m = self.re_copy.match (line)
+            if m and self._table_name (m.group (1)) not in self.wanted :
+                skip = True
+                continue
+            chunk.append (line)
+            if end or len (chunk) >= self.chunk_size :
+                break
+        else :
+            self.eof = True
+        if chunk :
+            self.parser.parse (chunk)
+            self._collect ()
+        return not self.eof or bool (chunk)
+    # end def _feed
+
+    def _collect (self) :
+        """ Move completed tables from the parser to `contents`. """
+        parser  = self.parser
+        in_copy = parser.state.name == "copy"
+        for name in list (pyk.iterkeys (parser.contents)) :
+            if in_copy and name == parser.tablename :
+                continue
+            rows = parser.contents.pop (name)
+            name = self._table_name (name)
+            if name in self.wanted :
+                self.contents [name] = rows
+    # end def _collect
+
+    def _table_name (self, name) :
+        return name.strip ('"').split ('.') [-1]
+    # end def _table_name
+
+    def __contains__ (self, name) :
+        try :
+            self [name]
+        except KeyError :
+            return False
+        return True
+    # end def __contains__
+
+    def __getitem__ (self, name) :
+        if name not in self.wanted :
+            raise KeyError (name)
+        while name not in self.contents :
+            if not self._feed () :
+                raise KeyError ("Table %s not in dump" % name)
+        return self.contents [name]
+    # end def __getitem__
+
+# end class Dump_Reader
+
+### __END__ sql_dump
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    sync_state
+#
+# Purpose
+#    State of the last conversion for `convert_0xff -delta`
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    17-Oct-2026 (agent) Keep the pids of records without entity in `record`
+#    ««revision-date»»···
+#--
+
+import os
+import pickle
+
+class Sync_State (object) :
+    """ State of the last conversion of the redeemer database: for each
+        kind of record (members, nodes, devices) a stamp per redeemer id
+        (e.g., the `changed` and `created` time of the record) and the
+        pid of the entity created for the record.
+        Comparing the stamps of a new dump with the stamps of the last
+        run yields the records that were created, changed, or removed
+        since the last run.
+        The state of the last run is only loaded with `load`: a full
+        conversion creates a new scope, the pids of the last run are
+        meaningless for it.
+    """
+
+    def __init__ (self, filename, load = True) :
+        self.filename = filename
+        self.stamps   = {}
+        self.pids     = {}
+        if load and os.path.exists (filename) :
+            with open (filename, "rb") as f :
+                self.stamps, self.pids = pickle.load (f)
+    # end def __init__
+
+    @property
+    def exists (self) :
+        return bool (self.stamps)
+    # end def exists
+
+    def diff (self, kind, stamps) :
+        """ Return lists of ids of created, changed, and removed records
+            of `kind` given the `stamps` of the current dump.
+        """
+        old     = self.stamps.get (kind, {})
+        created = sorted (k for k in stamps if k not in old)
+        changed = sorted \
+            (k for k in stamps if k in old and old [k] != stamps [k])
+        removed = sorted (k for k in old if k not in stamps)
+        return created, changed, removed
+    # end def diff
+
+    def pid (self, kind, id) :
+        return self.pids.get (kind, {}).get (id)
+    # end def pid
+
+    def record (self, kind, stamps, entities) :
+        """ Remember `stamps` and pids of `entities` (a dict mapping
+            redeemer id to entity) for `kind`. A record in `stamps`
+            without entity (e.g., an unchanged record, whose entity a
+            delta conversion doesn't touch) keeps the pid of the last run.
+        """
+        old  = self.pids.get (kind, {})
+        pids = {}
+        for k in stamps :
+            e = entities.get (k)
+            if e is not None :
+                pids [k] = e.pid
+            elif k in old :
+                pids [k] = old [k]
+        self.stamps [kind] = dict (stamps)
+        self.pids   [kind] = pids
+    # end def record
+
+    def save (self) :
+        tmp = self.filename + ".tmp"
+        with open (tmp, "wb") as f :
+            pickle.dump ((self.stamps, self.pids), f, pickle.HIGHEST_PROTOCOL)
+        os.rename (tmp, self.filename)
+    # end def save
+
+# end class Sync_State
+
+### __END__ sync_state
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import pytest
+
+pytest.importorskip ("rsclib.IP_Address")
+pytest.importorskip ("_TFL.pyk")
+
+from   ip_index               import address, address_key
+from   ip_index               import Address_Index, Address_Set
+from   ip_index               import Net_Index, Network_Cache
+
+class Network (object) :
+    """ Network entity of the fake essential type below """
+
+    def __init__ (self, etype, net, owner = None, parent = None) :
+        self.etype       = etype
+        self.net_address = net
+        self.owner       = owner
+        self.parent      = parent
+        etype.created.append (self)
+    # end def __init__
+
+    def reserve (self, net, owner = None) :
+        return Network (self.etype, net, owner, parent = self)
+    # end def reserve
+
+# end class Network
+
+class E_Type (object) :
+    """ Essential type of networks with `query` and creation """
+
+    def __init__ (self, nets = ()) :
+        self.created = []
+        for n in nets :
+            Network (self, address (n))
+        self.existing = list (self.created)
+    # end def __init__
+
+    def query (self) :
+        existing = self.existing
+        class Query (object) :
+            def all (self) :
+                return existing
+        return Query ()
+    # end def query
+
+    def __call__ (self, net, owner = None) :
+        return Network (self, net, owner)
+    # end def __call__
+
+# end class E_Type
+
+def test_address_key_ipv4_and_ipv6_distinct () :
+    a4 = address ("0.0.0.1")
+    a6 = address ("::1")
+    assert address_key (a4) == 1
+    assert address_key (a6) == (1 << 128) | 1
+    assert address_key (address ("2001:db8::1")) \
+        == address_key (address ("2001:0db8:0:0:0:0:0:1"))
+# end def test_address_key_ipv4_and_ipv6_distinct
+
+def test_net_index_most_specific () :
+    idx = Net_Index \
+        ({address ("10.0.0.0/8") : "a", address ("10.1.0.0/16") : "b"})
+    assert idx.most_specific (address ("10.1.2.3")) [1] == "b"
+    assert idx.most_specific (address ("10.2.2.3")) [1] == "a"
+    assert address ("11.0.0.1") not in idx
+    assert address ("2001:db8::1") not in idx
+    assert idx.get (address ("10.1.0.0/16")) == "b"
+    assert len (idx) == 2
+# end def test_net_index_most_specific
+
+def test_network_cache_reserve () :
+    etype = E_Type (["10.0.0.0/8", "2001:db8::/32"])
+    cache = Network_Cache (etype)
+    top4, top6 = etype.existing
+    n1 = cache.reserve (address ("10.1.0.0/16"), "owner")
+    assert n1.parent is top4 and n1.owner == "owner"
+    # reserved networks are found by later reservations
+    n2 = cache.reserve (address ("10.1.2.0/24"), "owner")
+    assert n2.parent is n1
+    assert cache.instance (address ("10.1.2.0/24")) is n2
+    n3 = cache.reserve (address ("2001:db8:1::/48"), "owner")
+    assert n3.parent is top6
+    # no containing network: a top-level network is created
+    n4 = cache.reserve (address ("192.168.0.0/24"), "owner")
+    assert n4.parent is None
+    assert len (etype.created) == 6
+# end def test_network_cache_reserve
+
+def test_network_cache_create () :
+    calls = []
+    def create (fun, * args, ** kw) :
+        calls.append (args)
+        return fun (* args, ** kw)
+    cache = Network_Cache (E_Type (["10.0.0.0/8"]), create)
+    cache.reserve (address ("10.0.0.0/24"), None)
+    assert calls == [(address ("10.0.0.0/24"), )]
+# end def test_network_cache_create
+
+def test_address_index_and_set () :
+    idx = Address_Index ()
+    idx ["2001:db8::1"] = 1
+    idx [address ("10.0.0.1")] = 2
+    assert idx [address ("2001:db8:0::1")] == 1
+    assert idx.get ("10.0.0.1") == 2
+    assert "10.0.0.2" not in idx
+    s = Address_Set \
+        (address (a) for a in ("10.0.0.1", "10.0.1.1", "2001:db8::1"))
+    assert [str (a) for a in s.in_net (address ("10.0.0.0/24"))] \
+        == ["10.0.0.1"]
+    assert len (s.in_net (address ("10.0.0.0/16"))) == 2
+    assert len (s.in_net (address ("2001:db8::/32"))) == 1
+# end def test_address_index_and_set
+
+### __END__ test_ip_index
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import pickle
+import pytest
+
+pytest.importorskip ("rsclib.IP_Address")
+pytest.importorskip ("_TFL.CAO")
+
+from   rsclib.IP_Address      import IP4_Address
+from   olsr_snapshot          import OLSR_Snapshot
+
+def ips (* args) :
+    return [IP4_Address (a) for a in args]
+# end def ips
+
+@pytest.fixture
+def snapshot (tmpdir) :
+    fn    = str (tmpdir.join ("olsr.snapshot"))
+    nodes = ips ("10.0.0.3", "10.0.0.1", "10.0.1.1")
+    mid   = \
+        { IP4_Address ("10.0.0.1") : ips ("10.0.2.2", "10.0.2.1")
+        , IP4_Address ("10.0.1.1") : ips ("10.0.3.1")
+        }
+    hna   = ips ("10.1.0.0/16", "10.1.0.0/24", "192.168.0.0/24")
+    OLSR_Snapshot.write (fn, nodes, mid, hna)
+    assert OLSR_Snapshot.is_snapshot (fn)
+    return OLSR_Snapshot.load (fn)
+# end def snapshot
+
+def test_nodes (snapshot) :
+    assert [str (n) for n in snapshot.nodes] \
+        == ["10.0.0.1", "10.0.0.3", "10.0.1.1"]
+    assert IP4_Address ("10.0.0.3") in snapshot.nodes
+    assert IP4_Address ("10.0.0.2") not in snapshot.nodes
+    net = IP4_Address ("10.0.0.0/24")
+    assert [str (n) for n in snapshot.nodes.in_net (net)] \
+        == ["10.0.0.1", "10.0.0.3"]
+# end def test_nodes
+
+def test_mid (snapshot) :
+    by_ip = snapshot.by_ip
+    assert [str (a) for a in by_ip [IP4_Address ("10.0.0.1")]] \
+        == ["10.0.2.1", "10.0.2.2"]
+    assert by_ip.get (IP4_Address ("10.0.0.3")) is None
+    with pytest.raises (KeyError) :
+        by_ip [IP4_Address ("10.0.0.3")]
+    assert [(str (k), len (v)) for k, v in by_ip.iteritems ()] \
+        == [("10.0.0.1", 2), ("10.0.1.1", 1)]
+    aliases = snapshot.alias_table ()
+    assert len (aliases) == 3
+    assert IP4_Address ("10.0.3.1") in aliases
+# end def test_mid
+
+def test_hna (snapshot) :
+    by_dest = snapshot.by_dest
+    assert IP4_Address ("10.1.0.0/24")    in by_dest
+    assert IP4_Address ("10.1.0.0/16")    in by_dest
+    assert IP4_Address ("10.1.0.0/25") not in by_dest
+    assert sorted (str (n) for n in by_dest) \
+        == ["10.1.0.0/16", "10.1.0.0/24", "192.168.0.0/24"]
+# end def test_hna
+
+def test_pickle (snapshot) :
+    copy = pickle.loads (pickle.dumps (snapshot.by_ip))
+    assert [str (a) for a in copy [IP4_Address ("10.0.1.1")]] == ["10.0.3.1"]
+# end def test_pickle
+
+def test_not_a_snapshot (tmpdir) :
+    fn = str (tmpdir.join ("txtinfo"))
+    with open (fn, "wb") as f :
+        f.write (b"Table: Links\n" + b"\0" * 32)
+    assert not OLSR_Snapshot.is_snapshot (fn)
+    with pytest.raises (ValueError) :
+        OLSR_Snapshot.load (fn)
+# end def test_not_a_snapshot
+
+### __END__ test_olsr_snapshot
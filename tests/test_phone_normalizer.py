@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import pytest
+
+pytest.importorskip ("rsclib.Phone")
+
+from   phone_normalizer       import Phone_Normalizer
+
+vienna = (("43", "1", "5551234"), None)
+
+@pytest.mark.parametrize ("town", [None, "", "Wien"])
+def test_local_number_uses_default_town (town) :
+    assert Phone_Normalizer () ("5551234", town) == vienna
+# end def test_local_number_uses_default_town
+
+def test_missing_town_does_not_poison_cache () :
+    norm = Phone_Normalizer ()
+    assert norm ("5551234", None)   == vienna
+    assert norm ("5551234", "")     == vienna
+    assert norm ("5551234", "Wien") == vienna
+    assert len (norm) == 1
+    assert norm.hits  == 2
+# end def test_missing_town_does_not_poison_cache
+
+def test_empty_and_bogus () :
+    norm = Phone_Normalizer (bogus = ("0",))
+    assert norm (None, "Wien")  == (None, None)
+    assert norm ("  ", "Wien")  == (None, None)
+    assert norm ("0", "Wien")   == (None, "bogus")
+# end def test_empty_and_bogus
+
+def test_members_prepass () :
+    class Member (object) :
+        def __init__ (self, id, town, ** kw) :
+            self.id   = id
+            self.town = town
+            self.__dict__.update (kw)
+    norm    = Phone_Normalizer ()
+    members = [Member (1, None, telephone = "5551234", fax = None)]
+    norm.normalize_members (members, ("telephone", "fax"))
+    assert norm.member (members [0], "telephone") == vienna
+    assert norm.member (members [0], "fax")       == (None, None)
+# end def test_members_prepass
+
+### __END__ test_phone_normalizer
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import pytest
+
+pytest.importorskip ("_MOM.import_MOM")
+pytest.importorskip ("_GTW._RST._MOM.Query_Restriction")
+
+from   _FFW                   import FFW
+from   _GTW                   import GTW
+from   _TFL                   import TFL
+
+import _FFW.RST_Api_addons
+import _TFL.Record
+
+Response_Cache    = FFW.RST_Api_addons.Response_Cache
+Query_Restriction = FFW.RST_Api_addons.Query_Restriction
+E_Type            = FFW.RST_Api_addons.E_Type
+
+def change_summary (* type_names) :
+    return TFL.Record \
+        (changes = [TFL.Record (type_name = tn) for tn in type_names])
+# end def change_summary
+
+def test_cache_get_put () :
+    cache = Response_Cache ()
+    assert cache.get ("nodes", 1) is None
+    cache.put ("nodes", 1, {"entries" : [1, 2]}, ("FFW.Node", ))
+    assert cache.get ("nodes", 1) == {"entries" : [1, 2]}
+    cache.put ("nodes", 2, {"entries" : [1]}, ("FFW.Node", ))
+    assert len (cache) == 1
+    assert cache.get ("nodes", 2) == {"entries" : [1]}
+    ### an entry computed for an older cid is dropped
+    assert cache.get ("nodes", 3) is None
+    assert len (cache) == 0
+    assert not cache.by_type ["FFW.Node"]
+# end def test_cache_get_put
+
+def test_cache_invalidate () :
+    cache = Response_Cache ()
+    cache.put ("nodes",   1, "n",  ("FFW.Node", ))
+    cache.put ("devices", 1, "d",  ("FFW.Net_Device", "FFW.Node"))
+    cache.put ("persons", 1, "p",  ("PAP.Person", ))
+    cache.invalidate (None, change_summary ("FFW.Node", "FFW.Node"))
+    assert cache.get ("nodes",   1) is None
+    assert cache.get ("devices", 1) is None
+    assert cache.get ("persons", 1) == "p"
+    assert not cache.by_type ["FFW.Net_Device"]
+    cache.invalidate (None, change_summary ("FFW.Wired_Interface"))
+    assert len (cache) == 1
+# end def test_cache_invalidate
+
+def test_cache_max_entries () :
+    cache = Response_Cache (max_entries = 2)
+    for i, key in enumerate (("a", "b", "c")) :
+        cache.put (key, 1, i, ("FFW.Node", ))
+    assert len (cache) == 2
+    assert cache.get ("a", 1) is None
+    assert [cache.get (k, 1) for k in ("b", "c")] == [1, 2]
+    assert cache.by_type ["FFW.Node"] == set (("b", "c"))
+# end def test_cache_max_entries
+
+@pytest.fixture
+def restriction (monkeypatch) :
+    """ Query_Restriction without filters and ordering of the ancestor """
+    def _setup_filters (self, E_Type, request, data, scope) :
+        self.filters_q = ()
+    def _setup_order_by (self, E_Type, request, data) :
+        self.order_by_q = "ancestor"
+    Ancestor = GTW.RST.MOM.Query_Restriction
+    monkeypatch.setattr (Ancestor, "_setup_filters",  _setup_filters)
+    monkeypatch.setattr (Ancestor, "_setup_order_by", _setup_order_by)
+    def _restriction (** data) :
+        result = Query_Restriction ()
+        result._setup_filters  (None, None, data, None)
+        result._setup_order_by (None, None, data)
+        return result
+    return _restriction
+# end def restriction
+
+def test_after (restriction) :
+    qr = restriction (after = "42")
+    assert qr.after == 42
+    assert len (qr.filters_q) == 1
+    assert qr.order_by_q.criteria == ("pid", )
+    assert qr
+    qr = restriction (after = "0", order_by = "pid")
+    assert qr.after == 0
+    assert qr.order_by_q.criteria == ("pid", )
+    qr = restriction (order_by = "-name")
+    assert qr.after is None
+    assert qr.filters_q == ()
+    assert qr.order_by_q == "ancestor"
+# end def test_after
+
+def test_after_bad_arguments (restriction) :
+    with pytest.raises (GTW.RST.HTTP_Status.Bad_Request) :
+        restriction (after = "x")
+    with pytest.raises (GTW.RST.HTTP_Status.Bad_Request) :
+        restriction (after = "0", order_by = "-pid")
+# end def test_after_bad_arguments
+
+def test_next_href () :
+    def encoded_url (** kw) :
+        return "?" + "&".join ("%s=%s" % kv for kv in sorted (kw.items ()))
+    GET      = E_Type.GET
+    get      = GET.__new__ (GET)
+    request  = TFL.Record (req_data = dict (after = "0", limit = "2"))
+    response = TFL.Record (encoded_url = encoded_url)
+    resource = TFL.Record \
+        ( abs_href          = "/api/nodes"
+        , query_restriction = Query_Restriction (limit = 2, after = 0)
+        )
+    assert get._next_href (resource, request, response, 17) == \
+        "/api/nodes?after=17&limit=2"
+    assert get._next_href (resource, request, response, None) is None
+    resource.query_restriction = Query_Restriction (limit = 2)
+    assert get._next_href (resource, request, response, 17) is None
+# end def test_next_href
+
+### __END__ test_rst_api_addons
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import pytest
+
+pytest.importorskip ("rsclib.IP_Address")
+pytest.importorskip ("_TFL.CAO")
+
+from   spider_store           import Spider_Store, Spider_Device
+from   spider_store           import Spider_Interface, Spider_WLAN_Info
+from   spider_store           import Spider_Inet4, Spider_Inet6
+
+def spider_info () :
+    d1   = Spider_Device ("10.0.0.1")
+    wlan = Spider_WLAN_Info ("802.11g", "adhoc", "02:ca:ff:ee:ba:be", "", 11)
+    i    = d1.interfaces ["wlan0"] = Spider_Interface ("wlan0", True, wlan)
+    i.append_inet4 (Spider_Inet4 ("10.0.0.1",   "wlan0"))
+    i.append_inet6 (Spider_Inet6 ("2001:db8::1", "wlan0"))
+    i    = d1.interfaces ["eth0"]  = Spider_Interface ("eth0")
+    i.append_inet4 (Spider_Inet4 ("192.168.1.1", "eth0"))
+    d2   = Spider_Device ("10.0.0.2")
+    wlan = Spider_WLAN_Info ("802.11a", None, "02:00:00:00:00:01", "x", None)
+    i    = d2.interfaces ["wlan0"] = Spider_Interface ("wlan0", True, wlan)
+    i.append_inet4 (Spider_Inet4 ("10.0.0.2",    "wlan0"))
+    i.append_inet4 (Spider_Inet4 ("192.168.1.1", "wlan0"))
+    return { "10.0.0.1" : d1, "10.0.0.2" : d2, "10.0.0.3" : "timeout" }
+# end def spider_info
+
+@pytest.fixture (params = ("file", "memory"))
+def store (request, tmp_path) :
+    if request.param == "memory" :
+        return Spider_Store.from_info (spider_info ())
+    filename = str (tmp_path / "spider.store")
+    Spider_Store.write (filename, spider_info ())
+    assert Spider_Store.is_store (filename)
+    return Spider_Store.load (filename)
+# end def store
+
+def test_devices (store) :
+    assert len (store) == 2
+    assert [m for m, _ in store] == ["10.0.0.1", "10.0.0.2"]
+    assert store.get ("10.0.0.3") is None
+    dev = store.get ("10.0.0.1")
+    assert sorted (dev.interfaces) == ["eth0", "wlan0"]
+    eth = dev.interfaces ["eth0"]
+    assert not eth.is_wlan and eth.wlan_info is None
+    assert [i.ip for i in eth.inet4] == ["192.168.1.1"]
+    assert eth.device is dev
+# end def test_devices
+
+def test_wlan_info (store) :
+    w = store.get ("10.0.0.1").interfaces ["wlan0"].wlan_info
+    assert (w.standard, w.mode, w.ssid, w.channel) == \
+        ("802.11g", "adhoc", "", 11)
+    w = store.get ("10.0.0.2").interfaces ["wlan0"].wlan_info
+    assert w.mode is None
+    assert w.ssid == "x"
+    assert w.channel is None
+# end def test_wlan_info
+
+def test_lookup (store) :
+    dev, iface = store.lookup ("10.0.0.2")
+    assert (dev.mainip, iface.name) == ("10.0.0.2", "wlan0")
+    dev, iface = store.lookup ("2001:db8::1")
+    assert (dev.mainip, iface.name) == ("10.0.0.1", "wlan0")
+    assert [i.ip for i in iface.inet6] == ["2001:db8::1"]
+    assert store.lookup ("10.0.0.9") is None
+    assert sorted (store.lookup_all ("192.168.1.1")) == [(0, 0), (1, 2)]
+# end def test_lookup
+
+def test_version (tmp_path) :
+    filename = str (tmp_path / "spider.store")
+    with open (filename, "wb") as f :
+        f.write (Spider_Store.header.pack (Spider_Store.magic, 2))
+    with pytest.raises (ValueError) :
+        Spider_Store.load (filename)
+# end def test_version
+
+### __END__ test_spider_store
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import os
+
+from   sync_state             import Sync_State
+
+class Entity (object) :
+
+    def __init__ (self, pid) :
+        self.pid = pid
+    # end def __init__
+
+# end class Entity
+
+def test_diff () :
+    state = Sync_State ("does-not-exist")
+    state.stamps ["devices"] = {1 : "a", 2 : "b", 3 : "c"}
+    created, changed, removed = state.diff \
+        ("devices", {1 : "a", 2 : "B", 4 : "d"})
+    assert (created, changed, removed) == ([4], [2], [3])
+    assert state.diff ("nodes", {7 : "x"}) == ([7], [], [])
+# end def test_diff
+
+def test_two_delta_runs (tmpdir) :
+    fn = str (tmpdir.join ("sync.state"))
+    # full run: all records have an entity
+    state = Sync_State (fn, load = False)
+    state.record \
+        ( "devices", {1 : "a", 2 : "b", 3 : "c"}
+        , {1 : Entity (11), 2 : Entity (12), 3 : Entity (13)}
+        )
+    state.save ()
+    # 1st delta run: device 2 changed and re-created, 1 and 3 untouched
+    state = Sync_State (fn)
+    stamps = {1 : "a", 2 : "B", 3 : "c"}
+    assert state.diff ("devices", stamps) == ([], [2], [])
+    state.record ("devices", stamps, {1 : None, 2 : Entity (22), 3 : None})
+    state.save ()
+    # 2nd delta run: device 1 changed, device 3 removed, their pids are
+    # those of the full run
+    state = Sync_State (fn)
+    stamps = {1 : "A", 2 : "B"}
+    assert state.diff ("devices", stamps) == ([], [1], [3])
+    assert state.pid ("devices", 1) == 11
+    assert state.pid ("devices", 2) == 22
+    assert state.pid ("devices", 3) == 13
+    state.record ("devices", stamps, {1 : Entity (31)})
+    state.save ()
+    state = Sync_State (fn)
+    assert state.pids ["devices"] == {1 : 31, 2 : 22}
+    assert not os.path.exists (fn + ".tmp")
+# end def test_two_delta_runs
+
+def test_full_run_ignores_last_state (tmpdir) :
+    fn    = str (tmpdir.join ("sync.state"))
+    state = Sync_State (fn)
+    state.record ("nodes", {1 : "a"}, {1 : Entity (11)})
+    state.save ()
+    state = Sync_State (fn, load = False)
+    assert not state.exists
+    state.record ("nodes", {1 : "a"}, {1 : None})
+    assert state.pid ("nodes", 1) is None
+# end def test_full_run_ignores_last_state
+
+### __END__ test_sync_state
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+
+import itertools
+import pytest
+
+pytest.importorskip ("_TFL.pyk")
+
+from   union_find             import Union_Find
+
+def test_components () :
+    uf = Union_Find ([9])
+    uf.union (3, 1)
+    uf.union (5, 7)
+    uf.union (1, 2)
+    assert uf.components () == [[1, 2, 3], [5, 7], [9]]
+    assert uf.find (1) == uf.find (3)
+    assert uf.find (5) != uf.find (1)
+    assert 7 in uf and 4 not in uf
+# end def test_components
+
+def test_order_independent () :
+    pairs  = [(1, 2), (3, 4), (2, 3), (6, 5), (8, 8)]
+    expect = [[1, 2, 3, 4], [5, 6], [8]]
+    for perm in itertools.permutations (pairs) :
+        uf = Union_Find ()
+        for x, y in perm :
+            uf.union (y, x)
+        assert uf.components () == expect
+# end def test_order_independent
+
+def test_long_chain () :
+    uf = Union_Find ()
+    n  = 10000
+    for i in range (n - 1) :
+        uf.union (i, i + 1)
+    root = uf.find (0)
+    assert all (uf.find (i) == root for i in range (n))
+    assert len (uf.components ()) == 1
+    assert uf.size [root] == n
+# end def test_long_chain
+
+### __END__ test_union_find
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 agent <agent@local>
+# #*** <License> ************************************************************#
+# This module is part of the program FFW.
+#
+# This module is licensed under the terms of the BSD 3-Clause License
+# <http://www.c-tanzer.at/license/bsd_3c.html>.
+# #*** </License> ***********************************************************#
+#
+#++
+# Name
+#    union_find
+#
+# Purpose
+#    Disjoint-set forest for the consolidation of devices
+#
+# Revision Dates
+#    17-Oct-2026 (agent) Creation
+#    ««revision-date»»···
+#--
+
+from   _TFL.pyk               import pyk
+
+class Union_Find (object) :
+    """ Disjoint-set forest with path compression and union by size.
+        Elements are arbitrary hashable objects, they are added
+        implicitly by `find` and `union`. The resulting partition does
+        not depend on the order of the `union` calls.
+    """
+
+    def __init__ (self, elements = ()) :
+        self.parent = {}
+        self.size   = {}
+        for e in elements :
+            self.add (e)
+    # end def __init__
+
+    def add (self, x) :
+        if x not in self.parent :
+            self.parent [x] = x
+            self.size   [x] = 1
+    # end def add
+
+    def components (self) :
+        """ Return list of components (each a sorted list of elements),
+            sorted by their smallest element.
+        """
+        result = {}
+        for x in self.parent :
+            result.setdefault (self.find (x), []).append (x)
+        return sorted (sorted (c) for c in pyk.itervalues (result))
+    # end def components
+
+    def find (self, x) :
+        """ Return representative of the set containing `x` """
+        self.add (x)
+        parent = self.parent
+        root   = x
+        while parent [root] != root :
+            root = parent [root]
+        while parent [x] != root :
+            parent [x], x = root, parent [x]
+        return root
+    # end def find
+
+    def union (self, x, y) :
+        rx = self.find (x)
+        ry = self.find (y)
+        if rx != ry :
+            if self.size [rx] < self.size [ry] :
+                rx, ry = ry, rx
+            self.parent [ry] = rx
+            self.size   [rx] += self.size [ry]
+        return rx
+    # end def union
+
+    def __contains__ (self, x) :
+        return x in self.parent
+    # end def __contains__
+
+# end class Union_Find
+
+### __END__ union_find
@@ -14,6 +14,7 @@ python passive/www/app/deploy.py update
 python passive/www/app/deploy.py pycompile
 python passive/www/app/deploy.py migrate -Active -Passive -verbose
 python passive/www/app/deploy.py setup_cache
+python passive/www/app/deploy.py prerender_pages
 python passive/www/app/deploy.py switch
 
 # as root: